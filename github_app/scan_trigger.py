@@ -157,8 +157,9 @@ def _run_clone(repo_url: str, clone_dir: str, github_token: str) -> dict:
     try:
         repo_url = _validate_repo_url(repo_url)
         cmd = ["git", "clone", "--depth", "1", "--single-branch"]
-        clone_env = {**os.environ}
+        clone_env = None
         if github_token:
+            clone_env = os.environ.copy()
             clone_env["GIT_ASKPASS"] = "echo"
             clone_env["GIT_TERMINAL_PROMPT"] = "0"
             import base64
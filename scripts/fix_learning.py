@@ -132,7 +132,7 @@ CWE_FIX_HINTS: dict[str, str] = {
 }
 
 
-@dataclass
+@dataclass(slots=True)
 class FamilyStats:
     """Aggregated fix statistics for a single CWE family."""
     total_sessions: int = 0
@@ -22,6 +22,7 @@ from scripts.orchestrator.state import (  # noqa: F401
     build_global_issue_state,
     compute_issue_priority,
     get_repo_config,
+    index_registry_repos,
     load_registry,
     load_state,
     save_state,
@@ -69,5 +70,6 @@ from scripts.orchestrator.cli import (  # noqa: F401
     cmd_cycle,
     cmd_plan,
     cmd_status,
+    compute_plan,
     main,
 )
@@ -1,8 +1,9 @@
 """CLI argument parsing, command routing, and output formatting.
 
 Contains the ``main()`` entry point, argparse setup for all sub-commands,
-the ``cmd_plan``, ``cmd_status``, and ``cmd_cycle`` commands, and the
-human-readable print helpers.
+the ``cmd_plan``, ``cmd_status``, and ``cmd_cycle`` commands,
+``compute_plan`` for in-process callers, and the human-readable print
+helpers.
 """
 
 from __future__ import annotations
@@ -33,10 +34,8 @@ from database import get_connection, insert_audit_log, auto_export_audit_log  #
 logger = setup_logging(__name__)
 
 
-def cmd_plan(args: argparse.Namespace) -> int:
-    repo_filter = args.repo or ""
-    output_json = args.json
-
+def compute_plan(repo_filter: str = "") -> dict[str, Any]:
+    """Return the dispatch plan for *repo_filter* without printing it."""
     data = _state._compute_eligible_issues(repo_filter)
     eligible = data["eligible"]
     skipped = data["skipped"]
@@ -51,11 +50,12 @@ def cmd_plan(args: argparse.Namespace) -> int:
     sessions_planned = 0
 
     repos_seen: dict[str, int] = {}
+    repos_by_url = _state.index_registry_repos(registry)
     for issue in eligible:
         if sessions_planned >= remaining_capacity:
             break
         repo_url = issue.get("target_repo", "")
-        repo_config = _state.get_repo_config(registry, repo_url)
+        repo_config = _state.get_repo_config(registry, repo_url, repos_by_url)
         repo_limit = repo_config.get("max_sessions_per_cycle", 5)
         repo_sessions = repos_seen.get(repo_url, 0)
         if repo_sessions >= repo_limit:
@@ -86,7 +86,13 @@ def cmd_plan(args: argparse.Namespace) -> int:
         ],
     }
 
-    if output_json:
+    return plan
+
+
+def cmd_plan(args: argparse.Namespace) -> int:
+    plan = compute_plan(args.repo or "")
+
+    if args.json:
         print(json.dumps(plan, indent=2))
     else:
         _print_plan(plan)
@@ -118,25 +124,29 @@ def cmd_status(args: argparse.Namespace) -> int:
     prs = global_state["prs"]
 
     state_counts: dict[str, int] = {}
+    repos: dict[str, dict[str, int]] = {}
     for issue in issues:
         derived = issue.get("derived_state", issue.get("status", "new"))
         state_counts[derived] = state_counts.get(derived, 0) + 1
-
-    session_status_counts: dict[str, int] = {}
-    for s in sessions:
-        st = s.get("status", "unknown")
-        session_status_counts[st] = session_status_counts.get(st, 0) + 1
-
-    repos: dict[str, dict[str, int]] = {}
-    for issue in issues:
         repo_url = issue.get("target_repo", "")
         if repo_url not in repos:
             repos[repo_url] = {"total": 0, "new": 0, "recurring": 0, "fixed": 0, "verified_fixed": 0}
         repos[repo_url]["total"] += 1
-        derived = issue.get("derived_state", issue.get("status", "new"))
         if derived in repos[repo_url]:
             repos[repo_url][derived] += 1
 
+    session_status_counts: dict[str, int] = {}
+    for s in sessions:
+        st = s.get("status", "unknown")
+        session_status_counts[st] = session_status_counts.get(st, 0) + 1
+
+    prs_merged = prs_open = 0
+    for p in prs:
+        if p.get("merged"):
+            prs_merged += 1
+        elif p.get("state") == "open":
+            prs_open += 1
+
     dispatch_history = state.get("dispatch_history", {})
 
     status_data = {
@@ -147,8 +157,8 @@ def cmd_status(args: argparse.Namespace) -> int:
         "session_status_breakdown": session_status_counts,
         "total_sessions": len(sessions),
         "total_prs": len(prs),
-        "prs_merged": sum(1 for p in prs if p.get("merged")),
-        "prs_open": sum(1 for p in prs if p.get("state") == "open" and not p.get("merged")),
+        "prs_merged": prs_merged,
+        "prs_open": prs_open,
         "rate_limit": {
             "used": rate_limiter.recent_count(),
             "max": rate_limiter.max_sessions,
@@ -163,6 +163,7 @@ def _form_dispatch_batches(
     batches: list[dict[str, Any]] = []
     batch_id = 1
     repos_session_count: dict[str, int] = {}
+    repos_by_url = _state.index_registry_repos(registry)
 
     sorted_groups = sorted(
         groups.items(),
@@ -176,7 +177,7 @@ def _form_dispatch_batches(
         if not rate_limiter.can_create_session():
             break
 
-        repo_config = _state.get_repo_config(registry, repo_url)
+        repo_config = _state.get_repo_config(registry, repo_url, repos_by_url)
         repo_limit = repo_config.get("max_sessions_per_cycle", 5)
         batch_size = repo_config.get("batch_size", 5)
 
@@ -51,7 +51,7 @@ SEVERITY_WEIGHTS: dict[str, float] = {
 }
 
 
-@dataclass
+@dataclass(slots=True)
 class RateLimiter:
     max_sessions: int = 20
     period_hours: int = 24
@@ -93,7 +93,7 @@ class RateLimiter:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Objective:
     name: str = ""
     description: str = ""
@@ -178,13 +178,32 @@ def save_state(state: dict[str, Any]) -> None:
         pass
 
 
-def get_repo_config(registry: dict[str, Any], repo_url: str) -> dict[str, Any]:
+def index_registry_repos(registry: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    """Map each registered repo URL to its registry entry.
+
+    Pass the result to ``get_repo_config`` when looking up many repos
+    against the same registry.  The first entry for a URL wins, as with
+    a linear scan.
+    """
+    index: dict[str, dict[str, Any]] = {}
     for repo in registry.get("repos", []):
-        if repo.get("repo") == repo_url:
-            merged = dict(registry.get("defaults", {}))
-            merged.update(repo)
-            merged.update(repo.get("overrides", {}))
-            return merged
+        index.setdefault(repo.get("repo"), repo)
+    return index
+
+
+def get_repo_config(
+    registry: dict[str, Any],
+    repo_url: str,
+    repos_by_url: dict[str, dict[str, Any]] | None = None,
+) -> dict[str, Any]:
+    if repos_by_url is None:
+        repos_by_url = index_registry_repos(registry)
+    repo = repos_by_url.get(repo_url)
+    if repo is not None:
+        merged = dict(registry.get("defaults", {}))
+        merged.update(repo)
+        merged.update(repo.get("overrides", {}))
+        return merged
     defaults = dict(registry.get("defaults", {}))
     defaults["repo"] = repo_url
     defaults.setdefault("importance", "medium")
@@ -530,9 +549,10 @@ def _compute_eligible_issues(repo_filter: str = "") -> dict[str, Any]:
         else:
             eligible.append(issue)
 
+    repos_by_url = index_registry_repos(registry)
     for issue in eligible:
         repo_url = issue.get("target_repo", "")
-        repo_config = get_repo_config(registry, repo_url)
+        repo_config = get_repo_config(registry, repo_url, repos_by_url)
         issue["priority_score"] = compute_issue_priority(
             issue, repo_config, objectives, fl,
         )
@@ -14,8 +14,11 @@ package:
 * **demo** -- demo data management
 """
 
+import gzip
+import hashlib
 import os
 import pathlib
+from operator import itemgetter
 
 from flask import Flask, request as flask_request
 from flask_cors import CORS
@@ -23,6 +26,9 @@ from cachelib import FileSystemCache
 from flask_session import Session
 
 from config import RUNS_DIR
+from extensions import OrjsonProvider
+from helpers import _gzip_etag, _make_conditional
+from issue_tracking import compute_sla_status, _parse_ts
 from migrate_json_to_sqlite import ensure_db_populated
 from oauth import oauth_bp
 from routes import api_bp, orchestrator_bp, registry_bp, demo_bp
@@ -30,6 +36,7 @@ from routes import api_bp, orchestrator_bp, registry_bp, demo_bp
 SAMPLE_DATA_DIR = pathlib.Path(__file__).parent / "sample_data"
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 app.secret_key = os.environ.get("FLASK_SECRET_KEY", os.urandom(32).hex())
 
 _SESSION_DIR = pathlib.Path(__file__).parent / "flask_session"
@@ -40,6 +47,8 @@ app.config["SESSION_PERMANENT"] = False
 app.config["SESSION_COOKIE_HTTPONLY"] = True
 app.config["SESSION_COOKIE_SECURE"] = os.environ.get("SESSION_COOKIE_SECURE", "true").lower() == "true"
 app.config["SESSION_COOKIE_SAMESITE"] = "Lax"
+app.config["COMPRESS_MIN_SIZE"] = 1024
+app.config["COMPRESS_LEVEL"] = 5
 Session(app)
 
 _cors_raw = os.environ.get("CORS_ORIGINS", "")
@@ -69,8 +78,6 @@ def _track_issues_across_runs(runs: list[dict]) -> list[dict]:
     the same aggregated structure that ``query_issues()`` produces, but computed
     entirely in memory without touching the database.
     """
-    from issue_tracking import compute_sla_status, _parse_ts
-
     fp_history: dict[str, list[dict]] = {}
     fp_metadata: dict[str, dict] = {}
     runs_sorted = sorted(runs, key=lambda r: r.get("timestamp", ""))
@@ -118,16 +125,21 @@ def _track_issues_across_runs(runs: list[dict]) -> list[dict]:
                 if fp:
                     latest_fps.add(fp)
 
-    result: list[dict] = []
+    repos_with_older_runs_without_fps = {
+        repo for repo, total in runs_per_repo.items()
+        if total > runs_with_fps_per_repo.get(repo, 0)
+    }
+
+    # Results are collected per status in display order, so sorting only
+    # has to order each bucket by date.
+    by_status: dict[str, list[dict]] = {"recurring": [], "new": [], "fixed": []}
     for fp, appearances in fp_history.items():
         first = appearances[0]
         latest = appearances[-1]
         run_numbers = [a["run_number"] for a in appearances]
         repo = first["target_repo"]
 
-        has_older_runs_without_fps = (
-            runs_per_repo.get(repo, 0) > runs_with_fps_per_repo.get(repo, 0)
-        )
+        has_older_runs_without_fps = repo in repos_with_older_runs_without_fps
 
         if fp in latest_fps:
             if len(appearances) > 1 or has_older_runs_without_fps:
@@ -153,7 +165,7 @@ def _track_issues_across_runs(runs: list[dict]) -> list[dict]:
             meta.get("severity_tier", ""), found_at_ts, fixed_at_ts,
         )
 
-        result.append({
+        by_status[status].append({
             "fingerprint": fp,
             "rule_id": meta.get("rule_id", ""),
             "severity_tier": meta.get("severity_tier", ""),
@@ -178,12 +190,78 @@ def _track_issues_across_runs(runs: list[dict]) -> list[dict]:
             "sla_hours_remaining": sla["sla_hours_remaining"],
         })
 
-    _STATUS_ORDER = {"recurring": 0, "new": 1, "fixed": 2}
-    result.sort(key=lambda x: (
-        _STATUS_ORDER.get(x["status"], 3),
-        x.get("last_seen_date", ""),
-    ))
-    return result
+    by_last_seen = itemgetter("last_seen_date")
+    return [item for bucket in by_status.values() for item in sorted(bucket, key=by_last_seen)]
+
+
+_COMPRESSIBLE_MIMETYPES = frozenset({
+    "application/json", "application/javascript", "text/css", "text/csv", "text/html", "text/plain",
+})
+
+# Gzipped bodies keyed by a digest of the uncompressed body, so polling
+# clients that keep fetching the same payload do not pay for deflate again.
+_GZIP_CACHE: dict[bytes, bytes] = {}
+_GZIP_CACHE_MAX_ENTRIES = 64
+
+
+@app.after_request
+def _compress_response(response):
+    """Gzip textual responses of at least ``COMPRESS_MIN_SIZE`` bytes for clients that accept it.
+
+    Registered before ``_add_json_etag`` so it runs after it: the ETag is
+    taken over the uncompressed body and 304s are never compressed.  A
+    compressed body gets the gzip form of that ETag, since a strong ETag
+    promises identical bytes.  The compressed bytes are memoized in
+    ``_GZIP_CACHE``.
+    """
+    response.vary.add("Accept-Encoding")
+    if (
+        response.status_code != 200
+        or response.direct_passthrough
+        or response.is_streamed
+        or "Content-Encoding" in response.headers
+        or response.mimetype not in _COMPRESSIBLE_MIMETYPES
+        or not flask_request.accept_encodings["gzip"]
+    ):
+        return response
+    body = response.get_data()
+    if len(body) < app.config["COMPRESS_MIN_SIZE"]:
+        return response
+    digest = hashlib.sha1(body).digest()
+    packed = _GZIP_CACHE.get(digest)
+    if packed is None:
+        packed = gzip.compress(body, compresslevel=app.config["COMPRESS_LEVEL"], mtime=0)
+        if len(_GZIP_CACHE) >= _GZIP_CACHE_MAX_ENTRIES:
+            try:
+                _GZIP_CACHE.pop(next(iter(_GZIP_CACHE)), None)
+            except (RuntimeError, StopIteration):  # resized concurrently; evict next time
+                pass
+        _GZIP_CACHE[digest] = packed
+    response.set_data(packed)
+    if "ETag" in response.headers:
+        response.headers["ETag"] = _gzip_etag(response.headers["ETag"])
+    response.headers["Content-Encoding"] = "gzip"
+    return response
+
+
+@app.after_request
+def _add_json_etag(response):
+    """Tag JSON GET responses with a body hash and answer a matching ``If-None-Match`` with 304.
+
+    Endpoints that already set an ETag (see ``helpers._json_with_etag``)
+    are left alone.
+    """
+    if (
+        flask_request.method == "GET"
+        and response.status_code == 200
+        and response.mimetype == "application/json"
+        and not response.direct_passthrough
+        and "ETag" not in response.headers
+    ):
+        response.add_etag()
+        response.headers.setdefault("Cache-Control", "no-cache")
+        _make_conditional(response)
+    return response
 
 
 @app.after_request
@@ -4,12 +4,17 @@ Replaces the JSON-file + in-memory cache approach with a single SQLite
 database.  WAL mode is enabled for concurrent reads.
 """
 
+import atexit
 import json
 import os
 import pathlib
+import re
 import sqlite3
 import sys
-from collections.abc import Callable
+import textwrap
+import threading
+from collections import Counter, defaultdict
+from collections.abc import Callable, Iterable, Iterator
 from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
 
@@ -18,9 +23,28 @@ if _SCRIPTS_DIR not in sys.path:
     sys.path.insert(0, _SCRIPTS_DIR)
 
 from devin_api import clean_session_id as _clean_session_id  # noqa: E402
+from issue_tracking import compute_sla_status, _parse_ts  # noqa: E402
 
 _INITIALIZED_DBS: set[str] = set()
 
+_GITHUB_REPO_URL = re.compile(r"^https?://github\.com/([^?#]*)", re.IGNORECASE)
+
+_tls = threading.local()
+_POOLED_CONNECTIONS: list[sqlite3.Connection] = []
+_POOLED_LOCK = threading.Lock()
+
+# Prepared statements kept per connection.  Filter variants and ``IN``
+# lists of varying length give the read helpers more distinct SQL strings
+# than sqlite3's default cache of 128, and pooled connections live long
+# enough to reuse them.
+_STATEMENT_CACHE_SIZE = 512
+
+# Read-heavy dashboard queries are served from memory-mapped pages and a
+# larger page cache.  Both are upper bounds: pages are only mapped or cached
+# as queries touch them.
+_MMAP_SIZE = 256 * 1024 * 1024
+_CACHE_SIZE_KIB = 64 * 1024
+
 DB_PATH = pathlib.Path(
     os.environ.get(
         "TELEMETRY_DB_PATH",
@@ -28,6 +52,28 @@ DB_PATH = pathlib.Path(
     )
 )
 
+# pr_link points each issue at the oldest PR citing it (created_at, then
+# id).  The triggers re-pick that PR instead of relying on INSERT OR
+# REPLACE, since the conflict policy of the statement that fired them
+# (upsert_pr's INSERT OR IGNORE) would override the trigger's own.
+_PR_LINK_TRIGGERS_SQL = """\
+CREATE TRIGGER IF NOT EXISTS pr_issue_ids_ai AFTER INSERT ON pr_issue_ids
+WHEN new.issue_id != '' BEGIN
+    DELETE FROM pr_link WHERE issue_id = new.issue_id;
+    INSERT INTO pr_link (issue_id, pr_id)
+        SELECT pi.issue_id, pi.pr_id FROM pr_issue_ids pi JOIN prs p ON p.id = pi.pr_id
+        WHERE pi.issue_id = new.issue_id ORDER BY p.created_at, p.id LIMIT 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS pr_issue_ids_ad AFTER DELETE ON pr_issue_ids
+WHEN old.issue_id != '' BEGIN
+    DELETE FROM pr_link WHERE issue_id = old.issue_id;
+    INSERT INTO pr_link (issue_id, pr_id)
+        SELECT pi.issue_id, pi.pr_id FROM pr_issue_ids pi JOIN prs p ON p.id = pi.pr_id
+        WHERE pi.issue_id = old.issue_id ORDER BY p.created_at, p.id LIMIT 1;
+END;
+"""
+
 SCHEMA_SQL = """\
 CREATE TABLE IF NOT EXISTS runs (
     id                  INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -44,13 +90,17 @@ CREATE TABLE IF NOT EXISTS runs (
     severity_breakdown  TEXT    NOT NULL DEFAULT '{}',
     category_breakdown  TEXT    NOT NULL DEFAULT '{}',
     source_file         TEXT    NOT NULL DEFAULT '',
+    file_backfilled     INTEGER NOT NULL DEFAULT 0,
     UNIQUE(run_label)
 );
 
 CREATE INDEX IF NOT EXISTS idx_runs_target_repo           ON runs(target_repo);
 CREATE INDEX IF NOT EXISTS idx_runs_timestamp              ON runs(timestamp);
 CREATE INDEX IF NOT EXISTS idx_runs_run_number             ON runs(run_number);
-CREATE INDEX IF NOT EXISTS idx_runs_target_repo_timestamp  ON runs(target_repo, timestamp);
+DROP INDEX IF EXISTS idx_runs_target_repo_timestamp;
+CREATE INDEX IF NOT EXISTS idx_runs_repo_ts_cover         ON runs(target_repo, timestamp, issues_found);
+CREATE INDEX IF NOT EXISTS idx_runs_target_repo_run_number ON runs(target_repo, run_number DESC);
+CREATE INDEX IF NOT EXISTS idx_runs_target_repo_fork_url   ON runs(target_repo, fork_url);
 
 CREATE TABLE IF NOT EXISTS sessions (
     id                INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -65,6 +115,8 @@ CREATE TABLE IF NOT EXISTS sessions (
 
 CREATE INDEX IF NOT EXISTS idx_sessions_run_id  ON sessions(run_id);
 CREATE INDEX IF NOT EXISTS idx_sessions_status  ON sessions(status);
+CREATE INDEX IF NOT EXISTS idx_sessions_session_id ON sessions(session_id);
+CREATE INDEX IF NOT EXISTS idx_sessions_pr_url  ON sessions(pr_url);
 
 CREATE TABLE IF NOT EXISTS session_issue_ids (
     id         INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -91,12 +143,15 @@ CREATE TABLE IF NOT EXISTS issues (
     UNIQUE(run_id, fingerprint)
 );
 
-CREATE INDEX IF NOT EXISTS idx_issues_run_id      ON issues(run_id);
+DROP INDEX IF EXISTS idx_issues_run_id;
+CREATE INDEX IF NOT EXISTS idx_issues_run_fp      ON issues(run_id, fingerprint);
 CREATE INDEX IF NOT EXISTS idx_issues_fingerprint ON issues(fingerprint);
 CREATE INDEX IF NOT EXISTS idx_issues_rule_id     ON issues(rule_id);
 CREATE INDEX IF NOT EXISTS idx_issues_severity    ON issues(severity_tier);
 CREATE INDEX IF NOT EXISTS idx_issues_cwe_family  ON issues(cwe_family);
 CREATE INDEX IF NOT EXISTS idx_issues_file        ON issues(file);
+CREATE INDEX IF NOT EXISTS idx_issues_fingerprint_run ON issues(fingerprint, run_id);
+CREATE INDEX IF NOT EXISTS idx_issues_issue_ext_id ON issues(issue_ext_id);
 
 CREATE TABLE IF NOT EXISTS prs (
     id          INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -116,6 +171,8 @@ CREATE TABLE IF NOT EXISTS prs (
 CREATE INDEX IF NOT EXISTS idx_prs_repo       ON prs(repo);
 CREATE INDEX IF NOT EXISTS idx_prs_state      ON prs(state);
 CREATE INDEX IF NOT EXISTS idx_prs_session_id ON prs(session_id);
+CREATE INDEX IF NOT EXISTS idx_prs_state_merged ON prs(state, merged);
+CREATE INDEX IF NOT EXISTS idx_prs_created_at   ON prs(created_at);
 
 CREATE TABLE IF NOT EXISTS pr_issue_ids (
     id       INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -123,9 +180,16 @@ CREATE TABLE IF NOT EXISTS pr_issue_ids (
     issue_id TEXT    NOT NULL
 );
 
-CREATE INDEX IF NOT EXISTS idx_pr_issue_ids_pr    ON pr_issue_ids(pr_id);
+DROP INDEX IF EXISTS idx_pr_issue_ids_pr;
 CREATE INDEX IF NOT EXISTS idx_pr_issue_ids_issue ON pr_issue_ids(issue_id);
 
+CREATE TABLE IF NOT EXISTS pr_link (
+    issue_id TEXT    PRIMARY KEY,
+    pr_id    INTEGER NOT NULL REFERENCES prs(id) ON DELETE CASCADE
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_pr_link_pr ON pr_link(pr_id);
+
 CREATE TABLE IF NOT EXISTS metadata (
     key   TEXT PRIMARY KEY,
     value TEXT NOT NULL DEFAULT ''
@@ -141,8 +205,10 @@ CREATE TABLE IF NOT EXISTS audit_log (
 );
 
 CREATE INDEX IF NOT EXISTS idx_audit_log_timestamp ON audit_log(timestamp);
-CREATE INDEX IF NOT EXISTS idx_audit_log_user      ON audit_log(user);
-CREATE INDEX IF NOT EXISTS idx_audit_log_action    ON audit_log(action);
+DROP INDEX IF EXISTS idx_audit_log_user;
+DROP INDEX IF EXISTS idx_audit_log_action;
+CREATE INDEX IF NOT EXISTS idx_audit_log_user_ts   ON audit_log(user, timestamp);
+CREATE INDEX IF NOT EXISTS idx_audit_log_action_ts ON audit_log(action, timestamp);
 
 CREATE TABLE IF NOT EXISTS orchestrator_kv (
     key   TEXT PRIMARY KEY,
@@ -195,17 +261,13 @@ CREATE TABLE IF NOT EXISTS fingerprint_issues (
 );
 
 CREATE INDEX IF NOT EXISTS idx_fp_issues_status       ON fingerprint_issues(status);
+CREATE INDEX IF NOT EXISTS idx_fp_issues_status_sev   ON fingerprint_issues(status, severity_tier);
 CREATE INDEX IF NOT EXISTS idx_fp_issues_severity     ON fingerprint_issues(severity_tier);
 CREATE INDEX IF NOT EXISTS idx_fp_issues_cwe          ON fingerprint_issues(cwe_family);
 CREATE INDEX IF NOT EXISTS idx_fp_issues_target_repo  ON fingerprint_issues(target_repo);
-"""
-
-_FTS_SCHEMA_SQL = """\
-CREATE VIRTUAL TABLE IF NOT EXISTS issues_fts USING fts5(
-    fingerprint, rule_id, file, description,
-    content=issues, content_rowid=id
-);
+""" + _PR_LINK_TRIGGERS_SQL
 
+_FTS_TRIGGERS_SQL = """\
 CREATE TRIGGER IF NOT EXISTS issues_ai AFTER INSERT ON issues BEGIN
     INSERT INTO issues_fts(rowid, fingerprint, rule_id, file, description)
     VALUES (new.id, new.fingerprint, new.rule_id, new.file, new.description);
@@ -224,23 +286,42 @@ CREATE TRIGGER IF NOT EXISTS issues_au AFTER UPDATE ON issues BEGIN
 END;
 """
 
+_FTS_SCHEMA_SQL = """\
+CREATE VIRTUAL TABLE IF NOT EXISTS issues_fts USING fts5(
+    fingerprint, rule_id, file, description,
+    content=issues, content_rowid=id
+);
+
+""" + _FTS_TRIGGERS_SQL
+
+
+_FTS5_AVAILABLE: bool | None = None
+
 
 def _has_fts5(conn: sqlite3.Connection) -> bool:
-    try:
-        row = conn.execute(
-            "SELECT 1 FROM pragma_compile_options WHERE compile_options LIKE '%FTS5%'"
-        ).fetchone()
-        return row is not None
-    except sqlite3.OperationalError:
-        return False
+    """Whether the linked SQLite library has FTS5, probed once per process."""
+    global _FTS5_AVAILABLE
+    if _FTS5_AVAILABLE is None:
+        try:
+            row = conn.execute(
+                "SELECT 1 FROM pragma_compile_options WHERE compile_options LIKE '%FTS5%'"
+            ).fetchone()
+        except sqlite3.OperationalError:
+            return False
+        _FTS5_AVAILABLE = row is not None
+    return _FTS5_AVAILABLE
 
 
 def get_connection(db_path: pathlib.Path | None = None) -> sqlite3.Connection:
     path = db_path or DB_PATH
-    conn = sqlite3.connect(str(path), check_same_thread=False)
+    conn = sqlite3.connect(str(path), check_same_thread=False, cached_statements=_STATEMENT_CACHE_SIZE)
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
     conn.execute("PRAGMA foreign_keys=ON")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute(f"PRAGMA mmap_size={_MMAP_SIZE}")
+    conn.execute(f"PRAGMA cache_size=-{_CACHE_SIZE_KIB}")
     str_path = str(path)
     if str_path not in _INITIALIZED_DBS:
         init_db(conn)
@@ -248,6 +329,41 @@ def get_connection(db_path: pathlib.Path | None = None) -> sqlite3.Connection:
     return conn
 
 
+def get_pooled_connection(db_path: pathlib.Path | None = None) -> sqlite3.Connection:
+    """Return a long-lived connection cached per thread and database path.
+
+    Avoids the open/PRAGMA/close cost of ``get_connection()`` on hot request
+    paths.  Callers must **not** close the returned connection; all pooled
+    handles are closed at interpreter exit.  Any transaction left open by a
+    previous caller on the same thread is rolled back, mirroring what
+    ``close()`` would have done.
+    """
+    path = db_path or DB_PATH
+    conns: dict[str, sqlite3.Connection] | None = getattr(_tls, "conns", None)
+    if conns is None:
+        conns = {}
+        _tls.conns = conns
+    conn = conns.get(str(path))
+    if conn is None:
+        conn = get_connection(path)
+        conns[str(path)] = conn
+        with _POOLED_LOCK:
+            _POOLED_CONNECTIONS.append(conn)
+    elif conn.in_transaction:
+        conn.rollback()
+    return conn
+
+
+@atexit.register
+def _close_pooled_connections() -> None:
+    with _POOLED_LOCK:
+        while _POOLED_CONNECTIONS:
+            try:
+                _POOLED_CONNECTIONS.pop().close()
+            except sqlite3.Error:
+                pass
+
+
 @contextmanager
 def db_connection(db_path: pathlib.Path | None = None):
     """Context manager that yields a DB connection and closes it on exit."""
@@ -258,6 +374,57 @@ def db_connection(db_path: pathlib.Path | None = None):
         conn.close()
 
 
+@contextmanager
+def pooled_db_connection(db_path: pathlib.Path | None = None):
+    """Context manager that yields the thread's pooled connection.
+
+    For request handlers that only read: the handle is reused instead of
+    reopened, and any transaction still open on exit is rolled back so no
+    lock outlives the request.
+    """
+    conn = get_pooled_connection(db_path)
+    try:
+        yield conn
+    finally:
+        if conn.in_transaction:
+            conn.rollback()
+
+
+@contextmanager
+def bulk_ingest(conn: sqlite3.Connection):
+    """Context manager that indexes issues for search once, after a large load.
+
+    The ``issues_fts`` triggers are dropped for the duration, so inserted
+    issues are not indexed row by row, and on exit they are recreated and
+    the index is rebuilt from ``issues`` in one pass.  The rebuild covers
+    every issue, so this only pays off for loads that are large next to the
+    existing table, such as the initial JSON migration.  Without FTS5 only
+    the transaction handling applies.  Pending changes are committed on
+    entry and on success; on error they are rolled back before the index
+    is restored.  A successful load ends with ``ANALYZE`` so the
+    planner's statistics reflect the new row counts.
+    """
+    fts = _has_fts5(conn)
+    if fts:
+        conn.executescript(
+            "DROP TRIGGER IF EXISTS issues_ai; DROP TRIGGER IF EXISTS issues_ad; DROP TRIGGER IF EXISTS issues_au;"
+        )
+    else:
+        conn.commit()
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        if fts:
+            conn.executescript(
+                f"BEGIN; {_FTS_TRIGGERS_SQL} INSERT INTO issues_fts(issues_fts) VALUES ('rebuild'); COMMIT;"
+            )
+    conn.commit()
+    conn.execute("ANALYZE")
+
+
 def _migrate_add_agent_score_columns(conn: sqlite3.Connection) -> None:
     """Add agent_priority_score and agent_dispatch columns if missing."""
     cols = {r[1] for r in conn.execute("PRAGMA table_info(fingerprint_issues)").fetchall()}
@@ -267,35 +434,86 @@ def _migrate_add_agent_score_columns(conn: sqlite3.Connection) -> None:
         conn.execute("ALTER TABLE fingerprint_issues ADD COLUMN agent_dispatch INTEGER")
 
 
+def _migrate_add_file_backfilled_column(conn: sqlite3.Connection) -> None:
+    """Add the runs.file_backfilled flag if missing."""
+    cols = {r[1] for r in conn.execute("PRAGMA table_info(runs)").fetchall()}
+    if "file_backfilled" not in cols:
+        conn.execute("ALTER TABLE runs ADD COLUMN file_backfilled INTEGER NOT NULL DEFAULT 0")
+
+
+_PR_LINK_REBUILD_SQL = """
+    DELETE FROM pr_link;
+    INSERT INTO pr_link (issue_id, pr_id)
+        SELECT issue_id, pr_id FROM (
+            SELECT pi.issue_id, pi.pr_id,
+                   ROW_NUMBER() OVER (PARTITION BY pi.issue_id ORDER BY p.created_at, p.id) AS rn
+            FROM pr_issue_ids pi JOIN prs p ON p.id = pi.pr_id
+            WHERE pi.issue_id != ''
+        ) WHERE rn = 1;
+"""
+
+
+def _migrate_backfill_pr_link(conn: sqlite3.Connection) -> None:
+    """Populate ``pr_link`` for PRs stored before the table existed.
+
+    Databases whose triggers still link an issue to whichever PR was
+    stored first get the current triggers and a rebuilt table.
+    """
+    trigger = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = 'pr_issue_ids_ai'"
+    ).fetchone()
+    if "INSERT OR REPLACE" in trigger[0]:
+        conn.executescript(
+            "DROP TRIGGER pr_issue_ids_ai; DROP TRIGGER pr_issue_ids_ad;" + _PR_LINK_TRIGGERS_SQL
+        )
+    elif conn.execute("SELECT 1 FROM pr_link LIMIT 1").fetchone():
+        return
+    conn.executescript(f"BEGIN; {_PR_LINK_REBUILD_SQL} COMMIT;")
+
+
+def _migrate_unique_pr_issue_ids(conn: sqlite3.Connection) -> None:
+    """Drop duplicate ``(pr_id, issue_id)`` rows and enforce their uniqueness."""
+    if conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'ux_pr_issue_ids'"
+    ).fetchone():
+        return
+    conn.execute(
+        """DELETE FROM pr_issue_ids WHERE id NOT IN (
+               SELECT MIN(id) FROM pr_issue_ids GROUP BY pr_id, issue_id)"""
+    )
+    conn.execute("CREATE UNIQUE INDEX ux_pr_issue_ids ON pr_issue_ids(pr_id, issue_id)")
+    conn.commit()
+
+
 def init_db(conn: sqlite3.Connection | None = None) -> None:
     own_conn = conn is None
     if own_conn:
         conn = get_connection()
     conn.executescript(SCHEMA_SQL)
     _migrate_add_agent_score_columns(conn)
+    _migrate_add_file_backfilled_column(conn)
+    _migrate_backfill_pr_link(conn)
+    _migrate_unique_pr_issue_ids(conn)
     if _has_fts5(conn):
         conn.executescript(_FTS_SCHEMA_SQL)
+    conn.execute("PRAGMA optimize")
     if own_conn:
         conn.close()
 
 
 def is_db_empty(conn: sqlite3.Connection) -> bool:
-    row = conn.execute("SELECT COUNT(*) FROM runs").fetchone()
-    return row[0] == 0
+    return conn.execute("SELECT 1 FROM runs LIMIT 1").fetchone() is None
 
 
 # ---------------------------------------------------------------------------
 # Insert helpers
 # ---------------------------------------------------------------------------
 
-def insert_run(conn: sqlite3.Connection, data: dict, source_file: str = "") -> int | None:
-    run_label = data.get("run_label", "")
-    existing = conn.execute(
-        "SELECT id FROM runs WHERE run_label = ?", (run_label,)
-    ).fetchone()
-    if existing:
-        return None
+def _structured_output_text(so: object) -> str:
+    return json.dumps(so) if isinstance(so, dict) else str(so or "")
+
 
+def _insert_run_rows(conn: sqlite3.Connection, data: dict, source_file: str) -> int | None:
     sev = data.get("severity_breakdown", {})
     cat = data.get("category_breakdown", {})
     cur = conn.execute(
@@ -303,14 +521,15 @@ def insert_run(conn: sqlite3.Connection, data: dict, source_file: str = "") -> i
            (target_repo, fork_url, run_number, run_id, run_url, run_label,
             timestamp, issues_found, batches_created, zero_issue_run,
             severity_breakdown, category_breakdown, source_file)
-           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+           ON CONFLICT(run_label) DO NOTHING""",
         (
             data.get("target_repo", ""),
             data.get("fork_url", ""),
             data.get("run_number", 0),
             data.get("run_id", ""),
             data.get("run_url", ""),
-            run_label,
+            data.get("run_label", ""),
             data.get("timestamp", ""),
             data.get("issues_found", 0),
             data.get("batches_created", 0),
@@ -320,78 +539,120 @@ def insert_run(conn: sqlite3.Connection, data: dict, source_file: str = "") -> i
             source_file,
         ),
     )
+    if cur.rowcount == 0:
+        return None
     run_db_id = cur.lastrowid
 
-    for s in data.get("sessions", []):
-        so = s.get("structured_output")
-        so_str = json.dumps(so) if isinstance(so, dict) else str(so or "")
-        sess_cur = conn.execute(
+    sessions = data.get("sessions", [])
+    if sessions:
+        conn.executemany(
             """INSERT INTO sessions (run_id, session_id, session_url, batch_id, status, pr_url, structured_output)
                VALUES (?, ?, ?, ?, ?, ?, ?)""",
-            (
-                run_db_id,
-                s.get("session_id", ""),
-                s.get("session_url", ""),
-                s.get("batch_id"),
-                s.get("status", "unknown"),
-                s.get("pr_url", ""),
-                so_str,
-            ),
-        )
-        sess_db_id = sess_cur.lastrowid
-        for iid in s.get("issue_ids", []):
-            if iid:
-                conn.execute(
-                    "INSERT INTO session_issue_ids (session_id, issue_id) VALUES (?, ?)",
-                    (sess_db_id, iid),
-                )
-
-    for iss in data.get("issue_fingerprints", []):
-        fp = iss.get("fingerprint", "")
-        if not fp:
-            continue
-        try:
-            conn.execute(
-                """INSERT INTO issues
-                   (run_id, issue_ext_id, fingerprint, rule_id, severity_tier,
-                    cwe_family, file, start_line, description, resolution, code_churn)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            [
                 (
                     run_db_id,
-                    iss.get("id", ""),
-                    fp,
-                    iss.get("rule_id", ""),
-                    iss.get("severity_tier", "unknown"),
-                    iss.get("cwe_family", "other"),
-                    iss.get("file", ""),
-                    iss.get("start_line", 0),
-                    iss.get("description", ""),
-                    iss.get("resolution", ""),
-                    iss.get("code_churn", 0),
-                ),
+                    s.get("session_id", ""),
+                    s.get("session_url", ""),
+                    s.get("batch_id"),
+                    s.get("status", "unknown"),
+                    s.get("pr_url", ""),
+                    _structured_output_text(s.get("structured_output")),
+                )
+                for s in sessions
+            ],
+        )
+        # The run is new, so its sessions are exactly the rows just inserted,
+        # in insertion order.
+        sess_db_ids = [
+            r[0] for r in conn.execute("SELECT id FROM sessions WHERE run_id = ? ORDER BY id", (run_db_id,))
+        ]
+        conn.executemany(
+            "INSERT INTO session_issue_ids (session_id, issue_id) VALUES (?, ?)",
+            [
+                (sess_db_id, iid)
+                for sess_db_id, s in zip(sess_db_ids, sessions)
+                for iid in s.get("issue_ids", [])
+                if iid
+            ],
+        )
+
+    conn.executemany(
+        """INSERT OR IGNORE INTO issues
+           (run_id, issue_ext_id, fingerprint, rule_id, severity_tier,
+            cwe_family, file, start_line, description, resolution, code_churn)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        [
+            (
+                run_db_id,
+                iss.get("id", ""),
+                iss["fingerprint"],
+                iss.get("rule_id", ""),
+                iss.get("severity_tier", "unknown"),
+                iss.get("cwe_family", "other"),
+                iss.get("file", ""),
+                iss.get("start_line", 0),
+                iss.get("description", ""),
+                iss.get("resolution", ""),
+                iss.get("code_churn", 0),
             )
-        except sqlite3.IntegrityError:
-            pass
+            for iss in data.get("issue_fingerprints", [])
+            if iss.get("fingerprint")
+        ],
+    )
+    return run_db_id
+
 
+def insert_run(conn: sqlite3.Connection, data: dict, source_file: str = "") -> int | None:
+    run_db_id = _insert_run_rows(conn, data, source_file)
     target_repo = data.get("target_repo", "")
-    if target_repo:
+    if run_db_id is not None and target_repo:
         refresh_fingerprint_issues(conn, target_repo=target_repo)
-
     return run_db_id
 
 
+def insert_runs(
+    conn: sqlite3.Connection,
+    runs: Iterable[tuple[dict, str]],
+    refresh_fingerprints: bool = True,
+) -> int:
+    """Insert ``(data, source_file)`` pairs in a single transaction.
+
+    Runs whose ``run_label`` is already stored are skipped.  Fingerprint
+    issues are refreshed once per affected repo rather than once per run;
+    pass ``refresh_fingerprints=False`` when the caller refreshes them
+    itself.  Returns the number of runs inserted.
+    """
+    inserted = 0
+    repos: set[str] = set()
+    with conn:
+        for data, source_file in runs:
+            if _insert_run_rows(conn, data, source_file) is None:
+                continue
+            inserted += 1
+            if data.get("target_repo"):
+                repos.add(data["target_repo"])
+        if refresh_fingerprints:
+            for target_repo in sorted(repos):
+                refresh_fingerprint_issues(conn, target_repo=target_repo)
+    return inserted
+
+
+# ``INSERT ... RETURNING`` needs SQLite 3.35; older libraries look the id up.
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35)
+
+
 def upsert_pr(conn: sqlite3.Connection, pr: dict) -> int:
     html_url = pr.get("html_url", "")
-    now = datetime.now(timezone.utc).isoformat()
-    conn.execute(
-        """INSERT INTO prs (pr_number, title, html_url, state, merged,
+    returning = " RETURNING id" if _HAS_RETURNING else ""
+    cur = conn.execute(
+        f"""INSERT INTO prs (pr_number, title, html_url, state, merged,
                             created_at, repo, user, session_id, fetched_at)
-           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, strftime('%Y-%m-%dT%H:%M:%f+00:00', 'now'))
            ON CONFLICT(html_url) DO UPDATE SET
                state = excluded.state,
                merged = excluded.merged,
                session_id = excluded.session_id,
-               fetched_at = excluded.fetched_at""",
+               fetched_at = excluded.fetched_at{returning}""",
         (
             pr.get("pr_number", 0),
             pr.get("title", ""),
@@ -402,19 +663,26 @@ def upsert_pr(conn: sqlite3.Connection, pr: dict) -> int:
             pr.get("repo", ""),
             pr.get("user", ""),
             pr.get("session_id", ""),
-            now,
         ),
     )
-    row = conn.execute("SELECT id FROM prs WHERE html_url = ?", (html_url,)).fetchone()
+    if returning:
+        row = cur.fetchone()
+    else:
+        row = conn.execute("SELECT id FROM prs WHERE html_url = ?", (html_url,)).fetchone()
     pr_db_id = row["id"]
 
-    conn.execute("DELETE FROM pr_issue_ids WHERE pr_id = ?", (pr_db_id,))
-    for iid in pr.get("issue_ids", []):
-        if iid:
-            conn.execute(
-                "INSERT INTO pr_issue_ids (pr_id, issue_id) VALUES (?, ?)",
-                (pr_db_id, iid),
-            )
+    # Only the difference is written, so re-syncing an unchanged PR leaves
+    # its issue id rows (and their pr_link entries) untouched.
+    issue_ids = list(dict.fromkeys(iid for iid in pr.get("issue_ids", []) if iid))
+    marks = ",".join("?" * len(issue_ids))
+    conn.execute(
+        f"DELETE FROM pr_issue_ids WHERE pr_id = ? AND issue_id NOT IN ({marks})",
+        [pr_db_id, *issue_ids],
+    )
+    conn.executemany(
+        "INSERT OR IGNORE INTO pr_issue_ids (pr_id, issue_id) VALUES (?, ?)",
+        [(pr_db_id, iid) for iid in issue_ids],
+    )
     return pr_db_id
 
 
@@ -431,68 +699,104 @@ def _run_row_to_dict(row: sqlite3.Row) -> dict:
     return d
 
 
-def _build_run_item(conn: sqlite3.Connection, row: sqlite3.Row) -> dict:
-    d = _run_row_to_dict(row)
-    run_db_id = row["id"]
-    has_issues = conn.execute(
-        "SELECT 1 FROM issues WHERE run_id = ? LIMIT 1", (run_db_id,)
-    ).fetchone()
-    if has_issues:
-        sev_rows = conn.execute(
-            "SELECT severity_tier, COUNT(*) as cnt FROM issues WHERE run_id = ? GROUP BY severity_tier",
-            (run_db_id,),
-        ).fetchall()
-        d["severity_breakdown"] = {r["severity_tier"]: r["cnt"] for r in sev_rows}
-        cat_rows = conn.execute(
-            "SELECT cwe_family, COUNT(*) as cnt FROM issues WHERE run_id = ? GROUP BY cwe_family",
-            (run_db_id,),
-        ).fetchall()
-        d["category_breakdown"] = {r["cwe_family"]: r["cnt"] for r in cat_rows}
-
-    sess_rows = conn.execute(
-        "SELECT * FROM sessions WHERE run_id = ?", (run_db_id,)
-    ).fetchall()
-    sessions_list = []
-    for sr in sess_rows:
-        iid_rows = conn.execute(
-            "SELECT issue_id FROM session_issue_ids WHERE session_id = ?",
-            (sr["id"],),
-        ).fetchall()
-        so_raw = sr["structured_output"] if "structured_output" in sr.keys() else ""
-        so_parsed = json.loads(so_raw) if so_raw else {}
-        sess_item: dict = {
-            "session_id": sr["session_id"],
-            "session_url": sr["session_url"],
-            "batch_id": sr["batch_id"],
-            "status": sr["status"],
-            "issue_ids": [r["issue_id"] for r in iid_rows],
-            "pr_url": sr["pr_url"],
-        }
-        if so_parsed:
-            sess_item["structured_output"] = so_parsed
-        sessions_list.append(sess_item)
-    d["sessions"] = sessions_list
+# Issue ids of session ``s`` as a JSON array, so sessions are read in one
+# query instead of one extra query per session.
+_SESSION_ISSUE_IDS_SQL = """(
+    SELECT json_group_array(issue_id) FROM (
+        SELECT si.issue_id FROM session_issue_ids si
+        WHERE si.session_id = s.id ORDER BY si.id))"""
+
+
+# Issue columns as a run lists them in ``issue_fingerprints``, so each row
+# converts straight to its dict.
+_RUN_ISSUE_COLUMNS_SQL = """i.issue_ext_id AS id, i.fingerprint, i.rule_id, i.severity_tier,
+    i.cwe_family, i.file, i.start_line, i.description, i.resolution, i.code_churn"""
 
-    fps_rows = conn.execute(
-        "SELECT * FROM issues WHERE run_id = ?", (run_db_id,)
-    ).fetchall()
-    d["issue_fingerprints"] = [
-        {
-            "id": fr["issue_ext_id"],
-            "fingerprint": fr["fingerprint"],
-            "rule_id": fr["rule_id"],
-            "severity_tier": fr["severity_tier"],
-            "cwe_family": fr["cwe_family"],
-            "file": fr["file"],
-            "start_line": fr["start_line"],
-            "description": fr["description"],
-            "resolution": fr["resolution"],
-            "code_churn": fr["code_churn"],
-        }
-        for fr in fps_rows
-    ]
-    d.pop("id", None)
-    return d
+
+# Run ids per ``IN (...)`` batch, well under SQLite's bound-parameter limit.
+_RUN_ID_BATCH = 500
+
+
+def _build_run_items(conn: sqlite3.Connection, rows: list[sqlite3.Row]) -> list[dict]:
+    """Expand run rows with their sessions and issues.
+
+    Sessions (with their issue ids) and issues are read with one query
+    each per ``_RUN_ID_BATCH`` runs rather than several per run.  Runs with
+    issues get severity/category breakdowns counted from them.
+    """
+    sessions_by_run: dict[int, list[sqlite3.Row]] = defaultdict(list)
+    issues_by_run: dict[int, list[dict]] = defaultdict(list)
+    run_ids = [row["id"] for row in rows]
+    for i in range(0, len(run_ids), _RUN_ID_BATCH):
+        batch = run_ids[i:i + _RUN_ID_BATCH]
+        marks = ",".join("?" * len(batch))
+        for sr in conn.execute(
+            f"""SELECT s.*, {_SESSION_ISSUE_IDS_SQL} AS issue_ids_json
+                FROM sessions s WHERE s.run_id IN ({marks}) ORDER BY s.id""",
+            batch,
+        ):
+            sessions_by_run[sr["run_id"]].append(sr)
+        for fr in conn.execute(
+            f"""SELECT i.run_id, {_RUN_ISSUE_COLUMNS_SQL}
+                FROM issues i WHERE i.run_id IN ({marks}) ORDER BY i.id""",
+            batch,
+        ):
+            fp = dict(fr)
+            issues_by_run[fp.pop("run_id")].append(fp)
+
+    items = []
+    for row in rows:
+        d = _run_row_to_dict(row)
+        fps_rows = issues_by_run.get(row["id"], [])
+        if fps_rows:
+            d["severity_breakdown"] = dict(sorted(Counter(fr["severity_tier"] for fr in fps_rows).items()))
+            d["category_breakdown"] = dict(sorted(Counter(fr["cwe_family"] for fr in fps_rows).items()))
+
+        sessions_list = []
+        for sr in sessions_by_run.get(row["id"], []):
+            so_raw = sr["structured_output"]
+            so_parsed = json.loads(so_raw) if so_raw else {}
+            sess_item: dict = {
+                "session_id": sr["session_id"],
+                "session_url": sr["session_url"],
+                "batch_id": sr["batch_id"],
+                "status": sr["status"],
+                "issue_ids": json.loads(sr["issue_ids_json"]),
+                "pr_url": sr["pr_url"],
+            }
+            if so_parsed:
+                sess_item["structured_output"] = so_parsed
+            sessions_list.append(sess_item)
+        d["sessions"] = sessions_list
+
+        d["issue_fingerprints"] = fps_rows
+        d.pop("id", None)
+        items.append(d)
+    return items
+
+
+def parse_cursor(cursor: str, key_type: type = str) -> tuple:
+    """Split a ``<sort key>:<row id>`` keyset cursor, raising ``ValueError`` when malformed."""
+    key, sep, row_id = cursor.rpartition(":")
+    if not sep:
+        raise ValueError(f"invalid cursor: {cursor!r}")
+    return key_type(key), int(row_id)
+
+
+def _seek_sql(key_col: str, id_col: str) -> str:
+    """Condition for rows past a cursor in ``ORDER BY key_col DESC, id_col`` order.
+
+    Binds the cursor's key twice and then its row id.  The leading
+    ``<=`` lets SQLite seek the index on *key_col*; the rest only breaks
+    ties between rows sharing the cursor's key.
+    """
+    return f"{key_col} <= ? AND ({key_col} < ? OR {id_col} > ?)"
+
+
+def _next_cursor(rows: list[sqlite3.Row], per_page: int, key_col: str) -> str | None:
+    if len(rows) < per_page:
+        return None
+    return f"{rows[-1][key_col]}:{rows[-1]['id']}"
 
 
 def query_runs(
@@ -500,54 +804,103 @@ def query_runs(
     page: int = 1,
     per_page: int = 50,
     target_repo: str = "",
+    cursor: str | None = None,
 ) -> dict:
-    where = ""
+    """Return a page of runs, highest run number first.
+
+    Pages are addressed by *page* number, or by a *cursor* taken from a
+    previous result's ``next_cursor``.  Cursor pages seek straight to
+    their first row instead of skipping the rows before it, and leave out
+    ``total``/``pages`` so no count is taken either.
+    """
+    conds: list[str] = []
     params: list = []
     if target_repo:
-        where = "WHERE r.target_repo = ?"
+        conds.append("r.target_repo = ?")
         params.append(target_repo)
 
-    total_row = conn.execute(
-        f"SELECT COUNT(*) FROM runs r {where}", params
-    ).fetchone()
-    total = total_row[0]
+    if cursor is None:
+        where = f"WHERE {conds[0]}" if conds else ""
+        total = conn.execute(f"SELECT COUNT(*) FROM runs r {where}", params).fetchone()[0]
+        offset = (page - 1) * per_page
+    else:
+        key, row_id = parse_cursor(cursor, int)
+        conds.append(_seek_sql("r.run_number", "r.id"))
+        params += [key, key, row_id]
+        offset = 0
 
-    offset = (page - 1) * per_page
-    params_q = list(params) + [per_page, offset]
+    where = f"WHERE {' AND '.join(conds)}" if conds else ""
     rows = conn.execute(
         f"""SELECT r.* FROM runs r
             {where}
-            ORDER BY r.run_number DESC
+            ORDER BY r.run_number DESC, r.id
             LIMIT ? OFFSET ?""",
-        params_q,
+        params + [per_page, offset],
     ).fetchall()
 
-    items = [_build_run_item(conn, row) for row in rows]
+    items = _build_run_items(conn, rows)
+    next_cursor = _next_cursor(rows, per_page, "run_number")
+    if cursor is not None:
+        return {"items": items, "per_page": per_page, "next_cursor": next_cursor}
     pages = max(1, (total + per_page - 1) // per_page)
-    return {"items": items, "page": page, "per_page": per_page, "total": total, "pages": pages}
+    return {
+        "items": items, "page": page, "per_page": per_page, "total": total, "pages": pages,
+        "next_cursor": next_cursor,
+    }
 
 
-def query_all_runs(conn: sqlite3.Connection, target_repo: str = "") -> list[dict]:
+def iter_all_runs(conn: sqlite3.Connection, target_repo: str = "") -> Iterator[dict]:
+    """Yield every run, highest run number first.
+
+    Rows are read and expanded ``_RUN_ID_BATCH`` at a time, so a consumer
+    that handles one run at a time never holds them all.
+    """
     where = ""
     params: list = []
     if target_repo:
         where = "WHERE r.target_repo = ?"
         params.append(target_repo)
-    rows = conn.execute(
-        f"SELECT r.* FROM runs r {where} ORDER BY r.run_number DESC", params
-    ).fetchall()
-    return [_build_run_item(conn, row) for row in rows]
+    cur = conn.execute(
+        f"SELECT r.* FROM runs r {where} ORDER BY r.run_number DESC, r.id", params
+    )
+    while rows := cur.fetchmany(_RUN_ID_BATCH):
+        yield from _build_run_items(conn, rows)
+
+
+def query_all_runs(conn: sqlite3.Connection, target_repo: str = "") -> list[dict]:
+    return list(iter_all_runs(conn, target_repo))
 
 
 # ---------------------------------------------------------------------------
 # Read helpers — sessions
 # ---------------------------------------------------------------------------
 
-def _build_session_item(conn: sqlite3.Connection, row: sqlite3.Row) -> dict:
-    iid_rows = conn.execute(
-        "SELECT issue_id FROM session_issue_ids WHERE session_id = ?",
-        (row["id"],),
-    ).fetchall()
+# PR matched to a session, first by the PR's session id, then through any
+# issue the session targeted.  ``{s}`` is the alias of the sessions table.
+_SESSION_PR_BY_SESSION_SQL = """(
+    SELECT p.html_url FROM prs p
+    WHERE {s}.session_id != ''
+      AND p.session_id = CASE WHEN substr({s}.session_id, 1, 6) = 'devin-'
+                              THEN substr({s}.session_id, 7) ELSE {s}.session_id END
+    ORDER BY p.created_at LIMIT 1)"""
+
+_SESSION_PR_BY_ISSUE_SQL = """(
+    SELECT p.html_url FROM session_issue_ids si
+    JOIN pr_link pl ON pl.issue_id = si.issue_id
+    JOIN prs p ON p.id = pl.pr_id
+    WHERE si.session_id = {s}.id
+    ORDER BY si.id LIMIT 1)"""
+
+
+def _linked_pr_url_sql(alias: str) -> str:
+    return (
+        f"COALESCE(NULLIF({alias}.pr_url, ''), "
+        f"{_SESSION_PR_BY_SESSION_SQL.format(s=alias)}, "
+        f"{_SESSION_PR_BY_ISSUE_SQL.format(s=alias)}, '')"
+    )
+
+
+def _build_session_item(row: sqlite3.Row) -> dict:
     so_raw = row["structured_output"] if "structured_output" in row.keys() else ""
     so_parsed = json.loads(so_raw) if so_raw else {}
     item: dict = {
@@ -555,7 +908,7 @@ def _build_session_item(conn: sqlite3.Connection, row: sqlite3.Row) -> dict:
         "session_url": row["session_url"],
         "batch_id": row["batch_id"],
         "status": row["status"],
-        "issue_ids": [r["issue_id"] for r in iid_rows],
+        "issue_ids": json.loads(row["issue_ids_json"]),
         "target_repo": row["target_repo"],
         "fork_url": row["fork_url"],
         "run_number": row["run_number"],
@@ -563,7 +916,7 @@ def _build_session_item(conn: sqlite3.Connection, row: sqlite3.Row) -> dict:
         "run_url": row["run_url"],
         "run_label": row["run_label"],
         "timestamp": row["timestamp"],
-        "pr_url": row["pr_url"],
+        "pr_url": row["linked_pr_url"] if "linked_pr_url" in row.keys() else row["pr_url"],
     }
     if so_parsed:
         item["structured_output"] = so_parsed
@@ -575,38 +928,61 @@ def query_sessions(
     page: int = 1,
     per_page: int = 50,
     target_repo: str = "",
+    link_prs: bool = False,
+    cursor: str | None = None,
 ) -> dict:
-    where = ""
+    """Return a page of sessions, newest run first.
+
+    With *link_prs*, sessions that have no ``pr_url`` yet are given the URL
+    of a PR matched by session id or by one of their issue ids.  *cursor*
+    pages as in ``query_runs``.
+    """
+    conds: list[str] = []
     params: list = []
     if target_repo:
-        where = "WHERE r.target_repo = ?"
+        conds.append("r.target_repo = ?")
         params.append(target_repo)
 
-    total_row = conn.execute(
-        f"SELECT COUNT(*) FROM sessions s JOIN runs r ON s.run_id = r.id {where}",
-        params,
-    ).fetchone()
-    total = total_row[0]
+    if cursor is None:
+        where = f"WHERE {conds[0]}" if conds else ""
+        total = conn.execute(
+            f"SELECT COUNT(*) FROM sessions s JOIN runs r ON s.run_id = r.id {where}",
+            params,
+        ).fetchone()[0]
+        offset = (page - 1) * per_page
+    else:
+        key, row_id = parse_cursor(cursor)
+        conds.append(_seek_sql("r.timestamp", "s.id"))
+        params += [key, key, row_id]
+        offset = 0
 
-    offset = (page - 1) * per_page
-    params_q = list(params) + [per_page, offset]
+    where = f"WHERE {' AND '.join(conds)}" if conds else ""
+    linked = f", {_linked_pr_url_sql('s')} AS linked_pr_url" if link_prs else ""
     rows = conn.execute(
         f"""SELECT s.*, r.target_repo, r.fork_url, r.run_number,
-                   r.run_id as run_ext_id, r.run_url, r.run_label, r.timestamp
+                   r.run_id as run_ext_id, r.run_url, r.run_label, r.timestamp,
+                   {_SESSION_ISSUE_IDS_SQL} AS issue_ids_json{linked}
             FROM sessions s
             JOIN runs r ON s.run_id = r.id
             {where}
-            ORDER BY r.timestamp DESC
+            ORDER BY r.timestamp DESC, s.id
             LIMIT ? OFFSET ?""",
-        params_q,
+        params + [per_page, offset],
     ).fetchall()
 
-    items = [_build_session_item(conn, row) for row in rows]
+    items = [_build_session_item(row) for row in rows]
+    next_cursor = _next_cursor(rows, per_page, "timestamp")
+    if cursor is not None:
+        return {"items": items, "per_page": per_page, "next_cursor": next_cursor}
     pages = max(1, (total + per_page - 1) // per_page)
-    return {"items": items, "page": page, "per_page": per_page, "total": total, "pages": pages}
+    return {
+        "items": items, "page": page, "per_page": per_page, "total": total, "pages": pages,
+        "next_cursor": next_cursor,
+    }
 
 
-def query_all_sessions(conn: sqlite3.Connection, target_repo: str = "") -> list[dict]:
+def iter_all_sessions(conn: sqlite3.Connection, target_repo: str = "") -> Iterator[dict]:
+    """Yield every session, newest run first, one row at a time."""
     where = ""
     params: list = []
     if target_repo:
@@ -614,24 +990,34 @@ def query_all_sessions(conn: sqlite3.Connection, target_repo: str = "") -> list[
         params.append(target_repo)
     rows = conn.execute(
         f"""SELECT s.*, r.target_repo, r.fork_url, r.run_number,
-                   r.run_id as run_ext_id, r.run_url, r.run_label, r.timestamp
+                   r.run_id as run_ext_id, r.run_url, r.run_label, r.timestamp,
+                   {_SESSION_ISSUE_IDS_SQL} AS issue_ids_json
             FROM sessions s
             JOIN runs r ON s.run_id = r.id
             {where}
-            ORDER BY r.timestamp DESC""",
+            ORDER BY r.timestamp DESC, s.id""",
         params,
-    ).fetchall()
-    return [_build_session_item(conn, row) for row in rows]
+    )
+    for row in rows:
+        yield _build_session_item(row)
+
+
+def query_all_sessions(conn: sqlite3.Connection, target_repo: str = "") -> list[dict]:
+    return list(iter_all_sessions(conn, target_repo))
 
 
 # ---------------------------------------------------------------------------
 # Read helpers — PRs
 # ---------------------------------------------------------------------------
 
-def _build_pr_item(conn: sqlite3.Connection, row: sqlite3.Row) -> dict:
-    iid_rows = conn.execute(
-        "SELECT issue_id FROM pr_issue_ids WHERE pr_id = ?", (row["id"],)
-    ).fetchall()
+# Issue ids of PR ``p`` as a JSON array, read with the PR rows as for sessions.
+_PR_ISSUE_IDS_SQL = """(
+    SELECT json_group_array(issue_id) FROM (
+        SELECT pi.issue_id FROM pr_issue_ids pi
+        WHERE pi.pr_id = p.id ORDER BY pi.id))"""
+
+
+def _build_pr_item(row: sqlite3.Row) -> dict:
     return {
         "pr_number": row["pr_number"],
         "title": row["title"],
@@ -640,7 +1026,7 @@ def _build_pr_item(conn: sqlite3.Connection, row: sqlite3.Row) -> dict:
         "merged": bool(row["merged"]),
         "created_at": row["created_at"],
         "repo": row["repo"],
-        "issue_ids": [r["issue_id"] for r in iid_rows],
+        "issue_ids": json.loads(row["issue_ids_json"]),
         "user": row["user"],
         "session_id": row["session_id"],
     }
@@ -673,21 +1059,185 @@ def query_prs(
     conn: sqlite3.Connection,
     page: int = 1,
     per_page: int = 50,
+    cursor: str | None = None,
 ) -> dict:
-    return paginated_query(
-        conn,
-        "SELECT COUNT(*) FROM prs",
-        "SELECT * FROM prs ORDER BY created_at DESC LIMIT ? OFFSET ?",
-        [],
-        page,
-        per_page,
-        _build_pr_item,
-    )
+    """Return a page of PRs, newest first; *cursor* pages as in ``query_runs``."""
+    if cursor is None:
+        total = conn.execute("SELECT COUNT(*) FROM prs").fetchone()[0]
+        where, params, offset = "", [], (page - 1) * per_page
+    else:
+        key, row_id = parse_cursor(cursor)
+        where, params, offset = f"WHERE {_seek_sql('p.created_at', 'p.id')}", [key, key, row_id], 0
+    rows = conn.execute(
+        f"""SELECT p.*, {_PR_ISSUE_IDS_SQL} AS issue_ids_json FROM prs p
+            {where}
+            ORDER BY p.created_at DESC, p.id
+            LIMIT ? OFFSET ?""",
+        params + [per_page, offset],
+    ).fetchall()
+
+    items = [_build_pr_item(row) for row in rows]
+    next_cursor = _next_cursor(rows, per_page, "created_at")
+    if cursor is not None:
+        return {"items": items, "per_page": per_page, "next_cursor": next_cursor}
+    pages = max(1, (total + per_page - 1) // per_page)
+    return {
+        "items": items, "page": page, "per_page": per_page, "total": total, "pages": pages,
+        "next_cursor": next_cursor,
+    }
 
 
 def query_all_prs(conn: sqlite3.Connection) -> list[dict]:
-    rows = conn.execute("SELECT * FROM prs ORDER BY created_at DESC").fetchall()
-    return [_build_pr_item(conn, row) for row in rows]
+    rows = conn.execute(
+        f"SELECT p.*, {_PR_ISSUE_IDS_SQL} AS issue_ids_json FROM prs p ORDER BY p.created_at DESC, p.id"
+    ).fetchall()
+    return [_build_pr_item(row) for row in rows]
+
+
+def fork_repo_name(fork_url: str) -> str:
+    """Return the ``owner/name`` of *fork_url*, the form PRs store in ``prs.repo``."""
+    path = fork_url.strip()
+    if "://" in path:
+        path = path.split("://", 1)[1].partition("/")[2]
+    path = path.strip("/")
+    if path.endswith(".git"):
+        path = path[:-4]
+    return "/".join(path.split("/")[:2])
+
+
+def query_repo_prs(
+    conn: sqlite3.Connection,
+    fork_url: str,
+    limit: int = -1,
+    offset: int = 0,
+) -> list[dict]:
+    """Return PRs opened on the fork at *fork_url*."""
+    repo = fork_repo_name(fork_url)
+    if not repo:
+        return []
+    rows = conn.execute(
+        f"""SELECT p.*, {_PR_ISSUE_IDS_SQL} AS issue_ids_json FROM prs p
+            WHERE p.repo = ?
+            ORDER BY p.created_at DESC
+            LIMIT ? OFFSET ?""",
+        (repo, limit, offset),
+    ).fetchall()
+    return [_build_pr_item(row) for row in rows]
+
+
+def count_prs_by_state(conn: sqlite3.Connection, fork_url: str) -> dict[str, int]:
+    repo = fork_repo_name(fork_url)
+    if not repo:
+        return {"total": 0, "merged": 0, "open": 0, "closed": 0}
+    row = conn.execute(
+        """SELECT COUNT(*) AS total,
+                  COALESCE(SUM(merged != 0), 0) AS merged,
+                  COALESCE(SUM(state = 'open'), 0) AS open,
+                  COALESCE(SUM(state = 'closed' AND merged = 0), 0) AS closed
+           FROM prs
+           WHERE repo = ?""",
+        (repo,),
+    ).fetchone()
+    return {"total": row["total"], "merged": row["merged"], "open": row["open"], "closed": row["closed"]}
+
+
+def _breakdown_entries_sql(column: str) -> str:
+    """``json_each`` over the breakdown *column* of run ``r``, treating invalid JSON as empty."""
+    return f"json_each(CASE WHEN json_valid(r.{column}) THEN r.{column} ELSE '{{}}' END) je"
+
+
+def _sum_breakdown(
+    conn: sqlite3.Connection,
+    column: str,
+    where: str = "",
+    params: Iterable = (),
+    runs: str = "runs r",
+) -> dict[str, int]:
+    """Sum the JSON breakdown *column* over the runs ``r`` selected by *runs* and *where*."""
+    rows = conn.execute(
+        f"""SELECT je.key AS name, SUM(je.value) AS total
+            FROM {runs}, {_breakdown_entries_sql(column)}
+            {where}
+            GROUP BY je.key""",
+        list(params),
+    ).fetchall()
+    return {row["name"]: row["total"] for row in rows}
+
+
+def _sum_breakdown_by_repo(conn: sqlite3.Connection, column: str) -> dict[str, dict[str, int]]:
+    """Sum the JSON breakdown *column* of every run, per target repo."""
+    totals: dict[str, dict[str, int]] = defaultdict(dict)
+    for row in conn.execute(
+        f"""SELECT r.target_repo AS repo, je.key AS name, SUM(je.value) AS total
+            FROM runs r, {_breakdown_entries_sql(column)}
+            GROUP BY r.target_repo, je.key"""
+    ):
+        totals[row["repo"]][row["name"]] = row["total"]
+    return totals
+
+
+def _aggregate_breakdown(conn: sqlite3.Connection, column: str, target_repo: str) -> dict[str, int]:
+    return _sum_breakdown(conn, column, "WHERE r.target_repo = ?", (target_repo,))
+
+
+def aggregate_severity(conn: sqlite3.Connection, target_repo: str) -> dict[str, int]:
+    return _aggregate_breakdown(conn, "severity_breakdown", target_repo)
+
+
+def aggregate_category(conn: sqlite3.Connection, target_repo: str) -> dict[str, int]:
+    return _aggregate_breakdown(conn, "category_breakdown", target_repo)
+
+
+def query_repo_totals(conn: sqlite3.Connection, target_repo: str) -> dict[str, int]:
+    runs_row = conn.execute(
+        """SELECT COUNT(*) as runs, COALESCE(SUM(issues_found), 0) as issues_found
+           FROM runs WHERE target_repo = ?""",
+        (target_repo,),
+    ).fetchone()
+    sess_row = conn.execute(
+        """SELECT
+               COALESCE(SUM(s.session_id != ''), 0) as sessions_created,
+               COALESCE(SUM(s.status IN ('finished', 'stopped')), 0) as sessions_finished
+           FROM sessions s JOIN runs r ON s.run_id = r.id
+           WHERE r.target_repo = ?""",
+        (target_repo,),
+    ).fetchone()
+    return {
+        "runs": runs_row["runs"],
+        "issues_found": runs_row["issues_found"],
+        "sessions_created": sess_row["sessions_created"],
+        "sessions_finished": sess_row["sessions_finished"],
+    }
+
+
+def query_repo_fork_url(conn: sqlite3.Connection, target_repo: str) -> str:
+    row = conn.execute(
+        "SELECT MAX(fork_url) FROM runs WHERE target_repo = ?", (target_repo,)
+    ).fetchone()
+    return row[0] or ""
+
+
+def query_open_repo_prs(conn: sqlite3.Connection, target_repo: str) -> list[dict]:
+    """Return open, unmerged PRs that belong to *target_repo*.
+
+    A PR belongs to the repo when one of the repo's sessions points at it,
+    or when it was opened on the fork used by the repo's latest run.
+    """
+    latest = conn.execute(
+        "SELECT fork_url FROM runs WHERE target_repo = ? ORDER BY run_number DESC LIMIT 1",
+        (target_repo,),
+    ).fetchone()
+    fork_repo = fork_repo_name(latest["fork_url"]) if latest else ""
+    rows = conn.execute(
+        """SELECT p.pr_number, p.title, p.html_url FROM prs p
+           WHERE p.state = 'open' AND p.merged = 0 AND p.repo != ''
+             AND (p.repo = ?2
+                  OR p.html_url IN (SELECT s.pr_url FROM sessions s JOIN runs r ON s.run_id = r.id
+                                    WHERE r.target_repo = ?1 AND s.pr_url != ''))
+           ORDER BY p.created_at DESC""",
+        (target_repo, fork_repo),
+    ).fetchall()
+    return [dict(row) for row in rows]
 
 
 # ---------------------------------------------------------------------------
@@ -715,7 +1265,7 @@ def query_stats(conn: sqlite3.Connection, target_repo: str = "", period: str = "
     row = conn.execute(
         f"""SELECT
                 COUNT(DISTINCT r.target_repo) as repos_scanned,
-                COUNT(DISTINCT r.id) as total_runs,
+                COUNT(*) as total_runs,
                 COALESCE(SUM(r.issues_found), 0) as total_issues
             FROM runs r {where}""",
         params,
@@ -745,64 +1295,49 @@ def query_stats(conn: sqlite3.Connection, target_repo: str = "", period: str = "
     sessions_finished = s_row["sessions_finished"]
     sessions_with_pr = s_row["sessions_with_pr"]
 
-    all_prs = query_all_prs(conn)
+    # Without a period every PR counts; with one, only PRs tied to a session
+    # of the period by session id or through a shared issue id.
+    pr_where = ""
+    pr_params: list = []
     if cutoff:
-        session_ids_in_period = set()
-        all_issue_ids_in_period = set()
-        sess_rows = conn.execute(
-            f"""SELECT s.session_id, s.id as sid FROM sessions s
-                JOIN runs r2 ON s.run_id = r2.id {sess_where}""",
-            sess_params,
-        ).fetchall()
-        for sr in sess_rows:
-            if sr["session_id"]:
-                session_ids_in_period.add(sr["session_id"])
-            iids = conn.execute(
-                "SELECT issue_id FROM session_issue_ids WHERE session_id = ?",
-                (sr["sid"],),
-            ).fetchall()
-            for iid in iids:
-                all_issue_ids_in_period.add(iid["issue_id"])
-        filtered_prs = [
-            p for p in all_prs
-            if p.get("session_id") in session_ids_in_period
-            or any(pid in all_issue_ids_in_period for pid in p.get("issue_ids", []))
-        ]
-    else:
-        filtered_prs = all_prs
-
-    pr_merged = sum(1 for p in filtered_prs if p.get("merged", False))
-    pr_open = sum(1 for p in filtered_prs if p.get("state") == "open")
-    pr_closed = sum(1 for p in filtered_prs if p.get("state") == "closed" and not p.get("merged", False))
-
-    severity_agg: dict[str, int] = {}
-    category_agg: dict[str, int] = {}
-    run_rows = conn.execute(
-        f"SELECT r.severity_breakdown, r.category_breakdown FROM runs r {where}", params
-    ).fetchall()
-    for rr in run_rows:
-        for tier, count in json.loads(rr["severity_breakdown"] or "{}").items():
-            severity_agg[tier] = severity_agg.get(tier, 0) + count
-        for cat, count in json.loads(rr["category_breakdown"] or "{}").items():
-            category_agg[cat] = category_agg.get(cat, 0) + count
-
-    latest_rows = conn.execute(
-        f"""SELECT lr.* FROM runs lr
-            INNER JOIN (
-                SELECT target_repo, MAX(timestamp) as max_ts
-                FROM runs r {where}
-                GROUP BY target_repo
-            ) sub ON lr.target_repo = sub.target_repo AND lr.timestamp = sub.max_ts""",
-        params,
-    ).fetchall()
-    latest_issues = sum(r["issues_found"] for r in latest_rows)
-    latest_severity: dict[str, int] = {}
-    latest_category: dict[str, int] = {}
-    for r in latest_rows:
-        for tier, count in json.loads(r["severity_breakdown"] or "{}").items():
-            latest_severity[tier] = latest_severity.get(tier, 0) + count
-        for cat, count in json.loads(r["category_breakdown"] or "{}").items():
-            latest_category[cat] = latest_category.get(cat, 0) + count
+        sess_cond = sess_where[len("WHERE "):]
+        pr_where = f"""WHERE p.session_id IN (
+                SELECT s.session_id FROM sessions s JOIN runs r2 ON s.run_id = r2.id
+                WHERE s.session_id != '' AND {sess_cond})
+            OR EXISTS (
+                SELECT 1 FROM pr_issue_ids pi
+                JOIN session_issue_ids si ON si.issue_id = pi.issue_id
+                JOIN sessions s ON s.id = si.session_id
+                JOIN runs r2 ON s.run_id = r2.id
+                WHERE pi.pr_id = p.id AND {sess_cond})"""
+        pr_params = sess_params + sess_params
+    pr_row = conn.execute(
+        f"""SELECT COUNT(*) AS total,
+                   COALESCE(SUM(merged != 0), 0) AS merged,
+                   COALESCE(SUM(state = 'open'), 0) AS open,
+                   COALESCE(SUM(state = 'closed' AND merged = 0), 0) AS closed
+            FROM prs p {pr_where}""",
+        pr_params,
+    ).fetchone()
+    prs_total = pr_row["total"]
+    pr_merged = pr_row["merged"]
+    pr_open = pr_row["open"]
+    pr_closed = pr_row["closed"]
+
+    severity_agg = _sum_breakdown(conn, "severity_breakdown", where, params)
+    category_agg = _sum_breakdown(conn, "category_breakdown", where, params)
+
+    latest_runs = f"""runs r
+        INNER JOIN (
+            SELECT target_repo, MAX(timestamp) as max_ts
+            FROM runs r {where}
+            GROUP BY target_repo
+        ) sub ON r.target_repo = sub.target_repo AND r.timestamp = sub.max_ts"""
+    latest_issues = conn.execute(
+        f"SELECT COALESCE(SUM(r.issues_found), 0) FROM {latest_runs}", params
+    ).fetchone()[0]
+    latest_severity = _sum_breakdown(conn, "severity_breakdown", params=params, runs=latest_runs)
+    latest_category = _sum_breakdown(conn, "category_breakdown", params=params, runs=latest_runs)
 
     return {
         "repos_scanned": repos_scanned,
@@ -815,11 +1350,11 @@ def query_stats(conn: sqlite3.Connection, target_repo: str = "", period: str = "
         "sessions_created": sessions_created,
         "sessions_finished": sessions_finished,
         "sessions_with_pr": sessions_with_pr,
-        "prs_total": len(filtered_prs),
+        "prs_total": prs_total,
         "prs_merged": pr_merged,
         "prs_open": pr_open,
         "prs_closed": pr_closed,
-        "fix_rate": round(pr_merged / max(len(filtered_prs), 1) * 100, 1),
+        "fix_rate": round(pr_merged / max(prs_total, 1) * 100, 1),
         "severity_breakdown": severity_agg,
         "category_breakdown": category_agg,
     }
@@ -845,31 +1380,31 @@ def query_repos(conn: sqlite3.Connection) -> list[dict]:
            ORDER BY last_run DESC"""
     ).fetchall()
 
-    all_prs = query_all_prs(conn)
+    pr_counts = {
+        r["repo"]: r
+        for r in conn.execute(
+            """SELECT repo, COUNT(*) AS total,
+                      COALESCE(SUM(merged != 0), 0) AS merged,
+                      COALESCE(SUM(state = 'open'), 0) AS open
+               FROM prs
+               WHERE repo != ''
+               GROUP BY repo"""
+        )
+    }
+    severity_by_repo = _sum_breakdown_by_repo(conn, "severity_breakdown")
+    category_by_repo = _sum_breakdown_by_repo(conn, "category_breakdown")
     repos_list = []
     for row in rows:
         repo = row["repo"]
         fork_url = row["fork_url"]
 
-        sev_agg: dict[str, int] = {}
-        cat_agg: dict[str, int] = {}
-        run_rows = conn.execute(
-            "SELECT severity_breakdown, category_breakdown FROM runs WHERE target_repo = ?",
-            (repo,),
-        ).fetchall()
-        for rr in run_rows:
-            for tier, count in json.loads(rr["severity_breakdown"] or "{}").items():
-                sev_agg[tier] = sev_agg.get(tier, 0) + count
-            for cat, count in json.loads(rr["category_breakdown"] or "{}").items():
-                cat_agg[cat] = cat_agg.get(cat, 0) + count
-
-        repo_prs = [
-            p for p in all_prs
-            if fork_url and p.get("repo", "") and p["repo"] in fork_url
-        ]
-        prs_total = len(repo_prs)
-        prs_merged = sum(1 for p in repo_prs if p.get("merged"))
-        prs_open = sum(1 for p in repo_prs if p.get("state") == "open")
+        sev_agg = severity_by_repo.get(repo, {})
+        cat_agg = category_by_repo.get(repo, {})
+
+        counts = pr_counts.get(fork_repo_name(fork_url or ""))
+        prs_total = counts["total"] if counts else 0
+        prs_merged = counts["merged"] if counts else 0
+        prs_open = counts["open"] if counts else 0
 
         repos_list.append({
             "repo": repo,
@@ -898,89 +1433,69 @@ def refresh_fingerprint_issues(conn: sqlite3.Connection, target_repo: str = "")
     This materialises the cross-run tracking view so that query_issues()
     can read directly from a single table keyed by fingerprint.
 
+    One query derives every fingerprint's row, status included: a
+    fingerprint in any repo's latest run is ``recurring`` if it was seen
+    before (or its repo has earlier runs without issues) and ``new``
+    otherwise; anything else is ``fixed``.  Only the fix duration, which
+    needs ``_parse_ts``, is computed here.  Agent scores already stored for
+    a fingerprint are carried over.
+
     Returns the number of fingerprint rows upserted.
     """
-    from issue_tracking import _parse_ts
-
-    repo_where = ""
-    repo_params: list = []
-    if target_repo:
-        repo_where = "WHERE r.target_repo = ?"
-        repo_params.append(target_repo)
-
+    repo_where = "WHERE r.target_repo = :repo" if target_repo else ""
     rows = conn.execute(
-        f"""SELECT i.*, r.target_repo, r.run_number, r.timestamp, r.id as db_run_id
-            FROM issues i
-            JOIN runs r ON i.run_id = r.id
-            {repo_where}
-            ORDER BY r.timestamp ASC""",
-        repo_params,
-    ).fetchall()
-
-    fp_history: dict[str, list[dict]] = {}
-    fp_metadata: dict[str, dict] = {}
-    for row in rows:
-        fp = row["fingerprint"]
-        if fp not in fp_history:
-            fp_history[fp] = []
-        fp_history[fp].append({
-            "run_number": row["run_number"],
-            "timestamp": row["timestamp"],
-            "issue_id": row["issue_ext_id"],
-            "target_repo": row["target_repo"],
-        })
-        if fp not in fp_metadata:
-            fp_metadata[fp] = {
-                "rule_id": row["rule_id"],
-                "severity_tier": row["severity_tier"],
-                "cwe_family": row["cwe_family"],
-                "file": row["file"],
-                "start_line": row["start_line"],
-                "description": row["description"],
-                "resolution": row["resolution"],
-                "code_churn": row["code_churn"],
-            }
-
-    repo_filter_sql = "WHERE r.target_repo = ?" if target_repo else ""
-    r_params = [target_repo] if target_repo else []
-
-    runs_per_repo: dict[str, int] = {}
-    runs_with_fps_per_repo: dict[str, int] = {}
-    all_runs = conn.execute(
-        f"SELECT r.id, r.target_repo FROM runs r {repo_filter_sql}", r_params
-    ).fetchall()
-    for ar in all_runs:
-        repo = ar["target_repo"]
-        runs_per_repo[repo] = runs_per_repo.get(repo, 0) + 1
-        has_fps = conn.execute(
-            "SELECT 1 FROM issues WHERE run_id = ? LIMIT 1", (ar["id"],)
-        ).fetchone()
-        if has_fps:
-            runs_with_fps_per_repo[repo] = runs_with_fps_per_repo.get(repo, 0) + 1
-
-    latest_run_per_repo: dict[str, int] = {}
-    latest_where = "WHERE" if not repo_filter_sql else repo_filter_sql + " AND"
-    lr_rows = conn.execute(
-        f"SELECT target_repo, id as latest_run_id FROM runs r {latest_where} id IN (SELECT r2.id FROM runs r2 WHERE r2.target_repo = r.target_repo ORDER BY r2.timestamp DESC LIMIT 1)",
-        r_params,
-    ).fetchall()
-    for lr in lr_rows:
-        latest_run_per_repo[lr["target_repo"]] = lr["latest_run_id"]
-
-    latest_fps: set[str] = set()
-    for _repo, run_id in latest_run_per_repo.items():
-        fp_rows = conn.execute(
-            "SELECT DISTINCT fingerprint FROM issues WHERE run_id = ?", (run_id,)
-        ).fetchall()
-        for fr in fp_rows:
-            latest_fps.add(fr["fingerprint"])
-
-    existing_agent_scores: dict[str, tuple] = {}
-    score_rows = conn.execute(
-        "SELECT fingerprint, agent_priority_score, agent_dispatch FROM fingerprint_issues WHERE agent_priority_score IS NOT NULL"
+        f"""WITH latest_fps AS (
+                SELECT DISTINCT i.fingerprint FROM issues i
+                WHERE i.run_id IN (
+                    SELECT id FROM (
+                        SELECT r.id,
+                               ROW_NUMBER() OVER (
+                                   PARTITION BY r.target_repo ORDER BY r.timestamp DESC, r.id DESC
+                               ) AS rn
+                        FROM runs r {repo_where}
+                    )
+                    WHERE rn = 1)
+            ),
+            repo_runs AS (
+                SELECT r.target_repo,
+                       COUNT(*) > SUM(EXISTS (SELECT 1 FROM issues WHERE run_id = r.id)) AS has_runs_without_fps
+                FROM runs r {repo_where}
+                GROUP BY r.target_repo
+            ),
+            -- One row per fingerprint: the metadata of its first appearance,
+            -- plus its latest appearance and count.
+            fp AS (
+                SELECT * FROM (
+                    SELECT i.fingerprint, i.rule_id, i.severity_tier, i.cwe_family, i.file,
+                           i.start_line, i.description, i.resolution, i.code_churn,
+                           r.target_repo, r.run_number, r.timestamp, i.id,
+                           ROW_NUMBER() OVER first_w AS rn,
+                           COUNT(*) OVER (PARTITION BY i.fingerprint) AS appearances,
+                           FIRST_VALUE(r.run_number) OVER last_w AS last_run_number,
+                           FIRST_VALUE(r.timestamp) OVER last_w AS last_timestamp,
+                           FIRST_VALUE(i.issue_ext_id) OVER last_w AS latest_issue_id
+                    FROM issues i
+                    JOIN runs r ON i.run_id = r.id
+                    {repo_where}
+                    WINDOW first_w AS (PARTITION BY i.fingerprint ORDER BY r.timestamp, i.id),
+                           last_w AS (PARTITION BY i.fingerprint ORDER BY r.timestamp DESC, i.id DESC)
+                )
+                WHERE rn = 1
+            )
+            SELECT fp.*,
+                   CASE
+                       WHEN fp.fingerprint NOT IN (SELECT fingerprint FROM latest_fps) THEN 'fixed'
+                       WHEN fp.appearances > 1 OR rr.has_runs_without_fps THEN 'recurring'
+                       ELSE 'new'
+                   END AS status,
+                   old.agent_priority_score, old.agent_dispatch
+            FROM fp
+            JOIN repo_runs rr ON rr.target_repo = fp.target_repo
+            LEFT JOIN fingerprint_issues old
+                   ON old.fingerprint = fp.fingerprint AND old.agent_priority_score IS NOT NULL
+            ORDER BY fp.timestamp, fp.id""",
+        {"repo": target_repo},
     ).fetchall()
-    for sr in score_rows:
-        existing_agent_scores[sr["fingerprint"]] = (sr["agent_priority_score"], sr["agent_dispatch"])
 
     if target_repo:
         conn.execute(
@@ -990,110 +1505,126 @@ def refresh_fingerprint_issues(conn: sqlite3.Connection, target_repo: str = "")
     else:
         conn.execute("DELETE FROM fingerprint_issues")
 
-    upserted = 0
-    for fp, appearances in fp_history.items():
-        first = appearances[0]
-        latest = appearances[-1]
-        repo = first["target_repo"]
-
-        has_older_runs_without_fps = (
-            runs_per_repo.get(repo, 0) > runs_with_fps_per_repo.get(repo, 0)
-        )
-
-        if fp in latest_fps:
-            if len(appearances) > 1 or has_older_runs_without_fps:
-                status = "recurring"
-            else:
-                status = "new"
-        else:
-            status = "fixed"
-
-        meta = fp_metadata.get(fp, {})
-
+    values = []
+    for row in rows:
         fix_duration_hours = None
-        if status == "fixed":
-            first_ts = _parse_ts(first["timestamp"])
-            latest_ts = _parse_ts(latest["timestamp"])
+        if row["status"] == "fixed":
+            first_ts = _parse_ts(row["timestamp"])
+            latest_ts = _parse_ts(row["last_timestamp"])
             if first_ts and latest_ts:
                 delta = latest_ts - first_ts
                 fix_duration_hours = round(delta.total_seconds() / 3600, 1)
 
-        saved_scores = existing_agent_scores.get(fp)
-        agent_score = saved_scores[0] if saved_scores else None
-        agent_disp = saved_scores[1] if saved_scores else None
+        values.append((
+            row["fingerprint"],
+            row["rule_id"],
+            row["severity_tier"],
+            row["cwe_family"],
+            row["file"],
+            row["start_line"],
+            row["description"],
+            row["resolution"],
+            row["code_churn"],
+            row["target_repo"],
+            row["status"],
+            row["run_number"],
+            row["timestamp"],
+            row["last_run_number"],
+            row["last_timestamp"],
+            row["appearances"],
+            row["latest_issue_id"],
+            fix_duration_hours,
+            row["agent_priority_score"],
+            row["agent_dispatch"],
+        ))
+
+    conn.executemany(
+        """INSERT OR REPLACE INTO fingerprint_issues
+           (fingerprint, rule_id, severity_tier, cwe_family, file, start_line,
+            description, resolution, code_churn, target_repo, status,
+            first_seen_run, first_seen_date, last_seen_run, last_seen_date,
+            appearances, latest_issue_id, fix_duration_hours,
+            agent_priority_score, agent_dispatch)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        values,
+    )
+    return len(values)
 
-        conn.execute(
-            """INSERT OR REPLACE INTO fingerprint_issues
-               (fingerprint, rule_id, severity_tier, cwe_family, file, start_line,
-                description, resolution, code_churn, target_repo, status,
-                first_seen_run, first_seen_date, last_seen_run, last_seen_date,
-                appearances, latest_issue_id, fix_duration_hours,
-                agent_priority_score, agent_dispatch)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-            (
-                fp,
-                meta.get("rule_id", ""),
-                meta.get("severity_tier", "unknown"),
-                meta.get("cwe_family", "other"),
-                meta.get("file", ""),
-                meta.get("start_line", 0),
-                meta.get("description", ""),
-                meta.get("resolution", ""),
-                meta.get("code_churn", 0),
-                repo,
-                status,
-                first["run_number"],
-                first["timestamp"],
-                latest["run_number"],
-                latest["timestamp"],
-                len(appearances),
-                latest["issue_id"],
-                fix_duration_hours,
-                agent_score,
-                agent_disp,
-            ),
-        )
-        upserted += 1
 
-    return upserted
+def count_issues(conn: sqlite3.Connection, target_repo: str = "") -> int:
+    if target_repo:
+        return conn.execute(
+            "SELECT COUNT(*) FROM fingerprint_issues WHERE target_repo = ?", (target_repo,)
+        ).fetchone()[0]
+    return conn.execute("SELECT COUNT(*) FROM fingerprint_issues").fetchone()[0]
+
+
+def count_issues_by_status(conn: sqlite3.Connection) -> dict[str, int]:
+    rows = conn.execute(
+        "SELECT status, COUNT(*) AS n FROM fingerprint_issues GROUP BY status"
+    ).fetchall()
+    return {row["status"]: row["n"] for row in rows}
+
 
+def count_fixed_issues(conn: sqlite3.Connection, severity_tier: str = "") -> int:
+    """Count fixed issues, optionally restricted to one *severity_tier*."""
+    return conn.execute(
+        """SELECT COUNT(*) FROM fingerprint_issues
+           WHERE status IN ('fixed', 'verified_fixed')
+             AND (?1 = '' OR severity_tier = ?1)""",
+        (severity_tier,),
+    ).fetchone()[0]
 
-def query_issues(conn: sqlite3.Connection, target_repo: str = "") -> list[dict]:
+
+def query_issues(
+    conn: sqlite3.Connection,
+    target_repo: str = "",
+    limit: int | None = None,
+    offset: int = 0,
+) -> list[dict]:
     where = ""
     params: list = []
     if target_repo:
         where = "WHERE fi.target_repo = ?"
         params.append(target_repo)
+    page_sql = ""
+    if limit is not None:
+        page_sql = "LIMIT ? OFFSET ?"
+        params.extend([limit, offset])
 
+    # The page is cut first so each fingerprint's run numbers are only
+    # gathered for the rows returned.
     rows = conn.execute(
-        f"""SELECT fi.* FROM fingerprint_issues fi
-            {where}
-            ORDER BY
-                CASE fi.status
-                    WHEN 'recurring' THEN 0
-                    WHEN 'new'       THEN 1
-                    WHEN 'fixed'     THEN 2
-                    ELSE 3
-                END,
-                fi.last_seen_date""",
+        f"""SELECT page.*, (
+                SELECT json_group_array(run_number) FROM (
+                    SELECT DISTINCT r.run_number
+                    FROM issues i JOIN runs r ON i.run_id = r.id
+                    WHERE i.fingerprint = page.fingerprint
+                    ORDER BY r.run_number)
+            ) AS run_numbers_json
+            FROM (
+                SELECT fi.*, fi.rowid AS fi_rowid,
+                       CASE fi.status
+                           WHEN 'recurring' THEN 0
+                           WHEN 'new'       THEN 1
+                           WHEN 'fixed'     THEN 2
+                           ELSE 3
+                       END AS status_rank
+                FROM fingerprint_issues fi
+                {where}
+                ORDER BY status_rank, fi.last_seen_date, fi.rowid
+                {page_sql}
+            ) page
+            ORDER BY page.status_rank, page.last_seen_date, page.fi_rowid""",
         params,
     ).fetchall()
 
-    from issue_tracking import compute_sla_status, _parse_ts
-
     result: list[dict] = []
     for row in rows:
         fp = row["fingerprint"]
         status = row["status"]
 
-        run_number_rows = conn.execute(
-            """SELECT DISTINCT r.run_number
-               FROM issues i JOIN runs r ON i.run_id = r.id
-               WHERE i.fingerprint = ?
-               ORDER BY r.run_number""",
-            (fp,),
-        ).fetchall()
-        run_numbers = [r["run_number"] for r in run_number_rows]
+        run_numbers = json.loads(row["run_numbers_json"])
 
         found_at_ts = _parse_ts(row["first_seen_date"])
         fixed_at_ts = _parse_ts(row["last_seen_date"]) if status == "fixed" else None
@@ -1147,7 +1678,6 @@ def query_issue_detail(conn: sqlite3.Connection, fingerprint: str) -> dict | Non
     if not row:
         return None
 
-    from issue_tracking import compute_sla_status, _parse_ts
 
     status = row["status"]
     run_number_rows = conn.execute(
@@ -1354,25 +1884,23 @@ def search_issues(conn: sqlite3.Connection, query: str, target_repo: str = "") -
     except sqlite3.OperationalError:
         return []
 
-    fts_rows = conn.execute(
-        "SELECT rowid, rank FROM issues_fts WHERE issues_fts MATCH ? ORDER BY rank LIMIT 100",
-        (query,),
-    ).fetchall()
-    if not fts_rows:
-        return []
-
-    rowids = [r["rowid"] for r in fts_rows]
-    placeholders = ",".join("?" * len(rowids))
+    params: list = [query]
+    repo_sql = ""
+    if target_repo:
+        repo_sql = "AND r.target_repo = ?"
+        params.append(target_repo)
     issue_rows = conn.execute(
-        f"""SELECT i.*, r.target_repo, r.run_number, r.timestamp
-            FROM issues i JOIN runs r ON i.run_id = r.id
-            WHERE i.id IN ({placeholders})""",
-        rowids,
+        f"""SELECT i.fingerprint, i.rule_id, i.severity_tier, i.cwe_family, i.file,
+                   i.start_line, i.description, r.target_repo, r.run_number, r.timestamp
+            FROM issues_fts
+            JOIN issues i ON i.id = issues_fts.rowid
+            JOIN runs r ON i.run_id = r.id
+            WHERE issues_fts MATCH ? {repo_sql}
+            ORDER BY bm25(issues_fts), i.id
+            LIMIT 100""",
+        params,
     ).fetchall()
 
-    if target_repo:
-        issue_rows = [r for r in issue_rows if r["target_repo"] == target_repo]
-
     return [
         {
             "fingerprint": r["fingerprint"],
@@ -1423,31 +1951,70 @@ def update_session(
 
 
 def backfill_pr_urls(conn: sqlite3.Connection) -> int:
-    patched = 0
-    sessions = conn.execute(
-        "SELECT s.id, s.session_id FROM sessions s WHERE s.pr_url = ''"
+    """Fill empty session ``pr_url`` values from PRs linked to their issues."""
+    by_issue = _SESSION_PR_BY_ISSUE_SQL.format(s="sessions")
+    cur = conn.execute(
+        f"""UPDATE sessions SET pr_url = {by_issue}
+            WHERE pr_url = '' AND {by_issue} IS NOT NULL"""
+    )
+    return cur.rowcount
+
+
+def query_pr_urls_by_issue(conn: sqlite3.Connection) -> dict[str, str]:
+    """Map each issue id to the URL of the oldest PR that references it.
+
+    Reads ``pr_link``, so run files are patched with the same PR the
+    session queries link to.
+    """
+    rows = conn.execute(
+        """SELECT pl.issue_id, p.html_url FROM pr_link pl
+           JOIN prs p ON p.id = pl.pr_id"""
     ).fetchall()
-    for s in sessions:
-        iid_rows = conn.execute(
-            "SELECT issue_id FROM session_issue_ids WHERE session_id = ?",
-            (s["id"],),
-        ).fetchall()
-        for iid_row in iid_rows:
-            pr_row = conn.execute(
-                """SELECT p.html_url FROM prs p
-                   JOIN pr_issue_ids pi ON pi.pr_id = p.id
-                   WHERE pi.issue_id = ?
-                   LIMIT 1""",
-                (iid_row["issue_id"],),
-            ).fetchone()
-            if pr_row:
-                conn.execute(
-                    "UPDATE sessions SET pr_url = ? WHERE id = ?",
-                    (pr_row["html_url"], s["id"]),
-                )
-                patched += 1
-                break
-    return patched
+    return {row["issue_id"]: row["html_url"] for row in rows}
+
+
+def query_file_backfill_candidates(conn: sqlite3.Connection) -> list[sqlite3.Row]:
+    """Return ``(id, source_file)`` of runs whose JSON file may need patching now.
+
+    Empty issue ids are not stored, so a run is only passed over when every
+    session has a stored issue id and none of them is referenced by a PR
+    yet: its file could not change, and it stays a candidate for later.
+    """
+    return conn.execute(
+        """SELECT r.id, r.source_file FROM runs r
+           WHERE r.file_backfilled = 0 AND r.source_file != ''
+             AND (
+                 EXISTS (
+                     SELECT 1 FROM sessions s
+                     JOIN session_issue_ids si ON si.session_id = s.id
+                     JOIN pr_link pl ON pl.issue_id = si.issue_id
+                     WHERE s.run_id = r.id
+                 )
+                 OR EXISTS (
+                     SELECT 1 FROM sessions s
+                     WHERE s.run_id = r.id
+                       AND NOT EXISTS (SELECT 1 FROM session_issue_ids si WHERE si.session_id = s.id)
+                 )
+                 OR NOT EXISTS (SELECT 1 FROM sessions s WHERE s.run_id = r.id)
+             )"""
+    ).fetchall()
+
+
+def mark_runs_file_backfilled(conn: sqlite3.Connection, run_ids: list[int]) -> None:
+    conn.executemany("UPDATE runs SET file_backfilled = 1 WHERE id = ?", [(i,) for i in run_ids])
+
+
+def link_session_pr_urls(conn: sqlite3.Connection) -> int:
+    """Fill empty session ``pr_url`` values by session id, then by issue id."""
+    linked = (
+        f"COALESCE({_SESSION_PR_BY_SESSION_SQL.format(s='sessions')}, "
+        f"{_SESSION_PR_BY_ISSUE_SQL.format(s='sessions')})"
+    )
+    cur = conn.execute(
+        f"""UPDATE sessions SET pr_url = {linked}
+            WHERE pr_url = '' AND {linked} IS NOT NULL"""
+    )
+    return cur.rowcount
 
 
 def collect_session_ids_from_db(conn: sqlite3.Connection) -> set[str]:
@@ -1473,6 +2040,7 @@ def insert_audit_log(
     resource: str = "",
     details: str = "",
 ) -> int:
+    """Insert and commit one audit entry; batches should use :func:`insert_audit_logs`."""
     now = datetime.now(timezone.utc).isoformat()
     cur = conn.execute(
         """INSERT INTO audit_log (timestamp, user, action, resource, details)
@@ -1483,13 +2051,30 @@ def insert_audit_log(
     return cur.lastrowid or 0
 
 
+def insert_audit_logs(
+    conn: sqlite3.Connection,
+    rows: list[tuple[str, str, str, str, str]],
+) -> None:
+    """Insert pre-timestamped ``(timestamp, user, action, resource, details)`` rows in one transaction."""
+    if not rows:
+        return
+    conn.executemany(
+        """INSERT INTO audit_log (timestamp, user, action, resource, details)
+           VALUES (?, ?, ?, ?, ?)""",
+        rows,
+    )
+    conn.commit()
+
+
 def query_audit_logs(
     conn: sqlite3.Connection,
     page: int = 1,
     per_page: int = 50,
     action_filter: str = "",
     user_filter: str = "",
+    cursor: str | None = None,
 ) -> dict:
+    """Return a page of audit entries, newest first; *cursor* pages as in ``query_runs``."""
     conditions: list[str] = []
     params: list[str] = []
     if action_filter:
@@ -1499,42 +2084,72 @@ def query_audit_logs(
         conditions.append("user = ?")
         params.append(user_filter)
 
-    where = ""
-    if conditions:
+    if cursor is None:
+        where = "WHERE " + " AND ".join(conditions) if conditions else ""
+        total = conn.execute(f"SELECT COUNT(*) FROM audit_log {where}", params).fetchone()[0]
+        offset = (page - 1) * per_page
+    else:
+        key, row_id = parse_cursor(cursor)
+        conditions.append(_seek_sql("timestamp", "id"))
+        params += [key, key, row_id]
         where = "WHERE " + " AND ".join(conditions)
-
-    total_row = conn.execute(
-        f"SELECT COUNT(*) FROM audit_log {where}", params
-    ).fetchone()
-    total = total_row[0]
-
-    offset = (page - 1) * per_page
+        offset = 0
     rows = conn.execute(
         f"""SELECT * FROM audit_log {where}
-            ORDER BY timestamp DESC
+            ORDER BY timestamp DESC, id
             LIMIT ? OFFSET ?""",
         params + [per_page, offset],
     ).fetchall()
 
     items = [dict(r) for r in rows]
+    next_cursor = _next_cursor(rows, per_page, "timestamp")
+    if cursor is not None:
+        return {"items": items, "per_page": per_page, "next_cursor": next_cursor}
     pages = max(1, (total + per_page - 1) // per_page)
-    return {"items": items, "page": page, "per_page": per_page, "total": total, "pages": pages}
+    return {
+        "items": items, "page": page, "per_page": per_page, "total": total, "pages": pages,
+        "next_cursor": next_cursor,
+    }
 
 
-def export_audit_logs(
-    conn: sqlite3.Connection,
-    since: str = "",
-) -> list[dict]:
+def iter_audit_logs(conn: sqlite3.Connection, since: str = "") -> Iterator[dict]:
+    """Yield audit entries oldest first, straight off the cursor."""
     if since:
         rows = conn.execute(
             "SELECT * FROM audit_log WHERE timestamp >= ? ORDER BY timestamp",
             (since,),
-        ).fetchall()
+        )
     else:
         rows = conn.execute(
             "SELECT * FROM audit_log ORDER BY timestamp"
-        ).fetchall()
-    return [dict(r) for r in rows]
+        )
+    for r in rows:
+        yield dict(r)
+
+
+def export_audit_logs(
+    conn: sqlite3.Connection,
+    since: str = "",
+) -> list[dict]:
+    return list(iter_audit_logs(conn, since))
+
+
+def write_audit_log_export(path: pathlib.Path, meta: dict, entries: Iterable[dict]) -> int:
+    """Write ``{**meta, "entries": [...]}`` to *path* as indented JSON, one entry at a time.
+
+    The file matches ``json.dump(..., indent=2)`` of the whole document,
+    but *entries* may be a generator and is never held in memory.
+    Returns the number of entries written.
+    """
+    count = 0
+    with open(path, "w") as f:
+        f.write(json.dumps(meta, indent=2)[:-2] + ',\n  "entries": [')
+        for entry in entries:
+            f.write(",\n" if count else "\n")
+            f.write(textwrap.indent(json.dumps(entry, indent=2), "    "))
+            count += 1
+        f.write("\n  ]\n}\n" if count else "]\n}\n")
+    return count
 
 
 def auto_export_audit_log(conn: sqlite3.Connection, logs_dir: str = "") -> str:
@@ -1542,12 +2157,9 @@ def auto_export_audit_log(conn: sqlite3.Connection, logs_dir: str = "") -> str:
         logs_dir = str(pathlib.Path(__file__).resolve().parent.parent / "logs")
     log_path = pathlib.Path(logs_dir)
     log_path.mkdir(parents=True, exist_ok=True)
-    entries = export_audit_logs(conn)
     ts = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
     out = log_path / f"audit-log-{ts}.json"
-    with open(out, "w") as f:
-        json.dump({"exported_at": ts, "entries": entries}, f, indent=2)
-        f.write("\n")
+    write_audit_log_export(out, {"exported_at": ts}, iter_audit_logs(conn))
     return str(out)
 
 
@@ -1679,16 +2291,15 @@ def is_orchestrator_state_empty(conn: sqlite3.Connection) -> bool:
 
 
 def collect_search_repos_from_db(conn: sqlite3.Connection) -> set[str]:
-    from urllib.parse import urlparse
+    """Return the ``owner/repo`` paths of every GitHub target and fork URL."""
     rows = conn.execute(
-        "SELECT DISTINCT target_repo, fork_url FROM runs"
+        "SELECT target_repo FROM runs UNION SELECT fork_url FROM runs"
     ).fetchall()
     repos: set[str] = set()
-    for row in rows:
-        for url_field in (row["target_repo"], row["fork_url"]):
-            parsed = urlparse(url_field)
-            if parsed.hostname == "github.com":
-                path = parsed.path.strip("/")
-                if path:
-                    repos.add(path)
+    for (url,) in rows:
+        m = _GITHUB_REPO_URL.match(url)
+        if m:
+            path = m.group(1).strip("/")
+            if path:
+                repos.add(path)
     return repos
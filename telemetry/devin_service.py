@@ -2,8 +2,10 @@ import json
 import logging
 import os
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from config import DEVIN_API_BASE, devin_headers
 
@@ -14,6 +16,12 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+_POLL_WORKERS = 8
+
+# Reused across polls so each session lookup skips the TCP/TLS handshake.
+devin_session = requests.Session()
+devin_session.mount("https://", HTTPAdapter(pool_connections=_POLL_WORKERS, pool_maxsize=_POLL_WORKERS))
+
 
 def _extract_structured_output(data: dict) -> dict:
     so = data.get("structured_output")
@@ -37,9 +45,28 @@ def _extract_pr_url(data: dict, so: dict) -> str:
     return pr_url
 
 
+def _fetch_session(sid: str) -> tuple[requests.Response | None, requests.RequestException | None]:
+    """GET the Devin session *sid*, returning the response or the request error."""
+    try:
+        resp = devin_session.get(
+            f"{DEVIN_API_BASE}/sessions/{clean_session_id(sid)}",
+            headers=devin_headers(),
+            timeout=15,
+        )
+    except requests.RequestException as exc:
+        return None, exc
+    return resp, None
+
+
 def poll_devin_sessions_db(
     conn: sqlite3.Connection, sessions: list[dict]
 ) -> tuple[list[dict], dict]:
+    """Refresh the status and PR link of every non-terminal session.
+
+    Sessions are fetched from the Devin API concurrently; the responses
+    are applied to *sessions* and written through *conn* on the calling
+    thread, in order.
+    """
     from database import update_session
 
     key = os.environ.get("DEVIN_API_KEY", "")
@@ -47,67 +74,72 @@ def poll_devin_sessions_db(
         logger.warning("DEVIN_API_KEY not set, skipping session polling")
         return sessions, {"polled": 0, "skipped_terminal": 0, "errors": []}
 
-    updated: list[dict] = []
     errors: list[dict] = []
     polled = 0
     skipped_terminal = 0
+    to_poll: list[dict] = []
     for s in sessions:
         sid = s.get("session_id", "")
         if not sid or sid == "dry-run":
-            updated.append(s)
             continue
-        status = s.get("status", "unknown")
-        if status in TERMINAL_STATUSES:
+        if s.get("status", "unknown") in TERMINAL_STATUSES:
             skipped_terminal += 1
-            updated.append(s)
             continue
-        try:
-            clean_sid = clean_session_id(sid)
-            resp = requests.get(
-                f"{DEVIN_API_BASE}/sessions/{clean_sid}",
-                headers=devin_headers(),
-                timeout=15,
-            )
-            polled += 1
-            if resp.status_code == 200:
-                data = resp.json()
-                status_str = str(
-                    data.get("status_enum")
-                    or data.get("status")
-                    or "unknown"
-                ).lower()
-                if isinstance(status_str, dict):
-                    status_str = status_str.get("status", "unknown")
-                s["status"] = status_str
-
-                so = _extract_structured_output(data)
-                pr_url = _extract_pr_url(data, so)
-                if pr_url:
-                    s["pr_url"] = pr_url
-                if so:
-                    s["structured_output"] = so
-
-                so_json = json.dumps(so) if so else ""
-                update_session(
-                    conn, sid,
-                    status=status_str,
-                    pr_url=pr_url,
-                    structured_output=so_json,
-                )
-            else:
-                logger.warning(
-                    "Devin API returned %d for session %s: %s",
-                    resp.status_code, sid, resp.text[:200],
-                )
-                errors.append({"session_id": sid, "error": f"HTTP {resp.status_code}"})
-        except requests.RequestException as exc:
+        to_poll.append(s)
+
+    if to_poll:
+        with ThreadPoolExecutor(max_workers=min(_POLL_WORKERS, len(to_poll))) as pool:
+            results = list(pool.map(_fetch_session, [s["session_id"] for s in to_poll]))
+    else:
+        results = []
+
+    for s, (resp, exc) in zip(to_poll, results):
+        sid = s["session_id"]
+        if exc is not None:
             logger.error("Failed to poll session %s: %s", sid, exc)
             errors.append({"session_id": sid, "error": str(exc)})
-        updated.append(s)
+            continue
+        polled += 1
+        if resp.status_code == 200:
+            try:
+                data = resp.json()
+            except ValueError as exc:
+                logger.error("Failed to poll session %s: %s", sid, exc)
+                errors.append({"session_id": sid, "error": str(exc)})
+                continue
+            status_str = str(
+                data.get("status_enum")
+                or data.get("status")
+                or "unknown"
+            ).lower()
+            if isinstance(status_str, dict):
+                status_str = status_str.get("status", "unknown")
+            s["status"] = status_str
+
+            so = _extract_structured_output(data)
+            pr_url = _extract_pr_url(data, so)
+            if pr_url:
+                s["pr_url"] = pr_url
+            if so:
+                s["structured_output"] = so
+
+            so_json = json.dumps(so) if so else ""
+            update_session(
+                conn, sid,
+                status=status_str,
+                pr_url=pr_url,
+                structured_output=so_json,
+            )
+        else:
+            logger.warning(
+                "Devin API returned %d for session %s: %s",
+                resp.status_code, sid, resp.text[:200],
+            )
+            errors.append({"session_id": sid, "error": f"HTTP {resp.status_code}"})
 
     logger.info(
         "Polling complete: %d polled, %d skipped (terminal), %d errors",
         polled, skipped_terminal, len(errors),
     )
 
-    return updated, {"polled": polled, "skipped_terminal": skipped_terminal, "errors": errors}
+    return list(sessions), {"polled": polled, "skipped_terminal": skipped_terminal, "errors": errors}
@@ -1,5 +1,9 @@
 """Shared Flask extensions initialised with the ``init_app`` pattern."""
 
+from typing import Any
+
+import orjson
+from flask.json.provider import DefaultJSONProvider
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 
@@ -8,3 +12,45 @@ limiter = Limiter(
     default_limits=["120/minute"],
     storage_uri="memory://",
 )
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider that encodes with ``orjson`` instead of the stdlib encoder.
+
+    Output matches ``DefaultJSONProvider`` apart from whitespace and
+    non-ASCII characters being emitted as UTF-8 rather than escaped.
+    Datetimes still go through ``default`` so they keep Flask's HTTP-date
+    format.  Request bodies are parsed with ``orjson`` too.  Values it
+    rejects, such as integers wider than 64 bits or ``NaN``, fall back to
+    the stdlib encoder and decoder.
+    """
+
+    def encode(self, obj: Any, indent: bool = False) -> bytes:
+        """Return *obj* as UTF-8 JSON bytes, skipping the ``str`` round trip of ``dumps``."""
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, default=self.default, option=option)
+        except orjson.JSONEncodeError:
+            return super().dumps(obj, indent=2 if indent else None).encode()
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return self.encode(obj).decode()
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        if not kwargs:
+            try:
+                return orjson.loads(s)
+            except orjson.JSONDecodeError:
+                pass
+        return super().loads(s, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(self.encode(obj, indent) + b"\n", mimetype=self.mimetype)
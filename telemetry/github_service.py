@@ -1,15 +1,35 @@
 import os
 import re
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from config import gh_headers
 
-try:
-    from devin_api import clean_session_id
-except ImportError:
-    from scripts.devin_api import clean_session_id
+_GH_POOL_SIZE = 32
+_PR_FETCH_WORKERS = 8
+
+# Shared by every GitHub call in the app so connections (and their TLS
+# sessions) are reused.  Idempotent requests are retried with backoff on
+# rate limiting and gateway errors; the final response is returned as-is.
+# Retry-After is deliberately ignored: these calls run on request threads,
+# and GitHub can ask for minutes.  The backoff caps the wait at a few
+# seconds, after which a 429 goes back to the caller.
+gh_session = requests.Session()
+gh_session.mount("https://", HTTPAdapter(
+    pool_connections=_GH_POOL_SIZE,
+    pool_maxsize=_GH_POOL_SIZE,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=(429, 502, 503, 504),
+        raise_on_status=False,
+        respect_retry_after_header=False,
+    ),
+))
 
 
 def match_pr_to_session(pr_body: str, session_ids: set[str]) -> str:
@@ -19,6 +39,29 @@ def match_pr_to_session(pr_body: str, session_ids: set[str]) -> str:
     return ""
 
 
+def _fetch_repo_pulls(repo_full: str) -> list[dict]:
+    """Return every PR of *repo_full*, stopping at the first failed page."""
+    pulls: list[dict] = []
+    gh_page = 1
+    while True:
+        url = (f"https://api.github.com/repos/{repo_full}/pulls"
+               f"?state=all&per_page=100&page={gh_page}")
+        try:
+            resp = gh_session.get(url, headers=gh_headers(), timeout=30)
+            if resp.status_code != 200:
+                break
+            batch = resp.json()
+        except requests.RequestException:
+            break
+        if not batch:
+            break
+        pulls.extend(batch)
+        if len(batch) < 100:
+            break
+        gh_page += 1
+    return pulls
+
+
 def fetch_prs_from_github_to_db(conn: sqlite3.Connection) -> int:
     from database import upsert_pr, collect_session_ids_from_db, collect_search_repos_from_db
 
@@ -26,89 +69,50 @@ def fetch_prs_from_github_to_db(conn: sqlite3.Connection) -> int:
     if not token:
         return 0
 
-    search_repos = collect_search_repos_from_db(conn)
+    search_repos = sorted(collect_search_repos_from_db(conn))
     session_ids = collect_session_ids_from_db(conn)
+    if not search_repos:
+        return 0
 
     count = 0
     seen_urls: set[str] = set()
-    for repo_full in search_repos:
-        gh_page = 1
-        while True:
-            url = (f"https://api.github.com/repos/{repo_full}/pulls"
-                   f"?state=all&per_page=100&page={gh_page}")
-            try:
-                resp = requests.get(url, headers=gh_headers(), timeout=30)
-                if resp.status_code != 200:
-                    break
-                batch = resp.json()
-                if not batch:
-                    break
-                for pr in batch:
-                    title = pr.get("title", "")
-                    body = pr.get("body", "") or ""
-                    html_url = pr.get("html_url", "")
-
-                    has_issue_ref_in_title = bool(re.search(r"CQLF-(?:[A-Z]+-)?R\d+-\d+", title, re.IGNORECASE))
-                    matched_session = match_pr_to_session(title + body, session_ids)
-
-                    if not has_issue_ref_in_title and not matched_session:
-                        continue
-                    if html_url in seen_urls:
-                        continue
-                    seen_urls.add(html_url)
-
-                    issue_ids = re.findall(r"CQLF-(?:[A-Z]+-)?R\d+-\d+", title, re.IGNORECASE)
-                    pr_data = {
-                        "pr_number": pr.get("number"),
-                        "title": title,
-                        "html_url": html_url,
-                        "state": pr.get("state", ""),
-                        "merged": pr.get("merged_at") is not None,
-                        "created_at": pr.get("created_at", ""),
-                        "repo": repo_full,
-                        "issue_ids": list(dict.fromkeys(issue_ids)),
-                        "user": pr.get("user", {}).get("login", ""),
-                        "session_id": matched_session,
-                    }
-                    upsert_pr(conn, pr_data)
-                    count += 1
-                if len(batch) < 100:
-                    break
-                gh_page += 1
-            except requests.RequestException:
-                break
+    # Repos are fetched concurrently (pages of one repo stay sequential);
+    # rows are written from this thread, which owns the connection.
+    with ThreadPoolExecutor(max_workers=min(_PR_FETCH_WORKERS, len(search_repos))) as pool:
+        for repo_full, pulls in zip(search_repos, pool.map(_fetch_repo_pulls, search_repos)):
+            for pr in pulls:
+                title = pr.get("title", "")
+                body = pr.get("body", "") or ""
+                html_url = pr.get("html_url", "")
+
+                has_issue_ref_in_title = bool(re.search(r"CQLF-(?:[A-Z]+-)?R\d+-\d+", title, re.IGNORECASE))
+                matched_session = match_pr_to_session(title + body, session_ids)
+
+                if not has_issue_ref_in_title and not matched_session:
+                    continue
+                if html_url in seen_urls:
+                    continue
+                seen_urls.add(html_url)
+
+                issue_ids = re.findall(r"CQLF-(?:[A-Z]+-)?R\d+-\d+", title, re.IGNORECASE)
+                pr_data = {
+                    "pr_number": pr.get("number"),
+                    "title": title,
+                    "html_url": html_url,
+                    "state": pr.get("state", ""),
+                    "merged": pr.get("merged_at") is not None,
+                    "created_at": pr.get("created_at", ""),
+                    "repo": repo_full,
+                    "issue_ids": list(dict.fromkeys(issue_ids)),
+                    "user": pr.get("user", {}).get("login", ""),
+                    "session_id": matched_session,
+                }
+                upsert_pr(conn, pr_data)
+                count += 1
     return count
 
 
 def link_prs_to_sessions_db(conn: sqlite3.Connection) -> None:
-    from database import query_all_prs, update_session
-
-    all_prs = query_all_prs(conn)
-    pr_by_session: dict[str, str] = {}
-    pr_by_issue: dict[str, str] = {}
-    for p in all_prs:
-        sid = p.get("session_id", "")
-        if sid:
-            pr_by_session[sid] = p.get("html_url", "")
-        for iid in p.get("issue_ids", []):
-            if iid:
-                pr_by_issue[iid] = p.get("html_url", "")
-
-    sessions = conn.execute(
-        "SELECT s.id, s.session_id, s.pr_url FROM sessions s WHERE s.pr_url = ''"
-    ).fetchall()
-    for s in sessions:
-        sid = s["session_id"]
-        clean = clean_session_id(sid)
-        pr_url = pr_by_session.get(clean, "")
-        if not pr_url:
-            iid_rows = conn.execute(
-                "SELECT issue_id FROM session_issue_ids WHERE session_id = ?",
-                (s["id"],),
-            ).fetchall()
-            for iid_row in iid_rows:
-                if iid_row["issue_id"] in pr_by_issue:
-                    pr_url = pr_by_issue[iid_row["issue_id"]]
-                    break
-        if pr_url:
-            update_session(conn, sid, pr_url=pr_url)
+    from database import link_session_pr_urls
+
+    link_session_pr_urls(conn)
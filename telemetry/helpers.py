@@ -4,15 +4,26 @@ Provides authentication, pagination, and audit logging utilities used
 across all route blueprints.
 """
 
+import atexit
 import functools
+import hashlib
 import hmac
+import json
 import logging
 import os
-from typing import Any
+import pathlib
+import queue
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable
 
-from flask import jsonify, request as flask_request
+from flask import abort, current_app, g, jsonify, make_response, request as flask_request
+from werkzeug.http import unquote_etag
 
-from database import get_connection, insert_audit_log
+import database
+from database import get_pooled_connection, insert_audit_log, insert_audit_logs, parse_cursor
 from oauth import get_current_user
 
 
@@ -63,31 +74,128 @@ def _get_audit_user() -> str:
     return "anonymous"
 
 
+_AUDIT_QUEUE: "queue.Queue[tuple]" = queue.Queue()
+_AUDIT_WRITER: threading.Thread | None = None
+_AUDIT_WRITER_LOCK = threading.Lock()
+_AUDIT_FLUSH_NOW = threading.Event()
+_AUDIT_FLUSH_INTERVAL = 0.1
+_AUDIT_MAX_BATCH = 256
+
+
+def _encode_details(details: "dict | str") -> str:
+    return details if isinstance(details, str) else json.dumps(details)
+
+
+def _audit_writer() -> None:
+    """Drain the audit queue, writing each batch of entries in one transaction.
+
+    A batch closes after ``_AUDIT_FLUSH_INTERVAL`` seconds or
+    ``_AUDIT_MAX_BATCH`` entries, whichever comes first, or as soon as
+    ``_flush_audit()`` asks for the pending entries.
+    """
+    while True:
+        batch = [_AUDIT_QUEUE.get()]
+        deadline = time.monotonic() + _AUDIT_FLUSH_INTERVAL
+        while len(batch) < _AUDIT_MAX_BATCH:
+            if _AUDIT_FLUSH_NOW.is_set():
+                try:
+                    batch.append(_AUDIT_QUEUE.get_nowait())
+                except queue.Empty:
+                    break
+                continue
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(_AUDIT_QUEUE.get(timeout=min(remaining, 0.01)))
+            except queue.Empty:
+                continue
+        by_path: dict[str, list[tuple[str, str, str, str, str]]] = {}
+        for db_path, ts, user, action, resource, details in batch:
+            try:
+                row = (ts, user, action, resource, _encode_details(details))
+            except (TypeError, ValueError):
+                logging.getLogger(__name__).warning("audit details not serializable: action=%s", action, exc_info=True)
+                continue
+            by_path.setdefault(db_path, []).append(row)
+        for db_path, rows in by_path.items():
+            try:
+                insert_audit_logs(get_pooled_connection(pathlib.Path(db_path)), rows)
+            except Exception:
+                logging.getLogger(__name__).warning("audit log write failed: %d entries", len(rows), exc_info=True)
+        for _ in batch:
+            _AUDIT_QUEUE.task_done()
+
+
+def _ensure_audit_writer() -> None:
+    global _AUDIT_WRITER
+    if _AUDIT_WRITER is not None and _AUDIT_WRITER.is_alive():
+        return
+    with _AUDIT_WRITER_LOCK:
+        if _AUDIT_WRITER is None or not _AUDIT_WRITER.is_alive():
+            _AUDIT_WRITER = threading.Thread(target=_audit_writer, name="audit-writer", daemon=True)
+            _AUDIT_WRITER.start()
+
+
+def _flush_audit() -> None:
+    """Block until every queued audit entry has been written.
+
+    Called before reading the audit log so callers always observe their
+    own writes, and at interpreter exit so queued entries are not lost.
+    """
+    if _AUDIT_WRITER is not None and _AUDIT_WRITER.is_alive():
+        _AUDIT_FLUSH_NOW.set()
+        try:
+            _AUDIT_QUEUE.join()
+        finally:
+            _AUDIT_FLUSH_NOW.clear()
+
+
+atexit.register(_flush_audit)
+
+
 def _audit(
     action: str,
     resource: str = "",
-    details: str = "",
+    details: "dict | str" = "",
     conn: "sqlite3.Connection | None" = None,
 ) -> None:
+    """Record an audit entry without blocking the request on the write.
+
+    *details* may be a dict; it is JSON-encoded by the background writer
+    rather than in the request path.  When *conn* is given the entry is
+    written synchronously on that connection instead.
+    """
     try:
-        own_conn = conn is None
-        if own_conn:
-            conn = get_connection()
-        try:
-            insert_audit_log(conn, _get_audit_user(), action, resource, details)
-        finally:
-            if own_conn:
-                conn.close()
+        user = _get_audit_user()
+        if conn is not None:
+            insert_audit_log(conn, user, action, resource, _encode_details(details))
+            return
+        ts = datetime.now(timezone.utc).isoformat()
+        _ensure_audit_writer()
+        _AUDIT_QUEUE.put((str(database.DB_PATH), ts, user, action, resource, details))
     except Exception:
         logging.getLogger(__name__).warning("audit log write failed: action=%s", action, exc_info=True)
 
 
 def _paginate(items: list[dict[str, Any]], page: int, per_page: int) -> dict[str, Any]:
+    """Slice one page out of *items*; a first page that covers them all is *items* itself."""
     total = len(items)
     start = (page - 1) * per_page
     end = start + per_page
     return {
-        "items": items[start:end],
+        "items": items if start == 0 and end >= total else items[start:end],
+        "page": page,
+        "per_page": per_page,
+        "total": total,
+        "pages": max(1, (total + per_page - 1) // per_page),
+    }
+
+
+def _page_of(items: list[dict[str, Any]], total: int, page: int, per_page: int) -> dict[str, Any]:
+    """Wrap a page already sliced by the database in the ``_paginate`` envelope."""
+    return {
+        "items": items,
         "page": page,
         "per_page": per_page,
         "total": total,
@@ -95,7 +203,162 @@ def _paginate(items: list[dict[str, Any]], page: int, per_page: int) -> dict[str
     }
 
 
+def _file_etag(path: pathlib.Path) -> str | None:
+    """Return a weak ETag built from *path*'s mtime and size, or ``None`` if missing."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return f'W/"{st.st_mtime_ns:x}-{st.st_size:x}"'
+
+
+# Appended inside the quotes of an ETag when ``app._compress_response``
+# gzips the body, so each encoding has its own validator.
+GZIP_ETAG_SUFFIX = "-gzip"
+
+
+def _gzip_etag(etag: str) -> str:
+    """Return the ETag header value for the gzip encoding of a body tagged *etag*."""
+    return f'{etag[:-1]}{GZIP_ETAG_SUFFIX}"'
+
+
+def _matching_etag(etag: str) -> str | None:
+    """Return the form of *etag*, identity or gzip, that ``If-None-Match`` names, if any."""
+    if_none_match = flask_request.if_none_match
+    for tag in (etag, _gzip_etag(etag)):
+        if if_none_match.contains_weak(unquote_etag(tag)[0]):
+            return tag
+    return None
+
+
+def _make_conditional(resp):
+    """``resp.make_conditional()`` that also honours the gzip form of *resp*'s ETag.
+
+    A 304 for the gzip form carries that form, as the 200 it stands in for did.
+    """
+    resp.make_conditional(flask_request)
+    if resp.status_code == 200:
+        matched = _matching_etag(resp.headers["ETag"])
+        if matched is not None:
+            resp.status_code = 304
+            resp.headers["ETag"] = matched
+    return resp
+
+
+_JSON_BODY_CACHE: dict[str, tuple[str, bytes]] = {}
+
+
+def _json_bytes(data: Any) -> bytes:
+    return current_app.json.encode(data) + b"\n"
+
+
+def _clear_json_cache() -> None:
+    _JSON_BODY_CACHE.clear()
+    _DB_JSON_CACHE.clear()
+
+
+_DB_JSON_CACHE: dict[tuple, tuple[tuple, float, bytes, str]] = {}
+_DB_JSON_TTL = 30.0
+_DB_JSON_MAX_ENTRIES = 1024
+_DB_JSON_EVICT_LOCK = threading.Lock()
+_DB_JSON_TTL_JITTER = 0.25
+
+
+def _db_cached_json(
+    key: Any,
+    build: "Callable[[sqlite3.Connection], Any]",
+    ttl: float = _DB_JSON_TTL,
+    extra: tuple = (),
+):
+    """Serve ``build(conn)`` as JSON, reusing the encoded body while the database is unchanged.
+
+    Runs on the thread's pooled connection.  ``PRAGMA data_version`` moves
+    when another connection commits and ``total_changes`` when this one
+    does, so any write invalidates the entry; *ttl* bounds the age of
+    values that also depend on the clock or on files, and *extra* can
+    carry e.g. file ETags those values depend on.  Each entry's *ttl* is
+    scaled by a random factor within ``_DB_JSON_TTL_JITTER`` so entries
+    built together do not all expire on the same request.  Past
+    ``_DB_JSON_MAX_ENTRIES`` keys the oldest entry is dropped, so
+    per-repo and per-page keys cannot grow the cache without bound.
+
+    The body's hash is kept with it as the ETag, so a client polling with
+    a matching ``If-None-Match`` gets a 304 without the body being hashed
+    or sent again.
+    """
+    conn = get_pooled_connection()
+    state = (conn.execute("PRAGMA data_version").fetchone()[0], conn.total_changes, extra)
+    cache_key = (key, id(conn))
+    cached = _DB_JSON_CACHE.get(cache_key)
+    now = time.monotonic()
+    if cached is not None and cached[0] == state and cached[1] > now:
+        body, etag = cached[2], cached[3]
+    else:
+        body = _json_bytes(build(conn))
+        etag = hashlib.sha1(body).hexdigest()
+        if cached is None and len(_DB_JSON_CACHE) >= _DB_JSON_MAX_ENTRIES:
+            with _DB_JSON_EVICT_LOCK:
+                try:
+                    _DB_JSON_CACHE.pop(next(iter(_DB_JSON_CACHE), None), None)
+                except RuntimeError:  # resized by a concurrent insert; evict next time
+                    pass
+        jitter = random.uniform(1 - _DB_JSON_TTL_JITTER, 1 + _DB_JSON_TTL_JITTER)
+        _DB_JSON_CACHE[cache_key] = (state, now + ttl * jitter, body, etag)
+    resp = current_app.response_class(body, mimetype="application/json")
+    resp.set_etag(etag)
+    resp.headers["Cache-Control"] = "no-cache"
+    return _make_conditional(resp)
+
+
+def _json_with_etag(etag: str | None, build: Callable[[], Any], cache_key: str | None = None):
+    """Serve ``build()`` as JSON, short-circuiting to 304 on a matching ETag.
+
+    *build* is only invoked when the client's ``If-None-Match`` does not
+    match, so unchanged resources skip loading and serialization entirely.
+    When *cache_key* is given the encoded body is kept alongside its ETag
+    and reused verbatim until the ETag changes.
+    """
+    matched = _matching_etag(etag) if etag is not None else None
+    if matched is not None:
+        resp = current_app.make_response(("", 304))
+    else:
+        body = None
+        if etag is not None and cache_key is not None:
+            cached = _JSON_BODY_CACHE.get(cache_key)
+            if cached is not None and cached[0] == etag:
+                body = cached[1]
+        if body is None:
+            body = _json_bytes(build())
+            if etag is not None and cache_key is not None:
+                _JSON_BODY_CACHE[cache_key] = (etag, body)
+        resp = current_app.response_class(body, mimetype="application/json")
+    if etag is not None:
+        resp.headers["ETag"] = matched or etag
+        resp.headers["Cache-Control"] = "no-cache"
+    return resp
+
+
 def _get_pagination() -> tuple[int, int]:
-    page = max(1, int(flask_request.args.get("page", 1)))
-    per_page = min(200, max(1, int(flask_request.args.get("per_page", 50))))
-    return page, per_page
+    """Parse ``page``/``per_page`` once per request, answering 400 when either is not an integer."""
+    cached = g.get("_pagination")
+    if cached is not None:
+        return cached
+    try:
+        page = max(1, int(flask_request.args.get("page", 1)))
+        per_page = min(200, max(1, int(flask_request.args.get("per_page", 50))))
+    except ValueError:
+        abort(make_response(jsonify({"error": "page and per_page must be integers"}), 400))
+    g._pagination = (page, per_page)
+    return g._pagination
+
+
+def _get_cursor(key_type: type = str) -> str | None:
+    """Return the ``cursor`` argument, answering 400 when it is not a cursor *key_type* can parse."""
+    cursor = flask_request.args.get("cursor")
+    if cursor is None:
+        return None
+    try:
+        parse_cursor(cursor, key_type)
+    except ValueError:
+        abort(make_response(jsonify({"error": "invalid cursor"}), 400))
+    return cursor
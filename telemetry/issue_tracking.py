@@ -1,3 +1,4 @@
+import functools
 from datetime import datetime, timezone
 
 DEFAULT_SLA_HOURS: dict[str, int] = {
@@ -52,6 +53,9 @@ def compute_sla_status(
     }
 
 
+# Every issue of a run carries the run's timestamp, so the same few strings
+# are parsed over and over; datetimes are immutable and safe to share.
+@functools.lru_cache(maxsize=4096)
 def _parse_ts(ts: str) -> datetime | None:
     if not ts:
         return None
@@ -0,0 +1,44 @@
+"""Read and write the JSON files kept under ``runs/``.
+
+Uses ``orjson`` when it is installed, as it is in the dashboard image.
+The orchestrator scripts import the modules that use these helpers
+without it, so the stdlib ``json`` module remains the fallback.  Inputs
+``orjson`` rejects (``NaN``, integers wider than 64 bits) also go through
+the stdlib, so both paths accept the same files.
+"""
+
+import json
+import pathlib
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+
+def load_json_file(path: pathlib.Path) -> Any:
+    """Parse the JSON document at *path*.
+
+    Raises ``OSError`` or ``json.JSONDecodeError`` like ``json.load``.
+    """
+    if orjson is not None:
+        raw = path.read_bytes()
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            return json.loads(raw)
+    with open(path) as f:
+        return json.load(f)
+
+
+def dump_json_file(path: pathlib.Path, data: Any) -> None:
+    """Write *data* to *path* as JSON indented by two spaces."""
+    if orjson is not None:
+        try:
+            path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            return
+        except orjson.JSONEncodeError:
+            pass
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
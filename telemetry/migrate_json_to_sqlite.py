@@ -9,37 +9,85 @@ import logging
 import pathlib
 import sqlite3
 import sys
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
 
-from database import get_connection, init_db, is_db_empty, insert_run, refresh_fingerprint_issues, DB_PATH
+from database import bulk_ingest, get_connection, init_db, is_db_empty, insert_run, refresh_fingerprint_issues, DB_PATH
+from json_files import load_json_file
 
 logger = logging.getLogger(__name__)
 
+_READ_WORKERS = 32
+# Files read ahead of the inserting thread; bounds how many parsed runs
+# are held in memory at once.
+_READ_AHEAD = _READ_WORKERS * 2
+
 
 def migrate_json_files(
     runs_dir: pathlib.Path,
     conn: sqlite3.Connection,
 ) -> dict:
+    """Insert every run file in *runs_dir* into the database.
+
+    Files are read and parsed on a thread pool so their I/O overlaps;
+    rows are inserted in file-name order on the calling thread, with the
+    issue search index rebuilt once at the end.
+    """
     stats = {"migrated": 0, "skipped": 0, "errors": 0}
     if not runs_dir.is_dir():
         return stats
-    for fp in sorted(runs_dir.glob("*.json")):
-        if fp.name.startswith("verification_"):
-            continue
-        try:
-            with open(fp) as f:
-                data = json.load(f)
-            result = insert_run(conn, data, fp.name)
-            if result is None:
+    files = [fp for fp in sorted(runs_dir.glob("*.json")) if not fp.name.startswith("verification_")]
+    if not files:
+        return stats
+    with ThreadPoolExecutor(max_workers=min(_READ_WORKERS, len(files))) as pool, bulk_ingest(conn):
+        for fp, (data, exc) in _read_ahead(pool, files):
+            if exc is None:
+                try:
+                    result = insert_run(conn, data, fp.name)
+                except sqlite3.Error as insert_exc:
+                    exc = insert_exc
+            if exc is not None:
+                logger.error("ERROR migrating %s: %s", fp.name, exc)
+                stats["errors"] += 1
+            elif result is None:
                 stats["skipped"] += 1
             else:
                 stats["migrated"] += 1
-        except (json.JSONDecodeError, OSError, sqlite3.Error) as exc:
-            logger.error("ERROR migrating %s: %s", fp.name, exc)
-            stats["errors"] += 1
     conn.commit()
     return stats
 
 
+def _read_ahead(
+    pool: ThreadPoolExecutor, files: list[pathlib.Path],
+) -> Iterator[tuple[pathlib.Path, tuple[dict | None, Exception | None]]]:
+    """Yield each file with its ``_read_run_file`` result, in order.
+
+    At most ``_READ_AHEAD`` files beyond the one being consumed are read,
+    so a slow consumer keeps the readers waiting instead of piling up
+    parsed runs.
+    """
+    remaining = iter(files)
+    pending: deque[tuple[pathlib.Path, Future]] = deque()
+    for fp in remaining:
+        pending.append((fp, pool.submit(_read_run_file, fp)))
+        if len(pending) == _READ_AHEAD:
+            break
+    while pending:
+        fp, future = pending.popleft()
+        nxt = next(remaining, None)
+        if nxt is not None:
+            pending.append((nxt, pool.submit(_read_run_file, nxt)))
+        yield fp, future.result()
+
+
+def _read_run_file(fp: pathlib.Path) -> tuple[dict | None, Exception | None]:
+    try:
+        return load_json_file(fp), None
+    except (json.JSONDecodeError, OSError) as exc:
+        return None, exc
+
+
 def ensure_db_populated(runs_dir: pathlib.Path, sample_dir: pathlib.Path | None = None) -> None:
     init_db()
     conn = get_connection()
@@ -48,9 +96,11 @@ def ensure_db_populated(runs_dir: pathlib.Path, sample_dir: pathlib.Path | None
         if stats["migrated"] == 0 and sample_dir and sample_dir.is_dir():
             stats = migrate_json_files(sample_dir, conn)
         logger.info("DB migration: %s", stats)
-    fp_count = conn.execute("SELECT COUNT(*) FROM fingerprint_issues").fetchone()[0]
-    issue_count = conn.execute("SELECT COUNT(*) FROM issues").fetchone()[0]
-    if fp_count == 0 and issue_count > 0:
+    # Existence probes rather than COUNT(*) so a warm start stays O(1)
+    # however many runs and issues the database holds.
+    has_fp_issues = conn.execute("SELECT 1 FROM fingerprint_issues LIMIT 1").fetchone() is not None
+    has_issues = conn.execute("SELECT 1 FROM issues LIMIT 1").fetchone() is not None
+    if not has_fp_issues and has_issues:
         n = refresh_fingerprint_issues(conn)
         conn.commit()
         logger.info("Populated fingerprint_issues: %d rows", n)
@@ -6,6 +6,7 @@ severity/category breakdowns, and a full issues table.
 
 import io
 from datetime import datetime, timezone
+from typing import BinaryIO
 
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
@@ -125,8 +126,15 @@ def generate_pdf(
     stats: dict,
     issues: list[dict],
     repo_filter: str = "",
-) -> bytes:
-    buf = io.BytesIO()
+    sink: BinaryIO | None = None,
+) -> bytes | None:
+    """Render the report and return its bytes.
+
+    When *sink* is given the PDF is written to it instead and ``None`` is
+    returned, so callers can spool large reports without holding a second
+    copy in memory.
+    """
+    buf = sink if sink is not None else io.BytesIO()
     doc = SimpleDocTemplate(
         buf,
         pagesize=letter,
@@ -186,4 +194,4 @@ def generate_pdf(
     elements.extend(_make_issues_table(issues))
 
     doc.build(elements)
-    return buf.getvalue()
+    return None if sink is not None else buf.getvalue()
@@ -1,60 +1,71 @@
 """Core API blueprint -- read endpoints, polling, dispatch, and audit log."""
 
-import io
+import hashlib
 import json
 import os
 import pathlib
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 
 import requests
-from flask import Blueprint, jsonify, render_template, request as flask_request, send_file
+from flask import Blueprint, current_app, jsonify, render_template, request as flask_request, send_file
 
 from config import RUNS_DIR, gh_headers
 
-try:
-    from devin_api import clean_session_id
-except ImportError:
-    from scripts.devin_api import clean_session_id
-
 from database import (
     db_connection,
+    pooled_db_connection,
     get_connection,
-    insert_run,
+    get_pooled_connection,
+    insert_runs,
     query_runs,
-    query_all_runs,
     query_sessions,
     query_all_sessions,
     query_prs,
     query_all_prs,
+    query_repo_prs,
+    query_repo_fork_url,
+    query_open_repo_prs,
+    query_repo_totals,
+    count_prs_by_state,
+    aggregate_severity,
+    aggregate_category,
     query_stats,
     query_repos,
     query_issues,
+    count_issues,
     query_issue_detail,
     update_issue_status,
     query_dispatch_impact,
     search_issues,
     refresh_fingerprint_issues,
     backfill_pr_urls,
+    query_pr_urls_by_issue,
+    query_file_backfill_candidates,
+    mark_runs_file_backfilled,
     query_audit_logs,
-    export_audit_logs,
+    iter_audit_logs,
+    write_audit_log_export,
 )
-from github_service import fetch_prs_from_github_to_db, link_prs_to_sessions_db
+from github_service import fetch_prs_from_github_to_db, gh_session, link_prs_to_sessions_db
+from json_files import dump_json_file, load_json_file
 from devin_service import poll_devin_sessions_db
 from aggregation import compute_sla_summary
-from verification import (
-    load_verification_records,
-    build_session_verification_map,
-    build_fingerprint_fix_map,
-    aggregate_verification_stats,
-)
-from oauth import is_oauth_configured, get_current_user, filter_by_user_access
+from verification import load_verification_bundle
+from oauth import is_oauth_configured, get_current_user
 from pdf_report import generate_pdf
 from helpers import (
     require_api_key,
     _get_telemetry_api_key,
     _is_authenticated,
     _audit,
+    _flush_audit,
     _paginate,
+    _page_of,
     _get_pagination,
+    _get_cursor,
+    _db_cached_json,
 )
 from extensions import limiter
 
@@ -63,9 +74,20 @@ api_bp = Blueprint("api", __name__)
 AUDIT_LOG_DIR = pathlib.Path(__file__).resolve().parent.parent.parent / "logs"
 
 
+# The dashboard template takes no variables, so its rendered HTML is kept
+# unless templates are being reloaded from disk (debug mode).
+_DASHBOARD_HTML: str | None = None
+
+
 @api_bp.route("/")
 def index():
-    return render_template("dashboard.html")
+    global _DASHBOARD_HTML
+    html = _DASHBOARD_HTML
+    if html is None:
+        html = render_template("dashboard.html")
+        if not current_app.jinja_env.auto_reload:
+            _DASHBOARD_HTML = html
+    return html
 
 
 @api_bp.route("/repo/<path:repo_url>")
@@ -74,127 +96,86 @@ def repo_page(repo_url):
     return render_template("repo.html", repo_url=full_url, repo_short=repo_url)
 
 
-def _link_prs_to_session_items(sessions: list[dict], prs: list[dict]) -> None:
-    pr_by_session: dict[str, str] = {}
-    pr_by_issue: dict[str, str] = {}
-    for p in prs:
-        sid = p.get("session_id", "")
-        if sid:
-            pr_by_session[sid] = p.get("html_url", "")
-        for iid in p.get("issue_ids", []):
-            if iid:
-                pr_by_issue[iid] = p.get("html_url", "")
-    for s in sessions:
-        if s.get("pr_url"):
-            continue
-        sid = s.get("session_id", "")
-        clean = clean_session_id(sid)
-        if clean in pr_by_session:
-            s["pr_url"] = pr_by_session[clean]
-            continue
-        for iid in s.get("issue_ids", []):
-            if iid in pr_by_issue:
-                s["pr_url"] = pr_by_issue[iid]
-                break
-
-
 @api_bp.route("/api/repo/<path:repo_url>")
 def api_repo_detail(repo_url):
     full_url = "https://github.com/" + repo_url
-    with db_connection() as conn:
-        runs = query_all_runs(conn, target_repo=full_url)
-        sessions = query_all_sessions(conn, target_repo=full_url)
-        all_prs = query_all_prs(conn)
-
-        repo_info = None
-        all_repos = query_repos(conn)
-        for r in all_repos:
-            if r["repo"] == full_url:
-                repo_info = r
-                break
-
-        fork_url = repo_info["fork_url"] if repo_info else ""
-        repo_prs = [p for p in all_prs if fork_url and p.get("repo", "") and p["repo"] in fork_url]
-
-        pr_merged = sum(1 for p in repo_prs if p.get("merged", False))
-        pr_open = sum(1 for p in repo_prs if p.get("state") == "open")
-        pr_closed = sum(1 for p in repo_prs if p.get("state") == "closed" and not p.get("merged", False))
-
-        severity_agg: dict[str, int] = {}
-        category_agg: dict[str, int] = {}
-        for run in runs:
-            for tier, count in run.get("severity_breakdown", {}).items():
-                severity_agg[tier] = severity_agg.get(tier, 0) + count
-            for cat, count in run.get("category_breakdown", {}).items():
-                category_agg[cat] = category_agg.get(cat, 0) + count
-
-        sessions_created = len([s for s in sessions if s.get("session_id")])
-        sessions_finished = len([s for s in sessions if s.get("status") in ("finished", "stopped")])
-
-        stats = {
-            "total_runs": len(runs),
-            "total_issues": sum(r.get("issues_found", 0) for r in runs),
-            "sessions_created": sessions_created,
-            "sessions_finished": sessions_finished,
-            "prs_total": len(repo_prs),
-            "prs_merged": pr_merged,
-            "prs_open": pr_open,
-            "prs_closed": pr_closed,
-            "fix_rate": round(pr_merged / max(len(repo_prs), 1) * 100, 1),
-            "severity_breakdown": severity_agg,
-            "category_breakdown": category_agg,
-        }
+    page, per_page = _get_pagination()
+    return _db_cached_json(
+        ("repo_detail", full_url, page, per_page),
+        lambda conn: _compute_repo_detail(conn, full_url, page, per_page),
+    )
+
+
+def _compute_repo_detail(conn, full_url: str, page: int, per_page: int) -> dict:
+    offset = (page - 1) * per_page
+    totals = query_repo_totals(conn, full_url)
+    fork_url = query_repo_fork_url(conn, full_url)
+    pr_counts = count_prs_by_state(conn, fork_url)
+    pr_merged = pr_counts["merged"]
+
+    stats = {
+        "total_runs": totals["runs"],
+        "total_issues": totals["issues_found"],
+        "sessions_created": totals["sessions_created"],
+        "sessions_finished": totals["sessions_finished"],
+        "prs_total": pr_counts["total"],
+        "prs_merged": pr_merged,
+        "prs_open": pr_counts["open"],
+        "prs_closed": pr_counts["closed"],
+        "fix_rate": round(pr_merged / max(pr_counts["total"], 1) * 100, 1),
+        "severity_breakdown": aggregate_severity(conn, full_url),
+        "category_breakdown": aggregate_category(conn, full_url),
+    }
 
-        page, per_page = _get_pagination()
-        sorted_runs = sorted(runs, key=lambda r: r.get("run_number", 0), reverse=True)
-        issues = query_issues(conn, target_repo=full_url)
+    repo_prs = query_repo_prs(conn, fork_url, limit=per_page, offset=offset)
+    issues = query_issues(conn, target_repo=full_url, limit=per_page, offset=offset)
 
-        return jsonify({
-            "stats": stats,
-            "runs": _paginate(sorted_runs, page, per_page),
-            "sessions": _paginate(sessions, page, per_page),
-            "prs": _paginate(repo_prs, page, per_page),
-            "issues": _paginate(issues, page, per_page),
-        })
+    return {
+        "stats": stats,
+        "runs": query_runs(conn, page=page, per_page=per_page, target_repo=full_url),
+        "sessions": query_sessions(conn, page=page, per_page=per_page, target_repo=full_url),
+        "prs": _page_of(repo_prs, pr_counts["total"], page, per_page),
+        "issues": _page_of(issues, count_issues(conn, target_repo=full_url), page, per_page),
+    }
 
 
 @api_bp.route("/api/runs")
 def api_runs():
     page, per_page = _get_pagination()
-    with db_connection() as conn:
-        return jsonify(query_runs(conn, page=page, per_page=per_page))
+    cursor = _get_cursor(int)
+    return _db_cached_json(
+        ("runs", page, per_page, cursor),
+        lambda conn: query_runs(conn, page=page, per_page=per_page, cursor=cursor),
+    )
 
 
 @api_bp.route("/api/sessions")
 def api_sessions():
     page, per_page = _get_pagination()
-    with db_connection() as conn:
-        result = query_sessions(conn, page=page, per_page=per_page)
-        all_prs = query_all_prs(conn)
-        _link_prs_to_session_items(result["items"], all_prs)
-        return jsonify(result)
+    cursor = _get_cursor()
+    return _db_cached_json(
+        ("sessions", page, per_page, cursor),
+        lambda conn: query_sessions(conn, page=page, per_page=per_page, link_prs=True, cursor=cursor),
+    )
 
 
 @api_bp.route("/api/prs")
 def api_prs():
     page, per_page = _get_pagination()
-    with db_connection() as conn:
-        return jsonify(query_prs(conn, page=page, per_page=per_page))
+    cursor = _get_cursor()
+    with pooled_db_connection() as conn:
+        return jsonify(query_prs(conn, page=page, per_page=per_page, cursor=cursor))
 
 
 @api_bp.route("/api/stats")
 def api_stats():
     period = flask_request.args.get("period", "all")
-    with db_connection() as conn:
-        result = query_stats(conn, period=period)
-        result["period"] = period
-        return jsonify(result)
+    return _db_cached_json(("stats", period), lambda conn: {**query_stats(conn, period=period), "period": period})
 
 
 @api_bp.route("/api/repos")
 def api_repos():
-    with db_connection() as conn:
-        return jsonify(query_repos(conn))
+    return _db_cached_json("repos", query_repos)
 
 
 @api_bp.route("/api/poll", methods=["POST"])
@@ -208,12 +189,12 @@ def api_poll():
         conn.commit()
         link_prs_to_sessions_db(conn)
         conn.commit()
-        _audit("poll_sessions", details=json.dumps({
+        _audit("poll_sessions", details={
             "polled": poll_stats["polled"],
             "skipped_terminal": poll_stats["skipped_terminal"],
             "errors": len(poll_stats["errors"]),
             "prs_found": prs_count,
-        }))
+        })
         result: dict = {
             "sessions": updated,
             "polled": poll_stats["polled"],
@@ -232,10 +213,60 @@ def api_poll_prs():
         prs_count = fetch_prs_from_github_to_db(conn)
         conn.commit()
         all_prs = query_all_prs(conn)
-        _audit("poll_prs", details=json.dumps({"prs_found": prs_count}))
+        _audit("poll_prs", details={"prs_found": prs_count})
         return jsonify({"prs": all_prs, "total": prs_count})
 
 
+_REFRESH_WORKERS = 16
+
+# Git blob SHA of each run file as last downloaded, keyed by file name.
+# Not ``*.json`` so the run-file globs never pick it up.
+_REMOTE_SHAS_FILE = ".remote-shas"
+
+
+def _git_blob_sha(path: pathlib.Path) -> str | None:
+    """Return the git blob SHA of *path*, as the contents API reports it."""
+    try:
+        content = path.read_bytes()
+    except OSError:
+        return None
+    return hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
+
+
+def _load_remote_shas(directory: pathlib.Path) -> dict[str, str]:
+    try:
+        shas = load_json_file(directory / _REMOTE_SHAS_FILE)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return shas if isinstance(shas, dict) else {}
+
+
+def _save_remote_shas(directory: pathlib.Path, shas: dict[str, str]) -> None:
+    tmp_path = directory / (_REMOTE_SHAS_FILE + ".tmp")
+    dump_json_file(tmp_path, shas)
+    os.replace(tmp_path, directory / _REMOTE_SHAS_FILE)
+
+
+def _local_json_sizes(directory: pathlib.Path) -> dict[str, int]:
+    """Map each ``*.json`` file in *directory* to its size in one ``scandir`` pass."""
+    sizes: dict[str, int] = {}
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.name.endswith(".json"):
+                try:
+                    sizes[entry.name] = entry.stat().st_size
+                except OSError:
+                    continue
+    return sizes
+
+
+def _download_run_file(url: str) -> "requests.Response | None":
+    try:
+        return gh_session.get(url, timeout=30)
+    except requests.RequestException:
+        return None
+
+
 @api_bp.route("/api/refresh", methods=["POST"])
 @require_api_key
 def api_refresh():
@@ -245,13 +276,17 @@ def api_refresh():
         return jsonify({"error": "GITHUB_TOKEN and ACTION_REPO required"}), 400
 
     RUNS_DIR.mkdir(parents=True, exist_ok=True)
-    downloaded = 0
+    local_sizes = _local_json_sizes(RUNS_DIR)
+    local_names = set(local_sizes)
+    remote_shas = _load_remote_shas(RUNS_DIR)
+    known_shas = dict(remote_shas)
     with db_connection() as conn:
+        pending: list[tuple[dict, pathlib.Path]] = []
         gh_page = 1
         while True:
             url = (f"https://api.github.com/repos/{action_repo}"
                    f"/contents/telemetry/runs?per_page=100&page={gh_page}")
-            resp = requests.get(url, headers=gh_headers(), timeout=30)
+            resp = gh_session.get(url, headers=gh_headers(), timeout=30)
             if resp.status_code != 200:
                 break
             items = resp.json()
@@ -260,25 +295,47 @@ def api_refresh():
             for item in items:
                 if not item.get("name", "").endswith(".json"):
                     continue
-                local_path = RUNS_DIR / item["name"]
-                remote_size = item.get("size", 0)
-                if local_path.exists() and local_path.stat().st_size == remote_size:
-                    continue
-                dl_resp = requests.get(item["download_url"], timeout=30)
-                if dl_resp.status_code == 200:
-                    local_path.write_text(dl_resp.text)
-                    try:
-                        data = dl_resp.json()
-                        result = insert_run(conn, data, item["name"])
-                        if result is not None:
-                            downloaded += 1
-                    except (json.JSONDecodeError, ValueError):
-                        pass
+                name = item["name"]
+                if name in local_sizes:
+                    sha = item.get("sha")
+                    if not sha:
+                        if local_sizes[name] == item.get("size", 0):
+                            continue
+                    elif known_shas.get(name) == sha:
+                        continue
+                    elif name not in known_shas and _git_blob_sha(RUNS_DIR / name) == sha:
+                        # Downloaded before SHAs were recorded and unchanged since.
+                        known_shas[name] = sha
+                        continue
+                pending.append((item, RUNS_DIR / name))
             if len(items) < 100:
                 break
             gh_page += 1
 
-        conn.commit()
+        # Workers only fetch; files and rows are written from this thread
+        # because the SQLite connection is not shared across threads.
+        fetched: list[tuple[dict, str]] = []
+        with ThreadPoolExecutor(max_workers=_REFRESH_WORKERS) as pool:
+            responses = pool.map(_download_run_file, [item["download_url"] for item, _ in pending])
+            for (item, local_path), dl_resp in zip(pending, responses):
+                if dl_resp is None or dl_resp.status_code != 200:
+                    continue
+                # Replace rather than rewrite so the directory mtime moves;
+                # the verification loader relies on it to spot changes.
+                tmp_path = local_path.with_name(local_path.name + ".tmp")
+                tmp_path.write_bytes(dl_resp.content)
+                os.replace(tmp_path, local_path)
+                local_names.add(item["name"])
+                if item.get("sha"):
+                    known_shas[item["name"]] = item["sha"]
+                try:
+                    fetched.append((dl_resp.json(), item["name"]))
+                except (json.JSONDecodeError, ValueError):
+                    pass
+
+        if known_shas != remote_shas:
+            _save_remote_shas(RUNS_DIR, known_shas)
+        downloaded = insert_runs(conn, fetched, refresh_fingerprints=False)
         prs_count = fetch_prs_from_github_to_db(conn)
         conn.commit()
         link_prs_to_sessions_db(conn)
@@ -287,8 +344,8 @@ def api_refresh():
             refresh_fingerprint_issues(conn)
             conn.commit()
 
-        total_files = len(list(RUNS_DIR.glob("*.json")))
-        _audit("refresh_runs", details=json.dumps({"downloaded": downloaded, "total_files": total_files}))
+        total_files = len(local_names)
+        _audit("refresh_runs", details={"downloaded": downloaded, "total_files": total_files})
         return jsonify({
             "downloaded": downloaded,
             "total_files": total_files,
@@ -311,26 +368,29 @@ def api_config():
     return jsonify(response)
 
 
+_PDF_SPOOL_MAX = 1 << 20
+
+
 @api_bp.route("/api/report/pdf")
 def api_report_pdf():
-    with db_connection() as conn:
+    with pooled_db_connection() as conn:
         repo_filter = flask_request.args.get("repo", "")
-        if repo_filter:
-            runs = query_all_runs(conn, target_repo=repo_filter)
-        else:
-            runs = query_all_runs(conn)
-        runs = filter_by_user_access(runs)
         stats = query_stats(conn, target_repo=repo_filter)
         issues = query_issues(conn, target_repo=repo_filter)
-        pdf_bytes = generate_pdf(stats, issues, repo_filter=repo_filter)
-        buf = io.BytesIO(pdf_bytes)
-        buf.seek(0)
-        filename = "security-report"
-        if repo_filter:
-            short = repo_filter.replace("https://github.com/", "").replace("/", "-")
-            filename += f"-{short}"
-        filename += ".pdf"
-        return send_file(buf, mimetype="application/pdf", as_attachment=True, download_name=filename)
+
+    # Spooled to disk past 1 MiB and streamed back in chunks by send_file.
+    buf = tempfile.SpooledTemporaryFile(max_size=_PDF_SPOOL_MAX)
+    generate_pdf(stats, issues, repo_filter=repo_filter, sink=buf)
+    size = buf.tell()
+    buf.seek(0)
+    filename = "security-report"
+    if repo_filter:
+        short = repo_filter.replace("https://github.com/", "").replace("/", "-")
+        filename += f"-{short}"
+    filename += ".pdf"
+    resp = send_file(buf, mimetype="application/pdf", as_attachment=True, download_name=filename)
+    resp.content_length = size
+    return resp
 
 
 @api_bp.route("/api/backfill", methods=["POST"])
@@ -340,22 +400,22 @@ def api_backfill():
         patched = backfill_pr_urls(conn)
         conn.commit()
 
+        # Only runs the database still lists as candidates are opened; a run
+        # is retired once every session has a PR URL or nothing to match on.
         patched_files = 0
-        all_prs = query_all_prs(conn)
-        pr_issue_map: dict[str, str] = {}
-        for p in all_prs:
-            for iid in p.get("issue_ids", []):
-                if iid:
-                    pr_issue_map[iid] = p.get("html_url", "")
-        for fp in RUNS_DIR.glob("*.json"):
-            if fp.name.startswith("verification_"):
-                continue
+        pr_issue_map = query_pr_urls_by_issue(conn)
+        done: list[int] = []
+        for row in query_file_backfill_candidates(conn):
+            fp = RUNS_DIR / row["source_file"]
             try:
-                with open(fp) as f:
-                    run_data = json.load(f)
+                run_data = load_json_file(fp)
+            except FileNotFoundError:
+                done.append(row["id"])
+                continue
             except (json.JSONDecodeError, OSError):
                 continue
             changed = False
+            pending = False
             for s in run_data.get("sessions", []):
                 old_ids = s.get("issue_ids", [])
                 if old_ids and all(iid == "" for iid in old_ids):
@@ -370,23 +430,31 @@ def api_backfill():
                             s["pr_url"] = pr_issue_map[iid]
                             changed = True
                             break
+                    else:
+                        pending = pending or any(s.get("issue_ids", []))
             if changed:
                 patched_files += 1
-                with open(fp, "w") as f:
-                    json.dump(run_data, f, indent=2)
+                dump_json_file(fp, run_data)
+            if not pending:
+                done.append(row["id"])
+        mark_runs_file_backfilled(conn, done)
+        conn.commit()
 
-        _audit("backfill", details=json.dumps({"patched_files": patched_files, "db_patched": patched}))
+        _audit("backfill", details={"patched_files": patched_files, "db_patched": patched})
         return jsonify({"patched_files": patched_files, "db_patched": patched})
 
 
 @api_bp.route("/api/issues")
 def api_issues():
-    with db_connection() as conn:
+    with pooled_db_connection() as conn:
         repo_filter = flask_request.args.get("repo", "")
-        issues = query_issues(conn, target_repo=repo_filter)
+        page, per_page = _get_pagination()
+        issues = query_issues(
+            conn, target_repo=repo_filter, limit=per_page, offset=(page - 1) * per_page,
+        )
+        total = count_issues(conn, target_repo=repo_filter)
 
-        verification_records = load_verification_records(RUNS_DIR)
-        fp_fix_map = build_fingerprint_fix_map(verification_records)
+        fp_fix_map = load_verification_bundle(RUNS_DIR)["fp_fix_map"]
         for issue in issues:
             fp = issue.get("fingerprint", "")
             if fp in fp_fix_map:
@@ -395,13 +463,12 @@ def api_issues():
                 issue["fixed_by_pr"] = fix_info["fixed_by_pr"]
                 issue["verified_at"] = fix_info["verified_at"]
 
-        page, per_page = _get_pagination()
-        return jsonify(_paginate(issues, page, per_page))
+        return jsonify(_page_of(issues, total, page, per_page))
 
 
 @api_bp.route("/api/issues/<fingerprint>/detail")
 def api_issue_detail(fingerprint):
-    with db_connection() as conn:
+    with pooled_db_connection() as conn:
         detail = query_issue_detail(conn, fingerprint)
         if detail is None:
             return jsonify({"error": "Issue not found"}), 404
@@ -420,7 +487,7 @@ def api_issue_status(fingerprint):
         if not ok:
             return jsonify({"error": "Invalid status or issue not found"}), 400
         conn.commit()
-        _audit("update_issue_status", resource=fingerprint, details=json.dumps({"status": new_status}))
+        _audit("update_issue_status", resource=fingerprint, details={"status": new_status})
         return jsonify({"success": True, "fingerprint": fingerprint, "status": new_status})
 
 
@@ -429,7 +496,7 @@ def api_dispatch_impact():
     target_repo = flask_request.args.get("target_repo", "")
     if not target_repo:
         return jsonify({"error": "target_repo is required"}), 400
-    with db_connection() as conn:
+    with pooled_db_connection() as conn:
         return jsonify(query_dispatch_impact(conn, target_repo))
 
 
@@ -439,7 +506,7 @@ def api_issues_search():
     if not q:
         return jsonify({"error": "q parameter is required"}), 400
     repo_filter = flask_request.args.get("repo", "")
-    with db_connection() as conn:
+    with pooled_db_connection() as conn:
         results = search_issues(conn, q, target_repo=repo_filter)
         page, per_page = _get_pagination()
         return jsonify(_paginate(results, page, per_page))
@@ -447,7 +514,7 @@ def api_issues_search():
 
 @api_bp.route("/api/sla")
 def api_sla():
-    with db_connection() as conn:
+    with pooled_db_connection() as conn:
         repo_filter = flask_request.args.get("repo", "")
         issues = query_issues(conn, target_repo=repo_filter)
         return jsonify(compute_sla_summary(issues))
@@ -455,14 +522,12 @@ def api_sla():
 
 @api_bp.route("/api/verification")
 def api_verification():
-    verification_records = load_verification_records(RUNS_DIR)
-    session_map = build_session_verification_map(verification_records)
-    stats = aggregate_verification_stats(verification_records)
+    bundle = load_verification_bundle(RUNS_DIR)
     page, per_page = _get_pagination()
     return jsonify({
-        "stats": stats,
-        "records": _paginate(verification_records, page, per_page),
-        "session_map": session_map,
+        "stats": bundle["stats"],
+        "records": _paginate(bundle["records"], page, per_page),
+        "session_map": bundle["session_map"],
     })
 
 
@@ -472,42 +537,35 @@ def api_dispatch_preflight():
     if not target_repo:
         return jsonify({"error": "target_repo is required"}), 400
 
-    with db_connection() as conn:
-        all_prs = query_all_prs(conn)
-        open_prs = [
-            p for p in all_prs
-            if p.get("state") == "open" and not p.get("merged", False)
-        ]
+    return _db_cached_json(("preflight", target_repo), lambda conn: _compute_preflight(conn, target_repo))
 
-        sessions = query_all_sessions(conn)
-        runs = query_all_runs(conn)
 
-        repo_open_prs = []
-        for p in open_prs:
-            pr_repo = p.get("repo", "")
-            if not pr_repo:
-                continue
-            for s in sessions:
-                if s.get("target_repo", "") == target_repo and s.get("pr_url", "") == p.get("html_url", ""):
-                    repo_open_prs.append(p)
-                    break
-            else:
-                fork_url = ""
-                for run in runs:
-                    if run.get("target_repo", "") == target_repo:
-                        fork_url = run.get("fork_url", "")
-                        break
-                if fork_url and pr_repo in fork_url:
-                    repo_open_prs.append(p)
+def _compute_preflight(conn, target_repo: str) -> dict:
+    repo_open_prs = query_open_repo_prs(conn, target_repo)
+    return {
+        "target_repo": target_repo,
+        "open_prs": len(repo_open_prs),
+        "prs": repo_open_prs,
+    }
 
-        return jsonify({
-            "target_repo": target_repo,
-            "open_prs": len(repo_open_prs),
-            "prs": [
-                {"pr_number": p.get("pr_number"), "title": p.get("title"), "html_url": p.get("html_url")}
-                for p in repo_open_prs
-            ],
-        })
+
+# Workflow inputs accepted by /api/dispatch besides ``target_repo``, with
+# their defaults.  GitHub takes every input as a string; flags are sent
+# lower-cased ("true"/"false").
+_DISPATCH_INPUT_DEFAULTS = {
+    "languages": "",
+    "queries": "security-extended",
+    "persist_logs": True,
+    "include_paths": "",
+    "exclude_paths": "",
+    "batch_size": 5,
+    "max_sessions": 5,
+    "severity_threshold": "low",
+    "dry_run": False,
+    "default_branch": "main",
+}
+_DISPATCH_FLAG_INPUTS = frozenset({"persist_logs", "dry_run"})
+_DISPATCH_INPUT_TYPES = (str, int, float, bool)
 
 
 @api_bp.route("/api/dispatch", methods=["POST"])
@@ -521,32 +579,32 @@ def api_dispatch():
     if not action_repo:
         return jsonify({"error": "ACTION_REPO not configured"}), 400
 
-    body = flask_request.get_json(silent=True) or {}
+    body = flask_request.get_json(silent=True)
+    if not isinstance(body, dict):
+        body = {}
     target_repo = body.get("target_repo", "")
     if not target_repo:
         return jsonify({"error": "target_repo is required"}), 400
-
-    inputs = {
-        "target_repo": target_repo,
-        "languages": body.get("languages", ""),
-        "queries": body.get("queries", "security-extended"),
-        "persist_logs": str(body.get("persist_logs", True)).lower(),
-        "include_paths": body.get("include_paths", ""),
-        "exclude_paths": body.get("exclude_paths", ""),
-        "batch_size": str(body.get("batch_size", 5)),
-        "max_sessions": str(body.get("max_sessions", 5)),
-        "severity_threshold": body.get("severity_threshold", "low"),
-        "dry_run": str(body.get("dry_run", False)).lower(),
-        "default_branch": body.get("default_branch", "main"),
-    }
+    invalid = [
+        k for k in ("target_repo", *_DISPATCH_INPUT_DEFAULTS)
+        if not isinstance(body.get(k, ""), _DISPATCH_INPUT_TYPES)
+    ]
+    if invalid:
+        return jsonify({"error": f"{', '.join(invalid)} must be a string, number or boolean"}), 400
+
+    inputs = {"target_repo": str(target_repo)}
+    inputs.update(
+        (k, str(body.get(k, default)).lower() if k in _DISPATCH_FLAG_INPUTS else str(body.get(k, default)))
+        for k, default in _DISPATCH_INPUT_DEFAULTS.items()
+    )
 
     url = f"https://api.github.com/repos/{action_repo}/actions/workflows/codeql-fixer.yml/dispatches"
     payload = {"ref": "main", "inputs": inputs}
 
     try:
-        resp = requests.post(url, headers=gh_headers(), json=payload, timeout=30)
+        resp = gh_session.post(url, headers=gh_headers(), json=payload, timeout=30)
         if resp.status_code == 204:
-            _audit("dispatch_workflow", resource=target_repo, details=json.dumps(inputs))
+            _audit("dispatch_workflow", resource=target_repo, details=inputs)
             return jsonify({"success": True, "message": "Workflow dispatched successfully"})
         else:
             error_body = resp.text
@@ -562,11 +620,14 @@ def api_dispatch():
 @api_bp.route("/api/audit-log")
 def api_audit_log():
     page, per_page = _get_pagination()
+    cursor = _get_cursor()
     action_filter = flask_request.args.get("action", "")
     user_filter = flask_request.args.get("user", "")
-    with db_connection() as conn:
-        return jsonify(query_audit_logs(conn, page=page, per_page=per_page,
-                                        action_filter=action_filter, user_filter=user_filter))
+    _flush_audit()
+    conn = get_pooled_connection()
+    return jsonify(query_audit_logs(conn, page=page, per_page=per_page,
+                                    action_filter=action_filter, user_filter=user_filter,
+                                    cursor=cursor))
 
 
 @api_bp.route("/api/audit-log/export", methods=["POST"])
@@ -574,14 +635,18 @@ def api_audit_log():
 def api_audit_log_export():
     body = flask_request.get_json(silent=True) or {}
     since = body.get("since", "")
-    with db_connection() as conn:
-        entries = export_audit_logs(conn, since=since)
-        AUDIT_LOG_DIR.mkdir(parents=True, exist_ok=True)
-        from datetime import datetime, timezone
-        ts = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
-        export_path = AUDIT_LOG_DIR / f"audit-log-{ts}.json"
-        with open(export_path, "w") as f:
-            json.dump({"exported_at": ts, "since": since, "entries": entries}, f, indent=2)
-            f.write("\n")
-        _audit("export_audit_log", details=json.dumps({"file": str(export_path), "entries": len(entries)}))
-        return jsonify({"file": str(export_path), "entries": len(entries)})
+    _flush_audit()
+    conn = get_pooled_connection()
+    AUDIT_LOG_DIR.mkdir(parents=True, exist_ok=True)
+    ts = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
+    export_path = AUDIT_LOG_DIR / f"audit-log-{ts}.json"
+    entries = write_audit_log_export(
+        export_path, {"exported_at": ts, "since": since}, iter_audit_logs(conn, since=since),
+    )
+    _audit("export_audit_log", details={"file": str(export_path), "entries": entries})
+    if flask_request.args.get("download") == "1":
+        return send_file(
+            export_path, mimetype="application/json", as_attachment=True,
+            download_name=export_path.name, conditional=True,
+        )
+    return jsonify({"file": str(export_path), "entries": entries})
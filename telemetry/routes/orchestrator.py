@@ -4,22 +4,37 @@ import json
 import os
 import pathlib
 import subprocess
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from itertools import compress
 
 from flask import Blueprint, jsonify, request as flask_request
 
 from config import RUNS_DIR
-from database import db_connection, get_connection, is_orchestrator_state_empty, query_issues, save_orchestrator_state
+from database import (
+    count_fixed_issues,
+    count_issues_by_status,
+    db_connection,
+    is_orchestrator_state_empty,
+    query_issues,
+    save_orchestrator_state,
+)
 from devin_api import clean_session_id  # noqa: E402
-from verification import load_verification_records, build_fingerprint_fix_map
-from helpers import require_api_key, _audit, _paginate, _get_pagination
+from verification import load_verification_bundle
+from helpers import require_api_key, _audit, _paginate, _get_pagination, _db_cached_json, _json_with_etag
 from extensions import limiter
-from routes.registry import _load_registry as _load_orchestrator_registry, _save_registry as _save_orchestrator_registry, REGISTRY_PATH as _ORCHESTRATOR_REGISTRY_PATH  # noqa: F401
+from routes.registry import _load_registry as _load_orchestrator_registry, _save_registry as _save_orchestrator_registry, REGISTRY_PATH as _ORCHESTRATOR_REGISTRY_PATH, _registry_etag  # noqa: F401
 
 try:
     from scripts.orchestrator.state import load_state as _orch_load_state
 except ImportError:
     _orch_load_state = None  # type: ignore[assignment]
 
+try:
+    from scripts.orchestrator.cli import compute_plan as _orch_compute_plan
+except ImportError:
+    _orch_compute_plan = None  # type: ignore[assignment]
+
 try:
     from scripts.orchestrator.agent import merge_agent_scores
 except ImportError:
@@ -58,6 +73,22 @@ def _load_orchestrator_state() -> dict:
             }
 
 
+_FIXED_STATES = frozenset({"fixed", "verified_fixed"})
+_FIX_RATES_TTL = 5.0
+
+_ALLOWED_ORCH_KEYS = frozenset({
+    "global_session_limit",
+    "global_session_limit_period_hours",
+    "objectives",
+    "alert_on_objective_met",
+    "alert_webhook_url",
+    "alert_on_verified_fix",
+    "alert_severities",
+    "dispatch_scoring_mode",
+    "agent_score_weight",
+})
+
+
 def _serialize_orch_config(orch_config: dict) -> dict:
     return {
         "global_session_limit": orch_config.get("global_session_limit", 20),
@@ -85,6 +116,12 @@ def _normalize_dispatch_entry(entry: dict) -> dict:
 
 @orchestrator_bp.route("/api/orchestrator/status")
 def api_orchestrator_status():
+    # Cached for up to 30 s, so ``timestamp`` and the rate-limit window may
+    # lag slightly behind the wall clock.
+    return _db_cached_json("orchestrator_status", _compute_orchestrator_status, extra=(_registry_etag(),))
+
+
+def _compute_orchestrator_status(conn) -> dict:
     state = _load_orchestrator_state()
     registry = _load_orchestrator_registry()
     orch_config = registry.get("orchestrator", {})
@@ -94,7 +131,6 @@ def api_orchestrator_status():
 
     rl_data = state.get("rate_limiter", {})
     timestamps = rl_data.get("created_timestamps", rl_data.get("timestamps", []))
-    from datetime import datetime, timedelta, timezone
     cutoff = datetime.now(timezone.utc) - timedelta(hours=period_hours)
     used = 0
     for t in timestamps:
@@ -105,64 +141,69 @@ def api_orchestrator_status():
         except (ValueError, TypeError):
             pass
 
-    conn = get_connection()
-    try:
-        issues = query_issues(conn)
-        state_counts: dict[str, int] = {}
-        for issue in issues:
-            derived = issue.get("derived_state", issue.get("status", "new"))
-            state_counts[derived] = state_counts.get(derived, 0) + 1
-
-        objectives = orch_config.get("objectives", [])
-        objective_progress = []
-        for obj in objectives:
-            obj_name = obj.get("objective", "")
-            target = obj.get("target_count", 0)
-            severity = obj.get("severity", "")
-            current = sum(
-                1 for i in issues
-                if i.get("derived_state") in ("verified_fixed", "fixed")
-                and (not severity or i.get("severity_tier") == severity)
-            )
-            objective_progress.append({
-                "objective": obj_name,
-                "target_count": target,
-                "current_count": current,
-                "met": current >= target,
-            })
-
-        return jsonify({
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "last_cycle": state.get("last_cycle"),
-            "issue_state_breakdown": state_counts,
-            "total_issues": len(issues),
-            "rate_limit": {
-                "used": used,
-                "max": max_sessions,
-                "remaining": max_sessions - used,
-                "period_hours": period_hours,
-            },
-            "objective_progress": objective_progress,
-            "scan_schedule": state.get("scan_schedule", {}),
-            "dispatch_history_entries": len(state.get("dispatch_history", {})),
+    state_counts = count_issues_by_status(conn)
+
+    objectives = orch_config.get("objectives", [])
+    objective_progress = []
+    for obj in objectives:
+        obj_name = obj.get("objective", "")
+        target = obj.get("target_count", 0)
+        severity = obj.get("severity", "")
+        current = count_fixed_issues(conn, severity)
+        objective_progress.append({
+            "objective": obj_name,
+            "target_count": target,
+            "current_count": current,
+            "met": current >= target,
         })
-    finally:
-        conn.close()
 
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "last_cycle": state.get("last_cycle"),
+        "issue_state_breakdown": state_counts,
+        "total_issues": sum(state_counts.values()),
+        "rate_limit": {
+            "used": used,
+            "max": max_sessions,
+            "remaining": max_sessions - used,
+            "period_hours": period_hours,
+        },
+        "objective_progress": objective_progress,
+        "scan_schedule": state.get("scan_schedule", {}),
+        "dispatch_history_entries": len(state.get("dispatch_history", {})),
+    }
 
-@orchestrator_bp.route("/api/orchestrator/plan")
-def api_orchestrator_plan():
+
+def _compute_plan() -> tuple[dict | None, dict | None]:
+    """Return ``(plan, error)``, computing the plan in-process when possible.
+
+    Falls back to the orchestrator CLI when the ``scripts`` package is not
+    importable from the app's working directory.
+    """
+    if _orch_compute_plan is not None:
+        try:
+            return _orch_compute_plan(), None
+        except Exception as exc:
+            return None, {"error": "Plan computation failed", "stderr": str(exc)[:500]}
     result = subprocess.run(
         ["python3", "-m", "scripts.orchestrator", "plan", "--json"],
         capture_output=True, text=True, timeout=60,
         cwd=str(_ORCHESTRATOR_DIR.parent),
     )
     if result.returncode != 0:
-        return jsonify({"error": "Plan computation failed", "stderr": result.stderr[:500]}), 500
+        return None, {"error": "Plan computation failed", "stderr": result.stderr[:500]}
     try:
-        return jsonify(json.loads(result.stdout))
+        return json.loads(result.stdout), None
     except (json.JSONDecodeError, ValueError):
-        return jsonify({"error": "Invalid plan output", "raw": result.stdout[:500]}), 500
+        return None, {"error": "Invalid plan output", "raw": result.stdout[:500]}
+
+
+@orchestrator_bp.route("/api/orchestrator/plan")
+def api_orchestrator_plan():
+    plan, error = _compute_plan()
+    if error is not None:
+        return jsonify(error), 500
+    return jsonify(plan)
 
 
 @orchestrator_bp.route("/api/orchestrator/dispatch", methods=["POST"])
@@ -186,7 +227,7 @@ def api_orchestrator_dispatch():
         cmd, capture_output=True, text=True, timeout=120,
         cwd=str(_ORCHESTRATOR_DIR.parent),
     )
-    _audit("orchestrator_dispatch", resource=repo_filter, details=json.dumps({"dry_run": dry_run}))
+    _audit("orchestrator_dispatch", resource=repo_filter, details={"dry_run": dry_run})
     try:
         return jsonify(json.loads(result.stdout))
     except (json.JSONDecodeError, ValueError):
@@ -217,7 +258,7 @@ def api_orchestrator_scan():
         cmd, capture_output=True, text=True, timeout=120,
         cwd=str(_ORCHESTRATOR_DIR.parent),
     )
-    _audit("orchestrator_scan", resource=repo_filter, details=json.dumps({"dry_run": dry_run}))
+    _audit("orchestrator_scan", resource=repo_filter, details={"dry_run": dry_run})
     try:
         return jsonify(json.loads(result.stdout))
     except (json.JSONDecodeError, ValueError):
@@ -229,6 +270,14 @@ def api_orchestrator_scan():
 @orchestrator_bp.route("/api/orchestrator/history")
 def api_orchestrator_history():
     fingerprint = flask_request.args.get("fingerprint", "")
+    page, per_page = (1, 0) if fingerprint else _get_pagination()
+    return _db_cached_json(
+        ("orchestrator_history", fingerprint, page, per_page),
+        lambda conn: _compute_orchestrator_history(fingerprint, page, per_page),
+    )
+
+
+def _compute_orchestrator_history(fingerprint: str, page: int, per_page: int) -> dict:
     state = _load_orchestrator_state()
     dispatch_history = state.get("dispatch_history", {})
 
@@ -237,9 +286,8 @@ def api_orchestrator_history():
         if not isinstance(entries, list):
             entries = [entries] if entries else []
         entries = [_normalize_dispatch_entry({**e, "fingerprint": fingerprint}) for e in entries]
-        return jsonify({"fingerprint": fingerprint, "entries": entries})
+        return {"fingerprint": fingerprint, "entries": entries}
 
-    page, per_page = _get_pagination()
     all_entries: list[dict] = []
     for fp, history in dispatch_history.items():
         if isinstance(history, list):
@@ -249,7 +297,7 @@ def api_orchestrator_history():
             all_entries.append(_normalize_dispatch_entry({**history, "fingerprint": fp}))
 
     all_entries.sort(key=lambda e: e.get("dispatched_at", ""), reverse=True)
-    return jsonify(_paginate(all_entries, page, per_page))
+    return _paginate(all_entries, page, per_page)
 
 
 @orchestrator_bp.route("/api/orchestrator/cycle", methods=["POST"])
@@ -277,7 +325,7 @@ def api_orchestrator_cycle():
         cmd, capture_output=True, text=True, timeout=300,
         cwd=str(_ORCHESTRATOR_DIR.parent),
     )
-    _audit("orchestrator_cycle", resource=repo_filter, details=json.dumps({"dry_run": dry_run}))
+    _audit("orchestrator_cycle", resource=repo_filter, details={"dry_run": dry_run})
     try:
         return jsonify(json.loads(result.stdout))
     except (json.JSONDecodeError, ValueError):
@@ -288,9 +336,11 @@ def api_orchestrator_cycle():
 
 @orchestrator_bp.route("/api/orchestrator/config")
 def api_orchestrator_config():
-    registry = _load_orchestrator_registry()
-    orch_config = registry.get("orchestrator", {})
-    return jsonify(_serialize_orch_config(orch_config))
+    return _json_with_etag(
+        _registry_etag(),
+        lambda: _serialize_orch_config(_load_orchestrator_registry().get("orchestrator", {})),
+        cache_key="orchestrator_config",
+    )
 
 
 @orchestrator_bp.route("/api/orchestrator/config", methods=["PUT"])
@@ -303,25 +353,13 @@ def api_orchestrator_config_update():
     registry = _load_orchestrator_registry()
     orch_config = registry.get("orchestrator", {})
 
-    allowed_keys = (
-        "global_session_limit",
-        "global_session_limit_period_hours",
-        "objectives",
-        "alert_on_objective_met",
-        "alert_webhook_url",
-        "alert_on_verified_fix",
-        "alert_severities",
-        "dispatch_scoring_mode",
-        "agent_score_weight",
-    )
-    for key in allowed_keys:
-        if key in body:
-            orch_config[key] = body[key]
+    updates = {k: body[k] for k in _ALLOWED_ORCH_KEYS & body.keys()}
+    orch_config.update(updates)
 
     registry["orchestrator"] = orch_config
     _save_orchestrator_registry(registry)
 
-    _audit("update_orchestrator_config", details=json.dumps({k: body[k] for k in allowed_keys if k in body}))
+    _audit("update_orchestrator_config", details=updates)
     return jsonify(_serialize_orch_config(orch_config))
 
 
@@ -346,7 +384,7 @@ def api_orchestrator_agent_triage():
         cmd, capture_output=True, text=True, timeout=360,
         cwd=str(_ORCHESTRATOR_DIR.parent),
     )
-    _audit("orchestrator_agent_triage", resource=repo_filter, details=json.dumps({"dry_run": dry_run}))
+    _audit("orchestrator_agent_triage", resource=repo_filter, details={"dry_run": dry_run})
     try:
         return jsonify(json.loads(result.stdout))
     except (json.JSONDecodeError, ValueError):
@@ -362,16 +400,7 @@ def api_orchestrator_agent_plan():
     if not agent_triage:
         return jsonify({"status": "no_results", "decisions": [], "message": "No agent triage results available. Run agent triage first."})
 
-    result = subprocess.run(
-        ["python3", "-m", "scripts.orchestrator", "plan", "--json"],
-        capture_output=True, text=True, timeout=60,
-        cwd=str(_ORCHESTRATOR_DIR.parent),
-    )
-    det_plan = {}
-    try:
-        det_plan = json.loads(result.stdout)
-    except (json.JSONDecodeError, ValueError):
-        pass
+    det_plan = _compute_plan()[0] or {}
 
     det_dispatches = det_plan.get("planned_dispatches", [])
     agent_decisions = agent_triage.get("decisions", [])
@@ -407,53 +436,37 @@ def api_orchestrator_agent_plan():
 
 @orchestrator_bp.route("/api/orchestrator/fix-rates")
 def api_orchestrator_fix_rates():
-    with db_connection() as conn:
-        issues = query_issues(conn)
-        verification_records = load_verification_records(RUNS_DIR)
-        fp_fix_map = build_fingerprint_fix_map(verification_records)
-
-        by_cwe: dict[str, dict] = {}
-        by_repo: dict[str, dict] = {}
-        by_severity: dict[str, dict] = {}
-
-        for issue in issues:
-            fp = issue.get("fingerprint", "")
-            cwe = issue.get("cwe_family", "unknown") or "unknown"
-            repo = issue.get("target_repo", "unknown") or "unknown"
-            sev = issue.get("severity_tier", "unknown") or "unknown"
-            is_fixed = fp in fp_fix_map or issue.get("derived_state") in ("fixed", "verified_fixed")
-
-            for _group_key, group_dict, group_val in [
-                ("cwe", by_cwe, cwe),
-                ("repo", by_repo, repo),
-                ("severity", by_severity, sev),
-            ]:
-                if group_val not in group_dict:
-                    group_dict[group_val] = {"total": 0, "fixed": 0}
-                group_dict[group_val]["total"] += 1
-                if is_fixed:
-                    group_dict[group_val]["fixed"] += 1
-
-        def _compute_rates(group_dict: dict) -> list[dict]:
-            result = []
-            for name, counts in sorted(group_dict.items(), key=lambda x: x[1]["total"], reverse=True):
-                total = counts["total"]
-                fixed = counts["fixed"]
-                rate = round(fixed / max(total, 1) * 100, 1)
-                result.append({"name": name, "total": total, "fixed": fixed, "fix_rate": rate})
-            return result
-
-        total_issues = len(issues)
-        total_fixed = sum(
-            1 for i in issues
-            if i.get("fingerprint", "") in fp_fix_map
-            or i.get("derived_state") in ("fixed", "verified_fixed")
-        )
-        overall_rate = round(total_fixed / max(total_issues, 1) * 100, 1)
-
-        return jsonify({
-            "overall": {"total": total_issues, "fixed": total_fixed, "fix_rate": overall_rate},
-            "by_cwe_family": _compute_rates(by_cwe),
-            "by_repo": _compute_rates(by_repo),
-            "by_severity": _compute_rates(by_severity),
-        })
+    # The short TTL bounds staleness of the verification files.
+    return _db_cached_json("fix_rates", _compute_fix_rates, ttl=_FIX_RATES_TTL)
+
+
+def _compute_fix_rates(conn) -> dict:
+    issues = query_issues(conn)
+    fp_fix_map = load_verification_bundle(RUNS_DIR)["fp_fix_map"]
+
+    fixed_flags = [
+        i.get("fingerprint", "") in fp_fix_map or i.get("derived_state") in _FIXED_STATES
+        for i in issues
+    ]
+
+    def _compute_rates(field: str) -> list[dict]:
+        keys = [i.get(field, "unknown") or "unknown" for i in issues]
+        totals = Counter(keys)
+        fixed_counts = Counter(compress(keys, fixed_flags))
+        result = []
+        for name, total in sorted(totals.items(), key=lambda x: x[1], reverse=True):
+            fixed = fixed_counts[name]
+            rate = round(fixed / max(total, 1) * 100, 1)
+            result.append({"name": name, "total": total, "fixed": fixed, "fix_rate": rate})
+        return result
+
+    total_issues = len(issues)
+    total_fixed = sum(fixed_flags)
+    overall_rate = round(total_fixed / max(total_issues, 1) * 100, 1)
+
+    return {
+        "overall": {"total": total_issues, "fixed": total_fixed, "fix_rate": overall_rate},
+        "by_cwe_family": _compute_rates("cwe_family"),
+        "by_repo": _compute_rates("target_repo"),
+        "by_severity": _compute_rates("severity_tier"),
+    }
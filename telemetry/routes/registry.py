@@ -5,7 +5,7 @@ import pathlib
 
 from flask import Blueprint, jsonify, request as flask_request
 
-from helpers import require_api_key, _audit
+from helpers import require_api_key, _audit, _clear_json_cache, _file_etag, _json_with_etag
 
 registry_bp = Blueprint("registry", __name__)
 
@@ -13,6 +13,11 @@ REGISTRY_PATH = pathlib.Path(__file__).resolve().parent.parent.parent / "repo_re
 
 _VALID_IMPORTANCE = ("low", "medium", "high", "critical")
 _VALID_SCHEDULE = ("hourly", "daily", "weekly", "monthly")
+_ALLOWED_REPO_KEYS = frozenset({
+    "enabled", "importance", "importance_score", "schedule",
+    "max_sessions_per_cycle", "auto_scan", "auto_dispatch",
+    "tags", "overrides",
+})
 
 
 def _load_registry() -> dict:
@@ -22,10 +27,17 @@ def _load_registry() -> dict:
         return json.load(f)
 
 
+def _registry_etag() -> str | None:
+    return _file_etag(REGISTRY_PATH)
+
+
 def _save_registry(data: dict) -> None:
+    # Stored compact since only the app and orchestrator read it; use
+    # ``python -m json.tool repo_registry.json`` for a readable view.
     with open(REGISTRY_PATH, "w") as f:
-        json.dump(data, f, indent=2)
+        json.dump(data, f, separators=(",", ":"))
         f.write("\n")
+    _clear_json_cache()
 
 
 def _validate_repo_fields(body: dict) -> str | None:
@@ -49,7 +61,7 @@ def _validate_repo_fields(body: dict) -> str | None:
 
 @registry_bp.route("/api/registry")
 def api_registry():
-    return jsonify(_load_registry())
+    return _json_with_etag(_registry_etag(), _load_registry, cache_key="registry")
 
 
 @registry_bp.route("/api/registry", methods=["PUT"])
@@ -69,7 +81,7 @@ def api_registry_update():
     if "repos" in body:
         registry["repos"] = body["repos"]
     _save_registry(registry)
-    _audit("update_registry", details=json.dumps({"updated_sections": updated_keys}))
+    _audit("update_registry", details={"updated_sections": updated_keys})
     return jsonify(registry)
 
 
@@ -120,19 +132,12 @@ def api_registry_update_repo(idx):
         return jsonify({"error": "Invalid repo index"}), 404
 
     repo_entry = repos[idx]
-    allowed_repo_keys = (
-        "enabled", "importance", "importance_score", "schedule",
-        "max_sessions_per_cycle", "auto_scan", "auto_dispatch",
-        "tags", "overrides",
-    )
-    for key in allowed_repo_keys:
-        if key in body:
-            repo_entry[key] = body[key]
+    repo_entry.update({k: body[k] for k in _ALLOWED_REPO_KEYS & body.keys()})
 
     repos[idx] = repo_entry
     registry["repos"] = repos
     _save_registry(registry)
-    _audit("update_registry_repo", resource=repo_entry.get("repo", ""), details=json.dumps({"idx": idx, "fields": list(body.keys())}))
+    _audit("update_registry_repo", resource=repo_entry.get("repo", ""), details={"idx": idx, "fields": list(body.keys())})
     return jsonify(repo_entry)
 
 
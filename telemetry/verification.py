@@ -8,9 +8,20 @@ metrics for the dashboard.
 from __future__ import annotations
 
 import json
+import os
 import pathlib
+import stat
+import threading
+import time
 from typing import Any
 
+from json_files import load_json_file
+
+_BUNDLE_CACHE: dict[str, tuple[tuple, dict[str, Any]]] = {}
+_BUNDLE_LOCK = threading.Lock()
+_DIR_KEYS: dict[str, tuple[int, tuple]] = {}
+_RACY_MTIME_NS = 1_000_000_000
+
 
 def load_verification_records(runs_dir: pathlib.Path) -> list[dict[str, Any]]:
     """Load all verification JSON files from the runs directory."""
@@ -19,10 +30,9 @@ def load_verification_records(runs_dir: pathlib.Path) -> list[dict[str, Any]]:
         return records
     for fp in sorted(runs_dir.glob("verification_*.json")):
         try:
-            with open(fp) as f:
-                data = json.load(f)
-                data["_file"] = fp.name
-                records.append(data)
+            data = load_json_file(fp)
+            data["_file"] = fp.name
+            records.append(data)
         except (json.JSONDecodeError, OSError):
             continue
     return records
@@ -144,3 +154,70 @@ def aggregate_verification_stats(
             total_fixed / max(total_targeted, 1) * 100, 1
         ),
     }
+
+
+def _verification_files_key(runs_dir: pathlib.Path) -> tuple:
+    """Return the name, mtime and size of every verification file in *runs_dir*.
+
+    The per-file walk is skipped while the directory's own mtime is
+    unchanged, since adding, removing or renaming a file bumps it.
+    Files must therefore be replaced atomically rather than rewritten
+    in place.  A directory mtime within ``_RACY_MTIME_NS`` of the
+    walk is not trusted, as a later change could land in the same
+    timestamp tick.
+    """
+    try:
+        dir_st = runs_dir.stat()
+    except OSError:
+        return ()
+    if not stat.S_ISDIR(dir_st.st_mode):
+        return ()
+    dir_key = str(runs_dir)
+    known = _DIR_KEYS.get(dir_key)
+    if known is not None and known[0] == dir_st.st_mtime_ns:
+        return known[1]
+    walk_started = time.time_ns()
+    key = []
+    try:
+        with os.scandir(runs_dir) as it:
+            for entry in it:
+                if not (entry.name.startswith("verification_") and entry.name.endswith(".json")):
+                    continue
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                key.append((entry.name, st.st_mtime_ns, st.st_size))
+    except OSError:
+        return ()
+    files_key = tuple(sorted(key))
+    if walk_started - dir_st.st_mtime_ns > _RACY_MTIME_NS:
+        _DIR_KEYS[dir_key] = (dir_st.st_mtime_ns, files_key)
+    return files_key
+
+
+def load_verification_bundle(runs_dir: pathlib.Path) -> dict[str, Any]:
+    """Return verification records and their derived maps, memoized on disk state.
+
+    The result has ``records``, ``fp_fix_map``, ``session_map`` and ``stats``
+    keys.  It is rebuilt only when a ``verification_*.json`` file is added,
+    removed or replaced, so callers must treat it as read-only.
+    """
+    key = _verification_files_key(runs_dir)
+    cache_key = str(runs_dir)
+    cached = _BUNDLE_CACHE.get(cache_key)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    with _BUNDLE_LOCK:
+        cached = _BUNDLE_CACHE.get(cache_key)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        records = load_verification_records(runs_dir)
+        bundle = {
+            "records": records,
+            "fp_fix_map": build_fingerprint_fix_map(records),
+            "session_map": build_session_verification_map(records),
+            "stats": aggregate_verification_stats(records),
+        }
+        _BUNDLE_CACHE[cache_key] = (key, bundle)
+        return bundle
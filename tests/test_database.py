@@ -6,15 +6,19 @@ import pathlib
 import sqlite3
 import sys
 import tempfile
+from datetime import datetime, timezone
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "telemetry"))
 
 import pytest
 from database import (
     get_connection,
+    get_pooled_connection,
+    pooled_db_connection,
     init_db,
     is_db_empty,
     insert_run,
+    insert_runs,
     upsert_pr,
     query_runs,
     query_all_runs,
@@ -24,20 +28,37 @@ from database import (
     query_all_prs,
     query_stats,
     query_repos,
+    query_repo_prs,
+    query_repo_fork_url,
+    fork_repo_name,
+    query_open_repo_prs,
+    query_repo_totals,
+    count_prs_by_state,
+    aggregate_severity,
+    aggregate_category,
     query_issues,
+    count_issues,
+    count_issues_by_status,
+    count_fixed_issues,
     search_issues,
     update_session,
     backfill_pr_urls,
+    query_pr_urls_by_issue,
+    link_session_pr_urls,
     collect_session_ids_from_db,
     collect_search_repos_from_db,
     insert_audit_log,
+    insert_audit_logs,
     query_audit_logs,
     export_audit_logs,
+    iter_audit_logs,
+    write_audit_log_export,
     refresh_fingerprint_issues,
     query_issue_detail,
     update_issue_status,
     query_dispatch_impact,
 )
+from migrate_json_to_sqlite import migrate_json_files
 
 
 @pytest.fixture
@@ -120,14 +141,91 @@ class TestSchema:
         row = db.execute("PRAGMA journal_mode").fetchone()
         assert row[0] == "wal"
 
+    def test_temp_store_in_memory(self, db):
+        row = db.execute("PRAGMA temp_store").fetchone()
+        assert row[0] == 2
+
+    def test_read_cache_pragmas(self, db):
+        assert db.execute("PRAGMA cache_size").fetchone()[0] == -64 * 1024
+        assert db.execute("PRAGMA mmap_size").fetchone()[0] in (0, 256 * 1024 * 1024)
+
     def test_foreign_keys_on(self, db):
         row = db.execute("PRAGMA foreign_keys").fetchone()
         assert row[0] == 1
 
+    def test_repo_runs_query_uses_composite_index(self, db):
+        plan = db.execute(
+            "EXPLAIN QUERY PLAN SELECT r.* FROM runs r WHERE r.target_repo = ? ORDER BY r.run_number DESC",
+            ("https://github.com/a/b",),
+        ).fetchall()
+        detail = " ".join(row["detail"] for row in plan)
+        assert "idx_runs_target_repo_run_number" in detail
+        assert "TEMP B-TREE" not in detail
+
+    def test_repo_fork_url_query_uses_covering_index(self, db):
+        plan = db.execute(
+            "EXPLAIN QUERY PLAN SELECT MAX(fork_url) FROM runs WHERE target_repo = ?",
+            ("https://github.com/a/b",),
+        ).fetchall()
+        detail = " ".join(row["detail"] for row in plan)
+        assert "COVERING INDEX idx_runs_target_repo_fork_url" in detail
+
+    def test_stats_run_totals_read_only_the_covering_index(self, db):
+        for sql in (
+            "SELECT COUNT(*), SUM(r.issues_found) FROM runs r WHERE r.target_repo = ? AND r.timestamp >= ?",
+            """SELECT SUM(r.issues_found) FROM runs r
+               JOIN (SELECT target_repo, MAX(timestamp) AS max_ts FROM runs r WHERE r.target_repo = ? AND r.timestamp >= ?
+                     GROUP BY target_repo) sub
+               ON r.target_repo = sub.target_repo AND r.timestamp = sub.max_ts""",
+        ):
+            plan = db.execute(f"EXPLAIN QUERY PLAN {sql}", ("https://github.com/a/b", "2026")).fetchall()
+            details = [row["detail"] for row in plan if row["detail"].startswith(("SCAN r", "SEARCH r"))]
+            assert details and all("COVERING INDEX idx_runs_repo_ts_cover" in d for d in details)
+
+    def test_run_fingerprints_read_only_the_covering_index(self, db):
+        plan = db.execute(
+            "EXPLAIN QUERY PLAN SELECT DISTINCT i.fingerprint FROM issues i WHERE i.run_id IN (1, 2)"
+        ).fetchall()
+        detail = " ".join(row["detail"] for row in plan)
+        assert "COVERING INDEX idx_issues_run_fp" in detail
+
     def test_empty_db(self, db):
         assert is_db_empty(db) is True
 
 
+class TestPooledConnection:
+    def test_reused_within_thread(self, tmp_path):
+        db_path = tmp_path / "pooled.db"
+        assert get_pooled_connection(db_path) is get_pooled_connection(db_path)
+
+    def test_separate_connection_per_thread(self, tmp_path):
+        import threading
+        db_path = tmp_path / "pooled.db"
+        main_conn = get_pooled_connection(db_path)
+        other: list = []
+        t = threading.Thread(target=lambda: other.append(get_pooled_connection(db_path)))
+        t.start()
+        t.join()
+        assert other[0] is not main_conn
+
+    def test_open_transaction_rolled_back_on_reuse(self, tmp_path):
+        db_path = tmp_path / "pooled.db"
+        conn = get_pooled_connection(db_path)
+        conn.execute("INSERT INTO metadata (key, value) VALUES ('k', 'v')")
+        assert conn.in_transaction
+        conn = get_pooled_connection(db_path)
+        assert not conn.in_transaction
+        assert conn.execute("SELECT COUNT(*) FROM metadata").fetchone()[0] == 0
+
+    def test_context_manager_reuses_and_releases(self, tmp_path):
+        db_path = tmp_path / "pooled.db"
+        with pooled_db_connection(db_path) as conn:
+            conn.execute("INSERT INTO metadata (key, value) VALUES ('k', 'v')")
+        assert conn is get_pooled_connection(db_path)
+        assert not conn.in_transaction
+        assert conn.execute("SELECT COUNT(*) FROM metadata").fetchone()[0] == 0
+
+
 class TestInsertRun:
     def test_insert_and_retrieve(self, db):
         run_id = insert_run(db, _sample_run(), "file1.json")
@@ -165,6 +263,25 @@ class TestInsertRun:
         assert len(iids) == 2
         assert {r["issue_id"] for r in iids} == {"CQLF-R1-0001", "CQLF-R1-0002"}
 
+    def test_issue_ids_follow_their_session(self, db):
+        data = _sample_run()
+        data["sessions"] = [
+            {"session_id": f"s{n}", "issue_ids": [f"I{n}-a", "", f"I{n}-b"], "structured_output": {"n": n}}
+            for n in range(3)
+        ]
+        run_id = insert_run(db, data, "f.json")
+        db.commit()
+        rows = db.execute(
+            """SELECT s.session_id, s.structured_output, si.issue_id FROM sessions s
+               JOIN session_issue_ids si ON si.session_id = s.id
+               WHERE s.run_id = ? ORDER BY si.id""",
+            (run_id,),
+        ).fetchall()
+        assert [(r["session_id"], r["issue_id"]) for r in rows] == [
+            (f"s{n}", f"I{n}-{x}") for n in range(3) for x in "ab"
+        ]
+        assert json.loads(rows[-1]["structured_output"]) == {"n": 2}
+
     def test_issue_fingerprints_inserted(self, db):
         run_id = insert_run(db, _sample_run(), "f.json")
         db.commit()
@@ -180,6 +297,51 @@ class TestInsertRun:
         parsed = json.loads(row["severity_breakdown"])
         assert parsed == {"high": 2, "medium": 1}
 
+    def test_insert_runs_batch_skips_existing(self, db):
+        insert_run(db, _sample_run(1), "r1.json")
+        db.commit()
+        runs = [(_sample_run(n), f"r{n}.json") for n in (1, 2, 3)]
+        assert insert_runs(db, runs) == 2
+        assert not db.in_transaction
+        assert db.execute("SELECT COUNT(*) FROM runs").fetchone()[0] == 3
+        assert db.execute("SELECT COUNT(*) FROM issues").fetchone()[0] == 6
+        fp_rows = db.execute("SELECT COUNT(*) FROM fingerprint_issues").fetchone()[0]
+        assert fp_rows > 0
+
+
+class TestMigrateJsonFiles:
+    def test_migrates_in_name_order_and_counts_errors(self, db, tmp_path):
+        for n in (3, 1, 2):
+            (tmp_path / f"run_{n}.json").write_text(json.dumps(_sample_run(run_number=n, label=f"r{n}")))
+        (tmp_path / "run_9.json").write_text("not json{{")
+        (tmp_path / "verification_1.json").write_text(json.dumps({"session_id": "s1"}))
+        stats = migrate_json_files(tmp_path, db)
+        assert stats == {"migrated": 3, "skipped": 0, "errors": 1}
+        rows = db.execute("SELECT source_file FROM runs ORDER BY id").fetchall()
+        assert [r["source_file"] for r in rows] == ["run_1.json", "run_2.json", "run_3.json"]
+        assert migrate_json_files(tmp_path, db) == {"migrated": 0, "skipped": 3, "errors": 1}
+
+    def test_reads_a_bounded_window_ahead(self, db, tmp_path, monkeypatch):
+        import migrate_json_to_sqlite as mig
+
+        for n in range(1, 11):
+            (tmp_path / f"run_{n:02d}.json").write_text(json.dumps(_sample_run(run_number=n, label=f"r{n}")))
+        monkeypatch.setattr(mig, "_READ_AHEAD", 3)
+        read: list[str] = []
+        real_read = mig._read_run_file
+        monkeypatch.setattr(mig, "_read_run_file", lambda fp: (read.append(fp.name), real_read(fp))[1])
+        inserted = 0
+        real_insert = mig.insert_run
+
+        def insert(conn, data, name):
+            nonlocal inserted
+            assert len(read) <= inserted + 1 + 3
+            inserted += 1
+            return real_insert(conn, data, name)
+
+        monkeypatch.setattr(mig, "insert_run", insert)
+        assert migrate_json_files(tmp_path, db)["migrated"] == 10
+
 
 class TestUpsertPr:
     def test_insert_pr(self, db):
@@ -199,6 +361,9 @@ class TestUpsertPr:
         assert pr_id is not None
         row = db.execute("SELECT * FROM prs WHERE id = ?", (pr_id,)).fetchone()
         assert row["title"] == "Fix injection"
+        fetched = datetime.fromisoformat(row["fetched_at"])
+        assert fetched.tzinfo is not None
+        assert abs((datetime.now(timezone.utc) - fetched).total_seconds()) < 60
 
     def test_upsert_updates_existing(self, db):
         pr_data = {
@@ -225,6 +390,49 @@ class TestUpsertPr:
         assert row["state"] == "closed"
         assert row["merged"] == 1
 
+    def test_resync_only_writes_changed_issue_ids(self, db):
+        pr_data = {
+            "pr_number": 8, "html_url": "https://github.com/owner/repo/pull/8",
+            "state": "open", "issue_ids": ["I1", "I2", "I1"],
+        }
+        pr_id = upsert_pr(db, pr_data)
+        before = db.total_changes
+        upsert_pr(db, pr_data)
+        assert db.total_changes - before == 1
+        upsert_pr(db, {**pr_data, "issue_ids": ["I2", "I3"]})
+        db.commit()
+        ids = db.execute("SELECT issue_id FROM pr_issue_ids WHERE pr_id = ? ORDER BY id", (pr_id,)).fetchall()
+        assert [r["issue_id"] for r in ids] == ["I2", "I3"]
+        links = db.execute("SELECT issue_id FROM pr_link ORDER BY issue_id").fetchall()
+        assert [r["issue_id"] for r in links] == ["I2", "I3"]
+
+    def test_migration_removes_duplicate_issue_ids(self, db):
+        pr_id = upsert_pr(db, {"pr_number": 9, "html_url": "https://github.com/owner/repo/pull/9", "issue_ids": ["I1"]})
+        db.execute("DROP INDEX ux_pr_issue_ids")
+        db.execute("INSERT INTO pr_issue_ids (pr_id, issue_id) VALUES (?, 'I1')", (pr_id,))
+        db.commit()
+        init_db(db)
+        assert db.execute("SELECT COUNT(*) FROM pr_issue_ids").fetchone()[0] == 1
+        with pytest.raises(sqlite3.IntegrityError):
+            db.execute("INSERT INTO pr_issue_ids (pr_id, issue_id) VALUES (?, 'I1')", (pr_id,))
+
+    @pytest.mark.parametrize("returning", [True, False])
+    def test_upsert_returns_existing_id(self, db, monkeypatch, returning):
+        import database
+
+        monkeypatch.setattr(database, "_HAS_RETURNING", returning)
+        pr_data = {
+            "pr_number": 7, "html_url": "https://github.com/owner/repo/pull/7",
+            "state": "open", "issue_ids": ["I1", "", "I2"],
+        }
+        upsert_pr(db, {**pr_data, "html_url": "https://github.com/owner/repo/pull/6"})
+        first = upsert_pr(db, pr_data)
+        again = upsert_pr(db, {**pr_data, "state": "closed", "issue_ids": ["I3"]})
+        db.commit()
+        assert again == first
+        ids = db.execute("SELECT issue_id FROM pr_issue_ids WHERE pr_id = ? ORDER BY id", (first,)).fetchall()
+        assert [r["issue_id"] for r in ids] == ["I3"]
+
 
 class TestQueryRuns:
     def test_paginated(self, db):
@@ -255,6 +463,26 @@ class TestQueryRuns:
         assert len(item["issue_fingerprints"]) == 2
 
 
+    def test_cursor_pages_match_offset_pages(self, db):
+        for i, repo in enumerate(["a/b", "c/d", "a/b", "c/d", "a/b"]):
+            insert_run(
+                db,
+                _sample_run(run_number=1 + i // 2, repo=f"https://github.com/{repo}", label=f"r{i}"),
+                f"f{i}.json",
+            )
+        db.commit()
+        offset_pages = [query_runs(db, page=p, per_page=2)["items"] for p in (1, 2, 3)]
+        cursor_pages = []
+        cursor = None
+        while True:
+            result = query_runs(db, per_page=2, cursor=cursor) if cursor else query_runs(db, per_page=2)
+            cursor_pages.append(result["items"])
+            cursor = result["next_cursor"]
+            if cursor is None:
+                break
+        assert cursor_pages == offset_pages
+        assert "total" not in query_runs(db, per_page=2, cursor="3:0")
+
 class TestQueryAllRuns:
     def test_returns_all(self, db):
         for i in range(1, 4):
@@ -271,6 +499,36 @@ class TestQueryAllRuns:
         assert len(runs) == 1
         assert runs[0]["target_repo"] == "https://github.com/c/d"
 
+    def test_sessions_and_issues_loaded_in_bulk(self, db):
+        for i in range(1, 6):
+            insert_run(db, _sample_run(run_number=i, label=f"r{i}"), f"f{i}.json")
+        db.commit()
+        statements = []
+        db.set_trace_callback(statements.append)
+        try:
+            runs = query_all_runs(db)
+        finally:
+            db.set_trace_callback(None)
+        assert len(statements) == 3
+        run = next(r for r in runs if r["run_number"] == 2)
+        assert run["sessions"][0]["issue_ids"] == ["CQLF-R2-0001", "CQLF-R2-0002"]
+        assert [f["id"] for f in run["issue_fingerprints"]] == ["CQLF-R2-0001", "CQLF-R2-0002"]
+        assert run["severity_breakdown"] == {"high": 1, "medium": 1}
+        assert run["category_breakdown"] == {"injection": 1, "xss": 1}
+
+
+    def test_iter_expands_runs_batch_by_batch(self, db, monkeypatch):
+        import database
+
+        monkeypatch.setattr(database, "_RUN_ID_BATCH", 2)
+        for i in range(1, 6):
+            insert_run(db, _sample_run(run_number=i, label=f"r{i}"), f"f{i}.json")
+        db.commit()
+        runs = database.iter_all_runs(db)
+        first = next(runs)
+        assert first["run_number"] == 5
+        assert [first] + list(runs) == query_all_runs(db)
+
 
 class TestQuerySessions:
     def test_paginated(self, db):
@@ -291,6 +549,33 @@ class TestQuerySessions:
         assert "issue_ids" in s
         assert "target_repo" in s
 
+    def test_issue_ids_loaded_with_the_page(self, db):
+        for i in range(1, 4):
+            insert_run(db, _sample_run(run_number=i, label=f"r{i}"), f"f{i}.json")
+        db.commit()
+        statements = []
+        db.set_trace_callback(statements.append)
+        try:
+            items = query_sessions(db, per_page=10)["items"]
+        finally:
+            db.set_trace_callback(None)
+        assert len(statements) == 2
+        assert items[0]["issue_ids"] == ["CQLF-R3-0001", "CQLF-R3-0002"]
+        assert query_all_sessions(db)[2]["issue_ids"] == ["CQLF-R1-0001", "CQLF-R1-0002"]
+
+
+    def test_cursor_walks_every_session_once(self, db):
+        for i in range(1, 4):
+            insert_run(db, _sample_run(run_number=i, label=f"r{i}"), f"f{i}.json")
+        db.commit()
+        seen = []
+        result = query_sessions(db, per_page=2)
+        seen += result["items"]
+        while result["next_cursor"]:
+            result = query_sessions(db, per_page=2, cursor=result["next_cursor"])
+            seen += result["items"]
+        assert seen == query_all_sessions(db)
+
 
 class TestQueryPrs:
     def test_empty(self, db):
@@ -315,6 +600,41 @@ class TestQueryPrs:
         assert pr["issue_ids"] == ["I1"]
 
 
+    def test_issue_ids_loaded_with_the_page(self, db):
+        for n in range(1, 4):
+            upsert_pr(db, {
+                "pr_number": n, "title": f"PR{n}",
+                "html_url": f"https://github.com/o/r/pull/{n}",
+                "state": "open", "merged": False,
+                "created_at": f"2026-01-0{n}", "repo": "fork/r",
+                "user": "u", "session_id": f"s{n}", "issue_ids": [f"I{n}", f"J{n}"],
+            })
+        db.commit()
+        statements = []
+        db.set_trace_callback(statements.append)
+        try:
+            items = query_prs(db)["items"]
+        finally:
+            db.set_trace_callback(None)
+        assert len(statements) == 2
+        assert [p["issue_ids"] for p in items] == [["I3", "J3"], ["I2", "J2"], ["I1", "J1"]]
+
+    def test_cursor_breaks_created_at_ties(self, db):
+        for n in range(1, 4):
+            upsert_pr(db, {
+                "pr_number": n, "title": f"PR{n}",
+                "html_url": f"https://github.com/o/r/pull/{n}",
+                "state": "open", "merged": False,
+                "created_at": "2026-01-01", "repo": "fork/r",
+                "user": "u", "session_id": f"s{n}", "issue_ids": [],
+            })
+        db.commit()
+        first = query_prs(db, per_page=2)
+        rest = query_prs(db, per_page=2, cursor=first["next_cursor"])
+        assert [p["pr_number"] for p in first["items"] + rest["items"]] == [1, 2, 3]
+        assert rest["next_cursor"] is None
+
+
 class TestQueryStats:
     def test_empty_db(self, db):
         stats = query_stats(db)
@@ -328,6 +648,8 @@ class TestQueryStats:
         stats = query_stats(db)
         assert stats["total_runs"] == 2
         assert stats["repos_scanned"] == 1
+        assert stats["severity_breakdown"] == {"high": 4, "medium": 2}
+        assert stats["latest_category"] == {"injection": 2, "xss": 1}
 
     def test_period_filter(self, db):
         old = _sample_run(run_number=1, label="old")
@@ -340,6 +662,31 @@ class TestQueryStats:
         stats = query_stats(db, period="7d")
         assert stats["total_runs"] == 1
 
+    def test_period_filters_prs_by_session_or_issue(self, db):
+        old = _sample_run(run_number=1, label="old")
+        old["timestamp"] = "2020-01-01T00:00:00Z"
+        insert_run(db, old, "old.json")
+        new = _sample_run(run_number=2, label="new")
+        new["timestamp"] = "2099-01-01T00:00:00Z"
+        insert_run(db, new, "new.json")
+        for n, session_id, issue_ids, state, merged in (
+            (1, "sess-2-1", [], "closed", True),
+            (2, "", ["CQLF-R2-0002"], "open", False),
+            (3, "", ["CQLF-R1-0001"], "closed", False),
+            (4, "sess-1-1", [], "open", False),
+        ):
+            upsert_pr(db, {
+                "pr_number": n, "title": f"PR {n}", "html_url": f"https://github.com/fork/repo/pull/{n}",
+                "state": state, "merged": merged, "created_at": "2026-01-01T00:00:00Z",
+                "repo": "fork/repo", "user": "devin", "session_id": session_id, "issue_ids": issue_ids,
+            })
+        db.commit()
+        stats = query_stats(db, period="7d")
+        assert (stats["prs_total"], stats["prs_merged"], stats["prs_open"], stats["prs_closed"]) == (2, 1, 1, 0)
+        stats = query_stats(db)
+        assert (stats["prs_total"], stats["prs_merged"], stats["prs_open"], stats["prs_closed"]) == (4, 1, 2, 1)
+        assert stats["fix_rate"] == 25.0
+
 
 class TestQueryRepos:
     def test_empty(self, db):
@@ -354,6 +701,84 @@ class TestQueryRepos:
         assert len(repos) == 2
         ab = next(r for r in repos if r["repo"] == "https://github.com/a/b")
         assert ab["runs"] == 2
+        assert ab["severity_breakdown"] == {"high": 4, "medium": 2}
+        cd = next(r for r in repos if r["repo"] == "https://github.com/c/d")
+        assert cd["category_breakdown"] == {"injection": 2, "xss": 1}
+
+
+class TestRepoDetailHelpers:
+    def test_breakdown_aggregation(self, db):
+        insert_run(db, _sample_run(run_number=1, label="r1"), "f1.json")
+        insert_run(db, _sample_run(run_number=2, label="r2"), "f2.json")
+        insert_run(db, _sample_run(run_number=3, repo="https://github.com/x/y", label="r3"), "f3.json")
+        db.commit()
+        repo = "https://github.com/owner/repo"
+        assert aggregate_severity(db, repo) == {"high": 4, "medium": 2}
+        assert aggregate_category(db, repo) == {"injection": 4, "xss": 2}
+        assert query_repo_fork_url(db, repo) == "https://github.com/fork/repo"
+        assert query_repo_fork_url(db, "https://github.com/none/none") == ""
+        totals = query_repo_totals(db, repo)
+        assert totals == {"runs": 2, "issues_found": 6, "sessions_created": 2, "sessions_finished": 2}
+
+    def test_prs_by_state(self, db):
+        for num, state, merged, repo in [
+            (1, "open", False, "fork/repo"),
+            (2, "closed", True, "fork/repo"),
+            (3, "closed", False, "fork/repo"),
+            (4, "open", False, "other/repo"),
+        ]:
+            upsert_pr(db, {
+                "pr_number": num, "title": f"PR{num}",
+                "html_url": f"https://github.com/{repo}/pull/{num}",
+                "state": state, "merged": merged,
+                "created_at": f"2026-01-0{num}", "repo": repo,
+                "user": "u", "session_id": "", "issue_ids": [],
+            })
+        db.commit()
+        fork_url = "https://github.com/fork/repo"
+        assert count_prs_by_state(db, fork_url) == {"total": 3, "merged": 1, "open": 1, "closed": 1}
+        assert [p["pr_number"] for p in query_repo_prs(db, fork_url)] == [3, 2, 1]
+        assert [p["pr_number"] for p in query_repo_prs(db, fork_url, limit=1, offset=1)] == [2]
+        assert query_repo_prs(db, "") == []
+        assert query_repo_prs(db, "https://github.com/fork/repository") == []
+
+    def test_fork_repo_name(self):
+        assert fork_repo_name("https://github.com/fork/repo") == "fork/repo"
+        assert fork_repo_name("https://github.com/fork/repo.git/") == "fork/repo"
+        assert fork_repo_name("https://github.com/fork/repo/tree/main") == "fork/repo"
+        assert fork_repo_name("fork/repo") == "fork/repo"
+        assert fork_repo_name("") == ""
+
+    def test_repo_prs_query_uses_repo_index(self, db):
+        plan = db.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM prs WHERE repo = ? ORDER BY created_at DESC",
+            ("fork/repo",),
+        ).fetchall()
+        assert "idx_prs_repo" in " ".join(row["detail"] for row in plan)
+
+    def test_open_repo_prs(self, db):
+        run = _sample_run(run_number=1)
+        run["sessions"][0]["pr_url"] = "https://github.com/elsewhere/repo/pull/5"
+        insert_run(db, run, "f1.json")
+        insert_run(db, _sample_run(run_number=2, repo="https://github.com/x/y", label="r2"), "f2.json")
+        for num, state, merged, repo in [
+            (1, "open", False, "fork/repo"),
+            (2, "closed", True, "fork/repo"),
+            (5, "open", False, "elsewhere/repo"),
+            (6, "open", False, "unrelated/repo"),
+        ]:
+            upsert_pr(db, {
+                "pr_number": num, "title": f"PR{num}",
+                "html_url": f"https://github.com/{repo}/pull/{num}",
+                "state": state, "merged": merged,
+                "created_at": f"2026-01-0{num}", "repo": repo,
+                "user": "u", "session_id": "", "issue_ids": [],
+            })
+        db.commit()
+        prs = query_open_repo_prs(db, "https://github.com/owner/repo")
+        assert [p["pr_number"] for p in prs] == [5, 1]
+        assert set(prs[0]) == {"pr_number", "title", "html_url"}
+        assert query_open_repo_prs(db, "https://github.com/none/none") == []
 
 
 class TestQueryIssues:
@@ -371,6 +796,60 @@ class TestQueryIssues:
         fp_a = next(i for i in issues if i["fingerprint"] == "fp-1-a")
         assert fp_a["appearances"] >= 2
 
+    def test_first_and_latest_appearance(self, db):
+        runs = [_sample_run(run_number=n, label=f"r{n}") for n in (1, 2, 3, 4)]
+        runs[2]["issue_fingerprints"][0]["fingerprint"] = "fp-1-a"
+        runs[2]["issue_fingerprints"][0]["description"] = "changed later"
+        for n, run in enumerate(runs, 1):
+            insert_run(db, run, f"f{n}.json")
+        db.commit()
+        fp_a = next(i for i in query_issues(db) if i["fingerprint"] == "fp-1-a")
+        assert fp_a["status"] == "fixed"
+        assert fp_a["appearances"] == 2
+        assert (fp_a["first_seen_run"], fp_a["last_seen_run"]) == (1, 3)
+        assert fp_a["latest_issue_id"] == "CQLF-R3-0001"
+        assert fp_a["description"] == "SQL injection in query"
+        assert fp_a["fix_duration_hours"] == 48.0
+
+    def test_run_numbers_loaded_with_the_page(self, db):
+        r2 = _sample_run(run_number=2, label="r2")
+        r2["issue_fingerprints"][0]["fingerprint"] = "fp-1-a"
+        insert_run(db, _sample_run(run_number=1, label="r1"), "f1.json")
+        insert_run(db, r2, "f2.json")
+        db.commit()
+        statements = []
+        db.set_trace_callback(statements.append)
+        try:
+            issues = query_issues(db, limit=10)
+        finally:
+            db.set_trace_callback(None)
+        assert len(statements) == 1
+        by_fp = {i["fingerprint"]: i["run_numbers"] for i in issues}
+        assert by_fp == {"fp-1-a": [1, 2], "fp-1-b": [1], "fp-2-b": [2]}
+
+    def test_limit_offset_matches_full_order(self, db):
+        insert_run(db, _sample_run(run_number=1, label="r1"), "f1.json")
+        insert_run(db, _sample_run(run_number=2, label="r2"), "f2.json")
+        db.commit()
+        full = [i["fingerprint"] for i in query_issues(db)]
+        assert count_issues(db) == len(full)
+        assert count_issues(db, target_repo="https://github.com/none/none") == 0
+        page = [i["fingerprint"] for i in query_issues(db, limit=2, offset=1)]
+        assert page == full[1:3]
+
+    def test_status_counts_match_issue_list(self, db):
+        insert_run(db, _sample_run(run_number=1, label="r1"), "f1.json")
+        insert_run(db, _sample_run(run_number=2, label="r2"), "f2.json")
+        db.commit()
+        issues = query_issues(db)
+        expected: dict[str, int] = {}
+        for i in issues:
+            expected[i["status"]] = expected.get(i["status"], 0) + 1
+        assert count_issues_by_status(db) == expected
+        assert count_fixed_issues(db) == expected.get("fixed", 0) == 2
+        assert count_fixed_issues(db, "high") == 1
+        assert count_fixed_issues(db, "low") == 0
+
 
 class TestSearchIssues:
     def test_search_returns_matches(self, db):
@@ -379,6 +858,66 @@ class TestSearchIssues:
         results = search_issues(db, "injection")
         assert len(results) >= 1
 
+    def test_repo_filter_applies_before_the_limit(self, db):
+        import database
+
+        if not database._has_fts5(db):
+            pytest.skip("SQLite built without FTS5")
+        for n in range(1, 101):
+            insert_run(db, _sample_run(run_number=n, repo="https://github.com/o/other", label=f"o{n}"), f"o{n}.json")
+        insert_run(db, _sample_run(run_number=1, repo="https://github.com/o/mine", label="m1"), "m1.json")
+        db.commit()
+        assert len(search_issues(db, "injection")) == 100
+        results = search_issues(db, "injection", target_repo="https://github.com/o/mine")
+        assert [(r["target_repo"], r["fingerprint"]) for r in results] == [("https://github.com/o/mine", "fp-1-a")]
+
+    def test_bulk_ingest_indexes_once_at_the_end(self, db):
+        import database
+
+        if not database._has_fts5(db):
+            pytest.skip("SQLite built without FTS5")
+        triggers = "SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'issues_a_'"
+        with database.bulk_ingest(db):
+            assert db.execute(triggers).fetchone()[0] == 0
+            insert_run(db, _sample_run(), "f.json")
+        assert db.execute(triggers).fetchone()[0] == 3
+        assert len(search_issues(db, "injection")) >= 1
+        insert_run(db, _sample_run(run_number=2, label="r2"), "f2.json")
+        db.commit()
+        db.execute("INSERT INTO issues_fts(issues_fts) VALUES ('integrity-check')")
+
+    @pytest.mark.parametrize("fts", [True, False])
+    def test_bulk_ingest_commits_or_rolls_back(self, db, monkeypatch, fts):
+        import database
+
+        monkeypatch.setattr(database, "_has_fts5", lambda conn: fts and database._FTS5_AVAILABLE)
+        with pytest.raises(RuntimeError):
+            with database.bulk_ingest(db):
+                insert_run(db, _sample_run(), "f.json")
+                raise RuntimeError("boom")
+        assert db.execute("SELECT COUNT(*) FROM runs").fetchone()[0] == 0
+        with database.bulk_ingest(db):
+            insert_run(db, _sample_run(), "f.json")
+        assert not db.in_transaction
+        assert db.execute("SELECT COUNT(*) FROM runs").fetchone()[0] == 1
+
+    def test_bulk_ingest_analyzes_the_load(self, db):
+        import database
+
+        with database.bulk_ingest(db):
+            insert_run(db, _sample_run(), "f.json")
+        stats = {row[0] for row in db.execute("SELECT idx FROM sqlite_stat1 WHERE tbl = 'issues'")}
+        assert "idx_issues_run_fp" in stats
+
+    def test_fts5_probe_runs_once(self, db):
+        import database
+        from unittest.mock import MagicMock
+
+        assert database._FTS5_AVAILABLE is not None
+        conn = MagicMock()
+        assert database._has_fts5(conn) is database._FTS5_AVAILABLE
+        conn.execute.assert_not_called()
+
 
 class TestUpdateSession:
     def test_updates_status(self, db):
@@ -398,6 +937,95 @@ class TestUpdateSession:
         assert row["pr_url"] == "https://github.com/o/r/pull/1"
 
 
+def _pr(num, issue_ids, session_id=""):
+    return {
+        "pr_number": num, "title": f"PR{num}",
+        "html_url": f"https://github.com/fork/repo/pull/{num}",
+        "state": "open", "merged": False,
+        "created_at": f"2026-01-0{num}", "repo": "fork/repo",
+        "user": "u", "session_id": session_id, "issue_ids": issue_ids,
+    }
+
+
+class TestPrLink:
+    def test_link_follows_pr_issue_ids(self, db):
+        upsert_pr(db, _pr(1, ["CQLF-R1-0001"]))
+        db.commit()
+        rows = db.execute("SELECT issue_id FROM pr_link").fetchall()
+        assert [r["issue_id"] for r in rows] == ["CQLF-R1-0001"]
+        upsert_pr(db, _pr(1, ["CQLF-R1-0002"]))
+        db.commit()
+        rows = db.execute("SELECT issue_id FROM pr_link").fetchall()
+        assert [r["issue_id"] for r in rows] == ["CQLF-R1-0002"]
+
+    @pytest.mark.parametrize("order", [(1, 2), (2, 1)])
+    def test_oldest_pr_wins_whatever_the_upsert_order(self, db, order):
+        insert_run(db, _sample_run(), "f.json")
+        for num in order:
+            upsert_pr(db, _pr(num, ["CQLF-R1-0002"]))
+        db.commit()
+        oldest = "https://github.com/fork/repo/pull/1"
+        assert query_pr_urls_by_issue(db) == {"CQLF-R1-0002": oldest}
+        assert query_sessions(db, link_prs=True)["items"][0]["pr_url"] == oldest
+        assert backfill_pr_urls(db) == 1
+        row = db.execute("SELECT pr_url FROM sessions WHERE session_id = 'sess-1-1'").fetchone()
+        assert row["pr_url"] == oldest
+
+    def test_link_moves_on_when_the_oldest_pr_drops_the_issue(self, db):
+        upsert_pr(db, _pr(1, ["CQLF-R1-0002"]))
+        upsert_pr(db, _pr(2, ["CQLF-R1-0002"]))
+        upsert_pr(db, _pr(1, []))
+        db.commit()
+        assert query_pr_urls_by_issue(db) == {"CQLF-R1-0002": "https://github.com/fork/repo/pull/2"}
+
+    def test_migration_replaces_first_stored_links(self, db):
+        db.executescript("""
+            DROP TRIGGER pr_issue_ids_ai;
+            CREATE TRIGGER pr_issue_ids_ai AFTER INSERT ON pr_issue_ids
+            WHEN new.issue_id != '' BEGIN
+                INSERT OR REPLACE INTO pr_link (issue_id, pr_id) VALUES (new.issue_id, new.pr_id);
+            END;
+        """)
+        upsert_pr(db, _pr(2, ["CQLF-R1-0002"]))
+        upsert_pr(db, _pr(1, ["CQLF-R1-0002"]))
+        db.commit()
+        assert query_pr_urls_by_issue(db) == {"CQLF-R1-0002": "https://github.com/fork/repo/pull/2"}
+        init_db(db)
+        assert query_pr_urls_by_issue(db) == {"CQLF-R1-0002": "https://github.com/fork/repo/pull/1"}
+        upsert_pr(db, _pr(3, ["CQLF-R1-0002"]))
+        assert query_pr_urls_by_issue(db) == {"CQLF-R1-0002": "https://github.com/fork/repo/pull/1"}
+
+    def test_sessions_linked_by_issue(self, db):
+        insert_run(db, _sample_run(), "f.json")
+        upsert_pr(db, _pr(1, ["CQLF-R1-0002"]))
+        db.commit()
+        unlinked = query_sessions(db)["items"][0]
+        assert unlinked["pr_url"] == ""
+        linked = query_sessions(db, link_prs=True)["items"][0]
+        assert linked["pr_url"] == "https://github.com/fork/repo/pull/1"
+
+    def test_sessions_linked_by_session_id(self, db):
+        run = _sample_run()
+        run["sessions"][0]["session_id"] = "devin-abc"
+        insert_run(db, run, "f.json")
+        upsert_pr(db, _pr(2, [], session_id="abc"))
+        db.commit()
+        item = query_sessions(db, link_prs=True)["items"][0]
+        assert item["pr_url"] == "https://github.com/fork/repo/pull/2"
+        assert link_session_pr_urls(db) == 1
+        row = db.execute("SELECT pr_url FROM sessions").fetchone()
+        assert row["pr_url"] == "https://github.com/fork/repo/pull/2"
+
+    def test_backfill_pr_urls(self, db):
+        insert_run(db, _sample_run(), "f.json")
+        upsert_pr(db, _pr(1, ["CQLF-R1-0001"]))
+        db.commit()
+        assert backfill_pr_urls(db) == 1
+        assert backfill_pr_urls(db) == 0
+        row = db.execute("SELECT pr_url FROM sessions").fetchone()
+        assert row["pr_url"] == "https://github.com/fork/repo/pull/1"
+
+
 class TestCollectHelpers:
     def test_collect_session_ids(self, db):
         insert_run(db, _sample_run(), "f.json")
@@ -411,6 +1039,19 @@ class TestCollectHelpers:
         repos = collect_search_repos_from_db(db)
         assert len(repos) >= 1
 
+    def test_collect_search_repos_parses_target_and_fork_urls(self, db):
+        for n, (repo, fork) in enumerate([
+            ("https://github.com/o/a", "https://github.com/me/a/"),
+            ("https://github.com/o/a", ""),
+            ("http://GitHub.com/o/b?tab=x", "https://gitlab.com/me/b"),
+            ("https://github.com", "https://github.com.evil.io/x/y"),
+        ], start=1):
+            run = _sample_run(run_number=n, repo=repo, label=f"r{n}")
+            run["fork_url"] = fork
+            insert_run(db, run, f"f{n}.json")
+        db.commit()
+        assert collect_search_repos_from_db(db) == {"o/a", "me/a", "o/b"}
+
 
 class TestAuditLog:
     def test_audit_log_table_exists(self, db):
@@ -435,6 +1076,14 @@ class TestAuditLog:
         assert row["resource"] == ""
         assert row["details"] == ""
 
+    def test_insert_audit_logs_batch(self, db):
+        insert_audit_logs(db, [
+            ("2024-01-01T00:00:00+00:00", "u", "a1", "", "{}"),
+            ("2024-01-01T00:00:01+00:00", "u", "a2", "r", ""),
+        ])
+        rows = db.execute("SELECT action FROM audit_log ORDER BY id").fetchall()
+        assert [r["action"] for r in rows] == ["a1", "a2"]
+
     def test_query_audit_logs_empty(self, db):
         result = query_audit_logs(db)
         assert result["total"] == 0
@@ -455,6 +1104,28 @@ class TestAuditLog:
         result = query_audit_logs(db, action_filter="scan")
         assert result["total"] == 2
 
+    def test_query_audit_logs_cursor_walks_filtered_entries(self, db):
+        insert_audit_logs(db, [
+            ("2024-01-01T00:00:00+00:00", "u", "scan", "r1", ""),
+            ("2024-01-01T00:00:00+00:00", "u", "dispatch", "r2", ""),
+            ("2024-01-01T00:00:00+00:00", "u", "scan", "r3", ""),
+            ("2024-01-02T00:00:00+00:00", "u", "scan", "r4", ""),
+        ])
+        first = query_audit_logs(db, per_page=2, action_filter="scan")
+        rest = query_audit_logs(db, per_page=2, action_filter="scan", cursor=first["next_cursor"])
+        assert [e["resource"] for e in first["items"] + rest["items"]] == ["r4", "r1", "r3"]
+        assert "total" not in rest and rest["next_cursor"] is None
+
+    @pytest.mark.parametrize("column", ["action", "user"])
+    def test_filtered_audit_page_reads_in_timestamp_order(self, db, column):
+        plan = db.execute(
+            f"EXPLAIN QUERY PLAN SELECT * FROM audit_log WHERE {column} = ? ORDER BY timestamp DESC, id LIMIT 50",
+            ("x",),
+        ).fetchall()
+        details = [row["detail"] for row in plan]
+        assert any(f"idx_audit_log_{column}_ts" in d for d in details)
+        assert "USE TEMP B-TREE FOR ORDER BY" not in details
+
     def test_query_audit_logs_filter_by_user(self, db):
         insert_audit_log(db, "alice", "act")
         insert_audit_log(db, "bob", "act")
@@ -475,6 +1146,16 @@ class TestAuditLog:
         assert len(entries) == 2
         assert entries[0]["action"] in ("act1", "act2")
 
+    @pytest.mark.parametrize("n_entries", [0, 1, 3])
+    def test_streamed_export_matches_json_dump(self, db, tmp_path, n_entries):
+        for i in range(n_entries):
+            insert_audit_log(db, "u", f"act{i}", "r", json.dumps({"i": i}))
+        out = tmp_path / "audit.json"
+        count = write_audit_log_export(out, {"exported_at": "ts"}, iter_audit_logs(db))
+        assert count == n_entries
+        expected = {"exported_at": "ts", "entries": export_audit_logs(db)}
+        assert out.read_text() == json.dumps(expected, indent=2) + "\n"
+
 
 def _seed_with_fingerprints(db):
     """Insert two runs sharing a fingerprint and refresh the tracking table."""
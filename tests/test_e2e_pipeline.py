@@ -114,7 +114,7 @@ def _seed(runs=None, prs=None, db_path=None):
 def _clear():
     conn = get_connection(pathlib.Path(_test_db_path))
     for tbl in [
-        "pr_issue_ids", "prs", "session_issue_ids", "sessions",
+        "fingerprint_issues", "pr_issue_ids", "prs", "session_issue_ids", "sessions",
         "issues", "runs", "metadata", "orchestrator_kv",
         "dispatch_history", "rate_limiter_timestamps", "scan_schedule",
         "audit_log",
@@ -14,6 +14,7 @@ from scripts.orchestrator import (
     Objective,
     compute_issue_priority,
     get_repo_config,
+    index_registry_repos,
     load_registry,
     load_state,
     save_state,
@@ -262,6 +263,14 @@ class TestGetRepoConfig:
         assert config["importance_score"] == 50
         assert config["max_sessions_per_cycle"] == 5
 
+    def test_index_matches_linear_lookup(self, tmp_env):
+        registry = load_registry()
+        registry["repos"].append({"repo": "https://github.com/owner/repo", "importance_score": 1})
+        repos_by_url = index_registry_repos(registry)
+        for url in ("https://github.com/owner/repo", "https://github.com/unknown/repo"):
+            assert get_repo_config(registry, url, repos_by_url) == get_repo_config(registry, url)
+        assert get_repo_config(registry, "https://github.com/owner/repo")["importance_score"] == 90
+
 
 class TestDeriveIssueState:
     def test_new_issue(self):
@@ -1,14 +1,18 @@
 """Unit tests for telemetry services (github_service.py and devin_service.py).
 
-Covers: match_pr_to_session.
+Covers: match_pr_to_session, fetch_prs_from_github_to_db, poll_devin_sessions_db.
 """
 
 import os
 import sys
+from unittest.mock import MagicMock, patch
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "telemetry"))
 
-from github_service import match_pr_to_session
+import requests
+
+from devin_service import poll_devin_sessions_db
+from github_service import fetch_prs_from_github_to_db, match_pr_to_session
 
 
 class TestMatchPrToSession:
@@ -26,3 +30,101 @@ class TestMatchPrToSession:
 
     def test_empty_session_ids(self):
         assert match_pr_to_session("abc", set()) == ""
+
+
+class TestGhSession:
+    def test_retries_ignore_retry_after(self):
+        from github_service import gh_session
+
+        retry = gh_session.get_adapter("https://api.github.com").max_retries
+        assert retry.respect_retry_after_header is False
+
+
+class TestFetchPrsFromGithubToDb:
+    def test_fetches_every_repo_and_page(self):
+        pages = {
+            ("o/a", 1): [{"number": n, "title": f"fix CQLF-R1-{n}", "html_url": f"https://github.com/o/a/pull/{n}"}
+                         for n in range(100)],
+            ("o/a", 2): [{"number": 100, "title": "fix CQLF-R1-100", "html_url": "https://github.com/o/a/pull/100"}],
+            ("o/b", 1): [{"number": 1, "title": "unrelated", "html_url": "https://github.com/o/b/pull/1"},
+                         {"number": 2, "title": "x", "body": "session s1", "html_url": "https://github.com/o/b/pull/2"}],
+        }
+
+        def fake_get(url, **kwargs):
+            repo = url.split("/repos/")[1].split("/pulls")[0]
+            page = int(url.rsplit("page=", 1)[1])
+            resp = MagicMock(status_code=200)
+            resp.json.return_value = pages.get((repo, page), [])
+            return resp
+
+        upserted = []
+        with patch.dict(os.environ, {"GITHUB_TOKEN": "t"}), \
+             patch("github_service.gh_session.get", side_effect=fake_get), \
+             patch("database.collect_search_repos_from_db", return_value={"o/a", "o/b"}), \
+             patch("database.collect_session_ids_from_db", return_value={"s1"}), \
+             patch("database.upsert_pr", side_effect=lambda conn, pr: upserted.append(pr)):
+            assert fetch_prs_from_github_to_db(MagicMock()) == 102
+        assert {(p["repo"], p["pr_number"]) for p in upserted if p["repo"] == "o/b"} == {("o/b", 2)}
+        assert upserted[-1]["session_id"] == "s1"
+
+
+class TestPollDevinSessionsDb:
+    def test_polls_active_sessions_and_applies_in_order(self):
+        sessions = [
+            {"session_id": "devin-a", "status": "running"},
+            {"session_id": "dry-run", "status": "running"},
+            {"session_id": "devin-b", "status": "finished"},
+            {"session_id": "devin-c", "status": "running"},
+            {"session_id": "devin-d", "status": "running"},
+        ]
+
+        def fake_get(url, **kwargs):
+            sid = url.rsplit("/", 1)[1]
+            if sid == "c":
+                raise requests.ConnectionError("boom")
+            if sid == "d":
+                return MagicMock(status_code=500, text="oops")
+            resp = MagicMock(status_code=200)
+            resp.json.return_value = {"status_enum": "finished", "pull_request": {"url": "https://github.com/o/r/pull/1"}}
+            return resp
+
+        updates = []
+        with patch.dict(os.environ, {"DEVIN_API_KEY": "k"}), \
+             patch("devin_service.devin_session.get", side_effect=fake_get) as get, \
+             patch("database.update_session", side_effect=lambda conn, sid, **kw: updates.append((sid, kw))):
+            updated, stats = poll_devin_sessions_db(MagicMock(), sessions)
+        assert get.call_count == 3
+        assert updated == sessions
+        assert sessions[0]["status"] == "finished"
+        assert sessions[0]["pr_url"] == "https://github.com/o/r/pull/1"
+        assert [sid for sid, _ in updates] == ["devin-a"]
+        assert stats["polled"] == 2
+        assert stats["skipped_terminal"] == 1
+        assert stats["errors"] == [
+            {"session_id": "devin-c", "error": "boom"},
+            {"session_id": "devin-d", "error": "HTTP 500"},
+        ]
+
+    def test_non_json_reply_is_a_session_error(self):
+        sessions = [
+            {"session_id": "devin-a", "status": "running"},
+            {"session_id": "devin-b", "status": "running"},
+        ]
+
+        def fake_get(url, **kwargs):
+            resp = MagicMock(status_code=200)
+            if url.endswith("/a"):
+                resp.json.side_effect = requests.JSONDecodeError("Expecting value", "<html>", 0)
+            else:
+                resp.json.return_value = {"status_enum": "finished"}
+            return resp
+
+        updates = []
+        with patch.dict(os.environ, {"DEVIN_API_KEY": "k"}), \
+             patch("devin_service.devin_session.get", side_effect=fake_get), \
+             patch("database.update_session", side_effect=lambda conn, sid, **kw: updates.append(sid)):
+            _, stats = poll_devin_sessions_db(MagicMock(), sessions)
+        assert updates == ["devin-b"]
+        assert sessions[0]["status"] == "running"
+        assert stats["polled"] == 2
+        assert [e["session_id"] for e in stats["errors"]] == ["devin-a"]
@@ -144,3 +144,9 @@ class TestParseTs:
 
     def test_invalid_string(self):
         assert _parse_ts("not-a-date") is None
+
+    def test_repeated_timestamps_parsed_once(self):
+        _parse_ts.cache_clear()
+        first = _parse_ts("2026-01-15T10:30:00Z")
+        assert _parse_ts("2026-01-15T10:30:00Z") is first
+        assert _parse_ts.cache_info().hits == 1
@@ -4,6 +4,8 @@ Covers: API endpoints, pagination, auth decorator.
 Updated for SQLite-backed storage.
 """
 
+import gzip
+import hashlib
 import json
 import os
 import pathlib
@@ -11,7 +13,7 @@ import subprocess
 import sys
 import tempfile
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "telemetry"))
 
@@ -25,7 +27,8 @@ import database
 database.DB_PATH = pathlib.Path(_test_db_path)
 from database import get_connection, init_db, insert_run, upsert_pr
 from app import app
-from helpers import _paginate
+from helpers import _audit, _clear_json_cache, _paginate
+from json_files import load_json_file
 from routes.registry import _load_registry, _save_registry, REGISTRY_PATH
 from routes.orchestrator import _load_orchestrator_state, _load_orchestrator_registry
 
@@ -57,8 +60,10 @@ def _clear_db():
 @pytest.fixture(autouse=True)
 def clean_db():
     _clear_db()
+    _clear_json_cache()
     yield
     _clear_db()
+    _clear_json_cache()
 
 
 @pytest.fixture
@@ -118,8 +123,9 @@ class TestPaginate:
         assert result["pages"] == 1
 
     def test_single_page(self):
-        result = _paginate([1, 2], page=1, per_page=10)
-        assert result["items"] == [1, 2]
+        items = [1, 2]
+        result = _paginate(items, page=1, per_page=10)
+        assert result["items"] is items
         assert result["pages"] == 1
 
     def test_beyond_last_page(self):
@@ -139,6 +145,28 @@ class TestApiEndpoints:
         assert data["total"] == 3
         assert len(data["items"]) == 2
 
+    def test_api_runs_rejects_malformed_pagination(self, client):
+        for query in ("page=abc", "per_page=1.5"):
+            resp = client.get(f"/api/runs?{query}")
+            assert resp.status_code == 400
+            assert "error" in resp.get_json()
+
+    def test_api_runs_follows_cursor(self, client, sample_run):
+        _seed_db(runs=[
+            {**sample_run, "run_label": f"run-{i}", "run_number": i}
+            for i in range(1, 4)
+        ])
+        first = client.get("/api/runs?per_page=2").get_json()
+        rest = client.get(f"/api/runs?per_page=2&cursor={first['next_cursor']}").get_json()
+        assert [r["run_number"] for r in first["items"] + rest["items"]] == [3, 2, 1]
+        assert rest["next_cursor"] is None
+        assert "total" not in rest
+
+    def test_api_runs_rejects_malformed_cursor(self, client):
+        for cursor in ("abc", "x:1", "3:y"):
+            resp = client.get(f"/api/runs?cursor={cursor}")
+            assert resp.status_code == 400
+
     def test_api_stats_returns_json(self, client):
         resp = client.get("/api/stats")
         assert resp.status_code == 200
@@ -229,6 +257,12 @@ class TestApiEndpoints:
         assert resp.content_type == "application/pdf"
         assert resp.data[:5] == b"%PDF-"
 
+    def test_api_report_pdf_sets_content_length(self, client):
+        resp = client.get("/api/report/pdf")
+        assert resp.status_code == 200
+        assert int(resp.headers["Content-Length"]) == len(resp.data)
+        assert resp.data.rstrip().endswith(b"%%EOF")
+
     def test_api_report_pdf_with_repo_filter(self, client, sample_run):
         _seed_db(runs=[sample_run])
         resp = client.get("/api/report/pdf?repo=https://github.com/owner/repo")
@@ -241,6 +275,261 @@ class TestApiEndpoints:
         data = resp.get_json()
         assert "error" in data
 
+    def test_json_provider_encodes_with_fallback(self):
+        with app.app_context():
+            assert app.json.loads(app.json.dumps({1: "a", "b": [1.5, None]})) == {"1": "a", "b": [1.5, None]}
+            assert app.json.loads(app.json.dumps({"big": 2 ** 70})) == {"big": 2 ** 70}
+            resp = app.json.response({"ok": True})
+        assert resp.mimetype == "application/json"
+        assert resp.get_data() == b'{"ok":true}\n'
+
+    def test_json_get_honours_if_none_match(self, client, sample_run):
+        _seed_db(runs=[sample_run])
+        first = client.get("/api/runs")
+        etag = first.headers["ETag"]
+        assert first.headers["Cache-Control"] == "no-cache"
+        again = client.get("/api/runs", headers={"If-None-Match": etag})
+        assert again.status_code == 304
+        assert again.data == b""
+        _seed_db(runs=[{**sample_run, "run_label": "run-2", "run_number": 2}])
+        changed = client.get("/api/runs", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["ETag"] != etag
+
+    def test_db_cached_etag_answers_304_without_rebuilding(self, client, sample_run):
+        _seed_db(runs=[sample_run])
+        etag = client.get("/api/stats").headers["ETag"]
+        with patch("routes.api.query_stats") as build, \
+                patch("app.hashlib.sha1") as body_hash:
+            resp = client.get("/api/stats", headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+        assert resp.headers["ETag"] == etag
+        build.assert_not_called()
+        body_hash.assert_not_called()
+
+    def test_large_json_gzipped_when_accepted(self, client, sample_run):
+        _seed_db(runs=[
+            {**sample_run, "run_label": f"run-{i}", "run_number": i}
+            for i in range(1, 21)
+        ])
+        plain = client.get("/api/runs")
+        assert "Content-Encoding" not in plain.headers
+        assert "Accept-Encoding" in plain.headers["Vary"]
+        packed = client.get("/api/runs", headers={"Accept-Encoding": "gzip"})
+        assert packed.headers["Content-Encoding"] == "gzip"
+        assert len(packed.data) < len(plain.data)
+        assert json.loads(gzip.decompress(packed.data)) == plain.get_json()
+        assert packed.headers["ETag"] == plain.headers["ETag"][:-1] + '-gzip"'
+        small = client.get("/api/repos", headers={"Accept-Encoding": "gzip"})
+        assert "Content-Encoding" not in small.headers
+
+    @pytest.mark.parametrize("url", ["/api/runs", "/api/stats", "/api/prs", "/api/registry"])
+    def test_gzip_etag_differs_and_still_revalidates(self, client, sample_run, monkeypatch, url):
+        monkeypatch.setitem(app.config, "COMPRESS_MIN_SIZE", 1)
+        _seed_db(runs=[sample_run])
+        gz = {"Accept-Encoding": "gzip"}
+        plain = client.get(url)
+        packed = client.get(url, headers=gz)
+        assert packed.headers["Content-Encoding"] == "gzip"
+        assert packed.headers["ETag"] != plain.headers["ETag"]
+        for etag, headers in ((packed.headers["ETag"], gz), (plain.headers["ETag"], {})):
+            resp = client.get(url, headers={**headers, "If-None-Match": etag})
+            assert resp.status_code == 304
+            assert resp.headers["ETag"] == etag
+
+    def test_gzip_body_reused_for_unchanged_payload(self, client, sample_run):
+        _seed_db(runs=[
+            {**sample_run, "run_label": f"run-{i}", "run_number": i}
+            for i in range(1, 21)
+        ])
+        with patch.dict("app._GZIP_CACHE", clear=True), \
+                patch("app.gzip.compress", wraps=gzip.compress) as compress:
+            first = client.get("/api/runs", headers={"Accept-Encoding": "gzip"})
+            second = client.get("/api/runs", headers={"Accept-Encoding": "gzip"})
+        assert first.data == second.data
+        compress.assert_called_once()
+
+    def test_api_dispatch_builds_string_inputs(self, client):
+        ok = MagicMock(status_code=204)
+        with patch.dict(os.environ, {"GITHUB_TOKEN": "t", "ACTION_REPO": "o/action"}), \
+             patch("routes.api.gh_session.post", return_value=ok) as mock_post:
+            resp = client.post("/api/dispatch", json={
+                "target_repo": "https://github.com/o/r", "batch_size": 3, "dry_run": True,
+            })
+            assert resp.status_code == 200
+            inputs = mock_post.call_args.kwargs["json"]["inputs"]
+            assert inputs["target_repo"] == "https://github.com/o/r"
+            assert inputs["batch_size"] == "3"
+            assert inputs["dry_run"] == "true"
+            assert inputs["persist_logs"] == "true"
+            assert inputs["queries"] == "security-extended"
+            assert all(isinstance(v, str) for v in inputs.values())
+
+            bad = client.post("/api/dispatch", json={"target_repo": "https://github.com/o/r", "languages": ["py"]})
+            assert bad.status_code == 400
+            assert "languages" in bad.get_json()["error"]
+            assert mock_post.call_count == 1
+
+    def test_api_stats_cached_until_db_changes(self, client, sample_run):
+        with patch("routes.api.query_stats", wraps=database.query_stats) as mock_stats:
+            first = client.get("/api/stats").get_json()
+            assert client.get("/api/stats").get_json() == first
+            assert mock_stats.call_count == 1
+            _seed_db(runs=[sample_run])
+            second = client.get("/api/stats").get_json()
+            assert mock_stats.call_count == 2
+        assert second["total_runs"] == first["total_runs"] + 1
+
+    def test_api_repo_detail_cached_until_db_changes(self, client, sample_run):
+        _seed_db(runs=[sample_run])
+        path = "/api/repo/" + sample_run["target_repo"].removeprefix("https://github.com/")
+        with patch("routes.api.query_repo_totals", wraps=database.query_repo_totals) as mock_totals:
+            first = client.get(path).get_json()
+            assert client.get(path).get_json() == first
+            assert mock_totals.call_count == 1
+            _seed_db(runs=[{**sample_run, "run_label": "run-2", "run_number": 2}])
+            second = client.get(path).get_json()
+            assert mock_totals.call_count == 2
+        assert second["stats"]["total_runs"] == first["stats"]["total_runs"] + 1
+
+    def test_db_json_cache_is_bounded(self, client):
+        import helpers
+        with patch.object(helpers, "_DB_JSON_MAX_ENTRIES", 3):
+            for n in range(5):
+                assert client.get(f"/api/repo/o/r{n}").status_code == 200
+            assert len(helpers._DB_JSON_CACHE) == 3
+
+    def test_db_json_cache_ttl_is_jittered(self, client):
+        import helpers
+        with patch.object(helpers.random, "uniform", return_value=1.25) as uniform, \
+                patch.object(helpers.time, "monotonic", return_value=1000.0):
+            assert client.get("/api/repo/o/jitter").status_code == 200
+        uniform.assert_called_once_with(0.75, 1.25)
+        (_state, expiry, _body, _etag), = [
+            v for k, v in helpers._DB_JSON_CACHE.items() if "o/jitter" in repr(k)
+        ]
+        assert expiry == 1000.0 + helpers._DB_JSON_TTL * 1.25
+
+    def test_api_backfill_patches_run_files_once(self, client, sample_run, tmp_path):
+        (tmp_path / "run-1.json").write_text(json.dumps(sample_run))
+        _seed_db(
+            runs=[{**sample_run, "_file": "run-1.json"}],
+            prs=[{
+                "pr_number": 7, "title": "Fix CQLF-R1-0001",
+                "html_url": "https://github.com/fork-owner/repo/pull/7",
+                "state": "open", "merged": False, "created_at": "2026-01-02T00:00:00Z",
+                "repo": "fork-owner/repo", "user": "devin", "session_id": "",
+                "issue_ids": ["CQLF-R1-0001"],
+            }],
+        )
+        with patch("routes.api.RUNS_DIR", tmp_path):
+            first = client.post("/api/backfill").get_json()
+            second = client.post("/api/backfill").get_json()
+        assert first["patched_files"] == 1
+        assert second["patched_files"] == 0
+        patched = json.loads((tmp_path / "run-1.json").read_text())
+        assert patched["sessions"][0]["pr_url"] == "https://github.com/fork-owner/repo/pull/7"
+        conn = get_connection(pathlib.Path(_test_db_path))
+        assert conn.execute("SELECT file_backfilled FROM runs").fetchone()[0] == 1
+        conn.close()
+
+    def test_api_backfill_skips_files_without_linkable_prs(self, client, sample_run, tmp_path):
+        (tmp_path / "run-1.json").write_text(json.dumps(sample_run))
+        _seed_db(runs=[{**sample_run, "_file": "run-1.json"}])
+        with patch("routes.api.RUNS_DIR", tmp_path), \
+                patch("routes.api.load_json_file", wraps=load_json_file) as load:
+            assert client.post("/api/backfill").get_json()["patched_files"] == 0
+            load.assert_not_called()
+            conn = get_connection(pathlib.Path(_test_db_path))
+            assert conn.execute("SELECT file_backfilled FROM runs").fetchone()[0] == 0
+            upsert_pr(conn, {
+                "pr_number": 7, "title": "Fix CQLF-R1-0001",
+                "html_url": "https://github.com/fork-owner/repo/pull/7",
+                "state": "open", "merged": False, "created_at": "2026-01-02T00:00:00Z",
+                "repo": "fork-owner/repo", "user": "devin", "session_id": "",
+                "issue_ids": ["CQLF-R1-0001"],
+            })
+            conn.commit()
+            conn.close()
+            assert client.post("/api/backfill").get_json()["patched_files"] == 1
+            load.assert_called_once()
+
+    def test_api_refresh_downloads_runs_concurrently(self, client, sample_run, monkeypatch, tmp_path):
+        monkeypatch.setenv("GITHUB_TOKEN", "tok")
+        monkeypatch.setenv("ACTION_REPO", "owner/action")
+        class FakeResp:
+            def __init__(self, payload):
+                self.status_code = 200
+                self.payload = payload
+                self.content = json.dumps(payload).encode()
+
+            def json(self):
+                return self.payload
+
+        def run_body(n):
+            return FakeResp({**sample_run, "run_label": f"run-{n}", "run_number": n})
+
+        def blob_sha(content):
+            return hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
+
+        listing = [
+            {"name": f"run_{i}.json", "size": 1, "sha": blob_sha(run_body(i).content),
+             "download_url": f"https://raw/run_{i}.json"}
+            for i in range(3)
+        ] + [{"name": "README.md", "size": 1, "download_url": "https://raw/README.md"}]
+
+        def fake_get(url, **kwargs):
+            if "/contents/" in url:
+                return FakeResp(listing)
+            return run_body(int(url.rsplit("_", 1)[1].split(".")[0]))
+
+        with patch("routes.api.gh_session.get", side_effect=fake_get) as mock_get, \
+             patch("routes.api.RUNS_DIR", tmp_path), \
+             patch("routes.api.fetch_prs_from_github_to_db", return_value=0):
+            resp = client.post("/api/refresh")
+        assert resp.status_code == 200
+        assert resp.get_json()["downloaded"] == 3
+        assert sorted(p.name for p in tmp_path.glob("*.json")) == ["run_0.json", "run_1.json", "run_2.json"]
+        assert resp.get_json()["total_files"] == 3
+        assert mock_get.call_count == 4
+
+    def test_api_refresh_skips_files_matching_remote_sha(self, client, sample_run, monkeypatch, tmp_path):
+        monkeypatch.setenv("GITHUB_TOKEN", "tok")
+        monkeypatch.setenv("ACTION_REPO", "owner/action")
+        same = json.dumps(sample_run).encode()
+        (tmp_path / "same.json").write_bytes(same)
+        (tmp_path / "stale.json").write_bytes(same)
+        new_body = {**sample_run, "run_label": "run-new"}
+        listing = [
+            {"name": "same.json", "size": len(same), "download_url": "https://raw/same.json",
+             "sha": hashlib.sha1(b"blob %d\0" % len(same) + same).hexdigest()},
+            {"name": "stale.json", "size": len(same), "download_url": "https://raw/stale.json",
+             "sha": "0" * 40},
+        ]
+        downloads = []
+
+        def fake_get(url, **kwargs):
+            resp = MagicMock(status_code=200)
+            if "/contents/" in url:
+                resp.json.return_value = listing
+            else:
+                downloads.append(url)
+                resp.content = json.dumps(new_body).encode()
+                resp.json.return_value = new_body
+            return resp
+
+        with patch("routes.api.gh_session.get", side_effect=fake_get), \
+             patch("routes.api.RUNS_DIR", tmp_path), \
+             patch("routes.api.fetch_prs_from_github_to_db", return_value=0):
+            assert client.post("/api/refresh").status_code == 200
+            assert downloads == ["https://raw/stale.json"]
+            resp = client.post("/api/refresh")
+            assert resp.status_code == 200
+            assert downloads == ["https://raw/stale.json"]
+        # Files on disk, not database rows: same.json was never downloaded or inserted.
+        assert resp.get_json()["total_files"] == 2
+        assert json.loads((tmp_path / ".remote-shas").read_text())["stale.json"] == "0" * 40
+
 
 class TestRegistryEndpoints:
     def test_load_registry_missing_file(self):
@@ -268,6 +557,28 @@ class TestRegistryEndpoints:
                 assert data["repos"] == [{"repo": "a"}]
             os.unlink(f.name)
 
+    def test_registry_etag_not_modified(self, client):
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
+            json.dump({"version": "1.0", "orchestrator": {}, "repos": []}, f)
+            f.flush()
+            with patch("routes.registry.REGISTRY_PATH", Path(f.name)):
+                for url in ("/api/registry", "/api/orchestrator/config"):
+                    resp = client.get(url)
+                    assert resp.status_code == 200
+                    etag = resp.headers["ETag"]
+                    assert etag.startswith('W/"')
+                    assert resp.headers["Cache-Control"] == "no-cache"
+                    resp = client.get(url, headers={"If-None-Match": etag})
+                    assert resp.status_code == 304
+                    assert resp.data == b""
+                    resp = client.get(url, headers={"If-None-Match": 'W/"stale"'})
+                    assert resp.status_code == 200
+                _save_registry({"version": "1.0", "orchestrator": {"global_session_limit": 7}, "repos": [{"repo": "x"}]})
+                resp = client.get("/api/registry")
+                assert resp.get_json()["repos"] == [{"repo": "x"}]
+                assert client.get("/api/orchestrator/config").get_json()["global_session_limit"] == 7
+            os.unlink(f.name)
+
 
 class TestOAuth:
     def test_login_returns_400_when_not_configured(self, client):
@@ -416,6 +727,24 @@ class TestOrchestratorEndpoints:
         assert item["session_id"] == "devin-aabbccdd"
         assert item["session_url"] == "https://app.devin.ai/sessions/aabbccdd"
 
+    def test_orchestrator_history_reuses_state_until_saved(self, client):
+        from database import save_orchestrator_state
+        import routes.orchestrator as orch
+        client.get("/api/orchestrator/history")  # first load may migrate the JSON state file
+        with patch("routes.orchestrator._load_orchestrator_state", wraps=orch._load_orchestrator_state) as mock_load:
+            first = client.get("/api/orchestrator/history").get_json()
+            assert client.get("/api/orchestrator/history").get_json() == first
+            assert mock_load.call_count == 1
+            conn = get_connection(pathlib.Path(_test_db_path))
+            init_db(conn)
+            save_orchestrator_state(conn, {
+                "dispatch_history": {"fp1": {"fingerprint": "fp1", "last_dispatched": "2026-01-15T10:00:00+00:00"}},
+            })
+            conn.close()
+            items = client.get("/api/orchestrator/history").get_json()["items"]
+            assert [e["fingerprint"] for e in items] == ["fp1"]
+            assert mock_load.call_count == 2
+
     def test_orchestrator_history_fingerprint_filter_normalizes(self, client):
         from database import save_orchestrator_state
         conn = get_connection(pathlib.Path(_test_db_path))
@@ -452,14 +781,19 @@ class TestOrchestratorEndpoints:
             assert resp.status_code == 200
 
     def test_orchestrator_plan_failure(self, client):
-        with patch("routes.orchestrator.subprocess.run") as mock_run:
-            mock_run.return_value = type("R", (), {
-                "returncode": 1,
-                "stdout": "",
-                "stderr": "error",
-            })()
+        with patch("routes.orchestrator._orch_compute_plan", side_effect=RuntimeError("error")):
             resp = client.get("/api/orchestrator/plan")
             assert resp.status_code == 500
+            assert resp.get_json()["stderr"] == "error"
+
+    def test_orchestrator_plan_runs_in_process(self, client):
+        plan = {"eligible_issues": 1, "planned_dispatches": []}
+        with patch("routes.orchestrator._orch_compute_plan", return_value=plan), \
+             patch("routes.orchestrator.subprocess.run") as mock_run:
+            resp = client.get("/api/orchestrator/plan")
+        assert resp.status_code == 200
+        assert resp.get_json() == plan
+        mock_run.assert_not_called()
 
     def test_orchestrator_scan_requires_env(self, client, monkeypatch):
         monkeypatch.setenv("TELEMETRY_API_KEY", "test-key")
@@ -1012,6 +1346,51 @@ class TestAuditLogEndpoints:
         assert "entries" in data
         assert "file" in data
 
+    def test_audit_log_export_download(self, client, monkeypatch):
+        monkeypatch.setenv("TELEMETRY_API_KEY", "test-key")
+        resp = client.post(
+            "/api/audit-log/export?download=1",
+            headers={"X-API-Key": "test-key"},
+            json={},
+        )
+        assert resp.status_code == 200
+        assert resp.mimetype == "application/json"
+        assert "attachment" in resp.headers["Content-Disposition"]
+        assert "entries" in json.loads(resp.data)
+        resp.close()
+
+    def test_audit_dict_details_visible_after_write(self, client):
+        with app.test_request_context():
+            _audit("queued_action", resource="r", details={"count": 3})
+        resp = client.get("/api/audit-log?action=queued_action")
+        data = resp.get_json()
+        assert data["total"] == 1
+        assert json.loads(data["items"][0]["details"]) == {"count": 3}
+
+    def test_audit_burst_written_in_one_batch(self, client):
+        import helpers
+        with patch("helpers.insert_audit_logs", wraps=helpers.insert_audit_logs) as mock_insert:
+            with app.test_request_context():
+                for i in range(5):
+                    _audit("burst_action", details={"i": i})
+            resp = client.get("/api/audit-log?action=burst_action")
+        assert resp.get_json()["total"] == 5
+        assert mock_insert.call_count == 1
+
+    def test_audit_log_follows_cursor(self, client):
+        with app.test_request_context():
+            for i in range(3):
+                _audit("paged_action", details={"i": i})
+        first = client.get("/api/audit-log?action=paged_action&per_page=2").get_json()
+        rest = client.get(
+            "/api/audit-log", query_string={"action": "paged_action", "per_page": 2, "cursor": first["next_cursor"]},
+        ).get_json()
+        assert sorted(json.loads(e["details"])["i"] for e in first["items"] + rest["items"]) == [0, 1, 2]
+        assert rest["next_cursor"] is None
+
+    def test_audit_log_rejects_malformed_cursor(self, client):
+        assert client.get("/api/audit-log?cursor=abc").status_code == 400
+
 
 class TestServerSideSessions:
     def test_session_type_is_cachelib(self):
@@ -1278,6 +1657,14 @@ class TestSecurityHeaders:
         assert "Content-Security-Policy" in resp.headers
         assert "Referrer-Policy" in resp.headers
 
+    def test_dashboard_html_rendered_once(self, client):
+        import routes.api as api_routes
+        with patch.object(api_routes, "_DASHBOARD_HTML", None), \
+                patch("routes.api.render_template", return_value="<html></html>") as render:
+            assert client.get("/").data == b"<html></html>"
+            assert client.get("/").data == b"<html></html>"
+        render.assert_called_once_with("dashboard.html")
+
     def test_hsts_absent_for_non_secure(self, client):
         resp = client.get("/api/config")
         assert "Strict-Transport-Security" not in resp.headers
@@ -1325,7 +1712,8 @@ class TestRateLimiter:
 class TestOrchestratorSubprocessEndpoints:
     def test_plan_success_returns_parsed_json(self, client):
         plan_output = {"eligible_issues": 5, "batches": [{"id": 1, "issues": ["a", "b"]}]}
-        with patch("routes.orchestrator.subprocess.run") as mock_run:
+        with patch("routes.orchestrator._orch_compute_plan", None), \
+             patch("routes.orchestrator.subprocess.run") as mock_run:
             mock_run.return_value = type("R", (), {
                 "returncode": 0,
                 "stdout": json.dumps(plan_output),
@@ -1338,7 +1726,8 @@ class TestOrchestratorSubprocessEndpoints:
             assert len(data["batches"]) == 1
 
     def test_plan_invalid_json_output(self, client):
-        with patch("routes.orchestrator.subprocess.run") as mock_run:
+        with patch("routes.orchestrator._orch_compute_plan", None), \
+             patch("routes.orchestrator.subprocess.run") as mock_run:
             mock_run.return_value = type("R", (), {
                 "returncode": 0,
                 "stdout": "not valid json",
@@ -1350,7 +1739,8 @@ class TestOrchestratorSubprocessEndpoints:
             assert "error" in data
 
     def test_plan_subprocess_timeout(self, client):
-        with patch("routes.orchestrator.subprocess.run", side_effect=subprocess.TimeoutExpired("cmd", 60)):
+        with patch("routes.orchestrator._orch_compute_plan", None), \
+             patch("routes.orchestrator.subprocess.run", side_effect=subprocess.TimeoutExpired("cmd", 60)):
             with pytest.raises(subprocess.TimeoutExpired):
                 client.get("/api/orchestrator/plan")
 
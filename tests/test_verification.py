@@ -15,6 +15,7 @@ from verification import (
     build_session_verification_map,
     build_fingerprint_fix_map,
     aggregate_verification_stats,
+    load_verification_bundle,
 )
 from app import app
 
@@ -92,6 +93,14 @@ class TestLoadVerificationRecords:
             records = load_verification_records(d)
             assert len(records) == 1
 
+    def test_reads_values_orjson_rejects(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            d = Path(tmpdir)
+            (d / "verification_big.json").write_text('{"n": %d, "rate": NaN}' % 2 ** 70)
+            assert load_verification_records(d)[0]["n"] == 2 ** 70
+            with patch("json_files.orjson", None):
+                assert load_verification_records(d)[0]["n"] == 2 ** 70
+
     def test_empty_directory(self):
         with tempfile.TemporaryDirectory() as tmpdir:
             assert load_verification_records(Path(tmpdir)) == []
@@ -228,6 +237,47 @@ class TestAggregateVerificationStats:
         assert stats["overall_fix_rate"] == 0.0
 
 
+class TestLoadVerificationBundle:
+    def test_memoized_until_files_change(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            d = Path(tmpdir)
+            (d / "verification_1.json").write_text(json.dumps(_record(session_id="s1")))
+            first = load_verification_bundle(d)
+            assert first["session_map"].keys() == {"s1"}
+            with patch("verification.load_verification_records") as mock_load:
+                assert load_verification_bundle(d) is first
+                mock_load.assert_not_called()
+            (d / "verification_2.json").write_text(json.dumps(_record(session_id="s2")))
+            second = load_verification_bundle(d)
+            assert second is not first
+            assert second["stats"]["total_verifications"] == 2
+            assert second["session_map"].keys() == {"s1", "s2"}
+
+
+class TestVerificationFilesKey:
+    def test_skips_walk_while_directory_unchanged(self):
+        from verification import _verification_files_key
+        with tempfile.TemporaryDirectory() as tmpdir:
+            d = Path(tmpdir)
+            (d / "verification_1.json").write_text(json.dumps(_record(session_id="s1")))
+            os.utime(d, ns=(0, 1_000_000_000))
+            first = _verification_files_key(d)
+            with patch("verification.os.scandir", side_effect=AssertionError("walked")):
+                assert _verification_files_key(d) == first
+            (d / "verification_2.json").write_text(json.dumps(_record(session_id="s2")))
+            assert len(_verification_files_key(d)) == 2
+
+    def test_recent_directory_mtime_is_not_trusted(self):
+        from verification import _verification_files_key
+        with tempfile.TemporaryDirectory() as tmpdir:
+            d = Path(tmpdir)
+            (d / "verification_1.json").write_text(json.dumps(_record(session_id="s1")))
+            _verification_files_key(d)
+            with patch("verification.os.scandir", wraps=os.scandir) as mock_scandir:
+                _verification_files_key(d)
+                assert mock_scandir.called
+
+
 class TestApiVerificationEndpoint:
     @patch("app.load_verification_records")
     def test_returns_stats_records_session_map(self, mock_load, client):